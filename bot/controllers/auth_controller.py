@@ -153,7 +153,7 @@ async def process_password(message: Message, state: FSMContext):
         # Успешная авторизация
         session = await session_manager.get_session(message.from_user.id)
         if session:
-            expires_str = session["expires_at"].strftime("%d.%m.%Y %H:%M")
+            expires_str = session.local_expires_at.strftime("%d.%m.%Y %H:%M")
         else:
             expires_str = "6 часов"
 
@@ -203,12 +203,12 @@ async def manage_session(callback: CallbackQuery):
         return
 
     remaining = await session_manager.get_remaining_time(callback.from_user.id)
-    expires_str = session["expires_at"].strftime("%d.%m.%Y %H:%M")
+    expires_str = session.local_expires_at.strftime("%d.%m.%Y %H:%M")
 
     session_text = (
         f"⚙️ *Управление сессией*\n\n"
         f"✅ *Авторизован для:*\n"
-        f"   📍 `{session['server_host']}:{session['server_port']}`\n"
+        f"   📍 `{session.server_host}:{session.server_port}`\n"
         f"   ⏰ *Осталось:* {remaining}\n"
         f"   *Действует до:* {expires_str}\n"
         f"   👤 *Пользователь:* {callback.from_user.first_name}\n\n"
@@ -438,7 +438,7 @@ async def process_password(message: Message, state: FSMContext):
         # Успешная авторизация
         session = await session_manager.get_session(message.from_user.id)
         if session:
-            expires_str = session["expires_at"].strftime("%d.%m.%Y %H:%M")
+            expires_str = session.local_expires_at.strftime("%d.%m.%Y %H:%M")
         else:
             expires_str = "6 часов"
 
@@ -515,12 +515,12 @@ async def manage_session(callback: CallbackQuery):
         return
 
     remaining = await session_manager.get_remaining_time(callback.from_user.id)
-    expires_str = session["expires_at"].strftime("%d.%m.%Y %H:%M")
+    expires_str = session.local_expires_at.strftime("%d.%m.%Y %H:%M")
 
     session_text = (
         f"⚙️ *Управление сессией*\n\n"
         f"✅ *Авторизован для:*\n"
-        f"   📍 `{session['server_host']}:{session['server_port']}`\n"
+        f"   📍 `{session.server_host}:{session.server_port}`\n"
         f"   ⏰ *Осталось:* {remaining}\n"
         f"   *Действует до:* {expires_str}\n"
         f"   👤 *Пользователь:* {callback.from_user.first_name}\n\n"
@@ -6,14 +6,12 @@ from aiogram.fsm.context import FSMContext
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from domain.services.command_validator import CommandValidator, CommandType
-from infrastructure.adapters.rcon_client import RconClientAdapter
-from infrastructure.adapters.crypto import CryptoService
 from bot.keyboards.commands_menu import get_commands_keyboard, get_confirmation_keyboard
+from bot.utils.pager import send_paged
 from loggers.app_logger import logger
 
 router = Router()
 command_validator = CommandValidator()
-crypto = CryptoService()
 
 
 @router.message(Command("commands"))
@@ -59,22 +57,12 @@ async def cmd_list(message: Message):
         await message.answer("🔒 Сначала авторизуйтесь через /start")
         return
 
-    # Получаем информацию о сервере
-    server_info = await session_manager.get_server(message.from_user.id)
-    if not server_info:
-        await message.answer("❌ Сервер не найден. Пожалуйста, авторизуйтесь заново.")
-        return
-
     try:
-        # Дешифруем пароль
-        password = crypto.decrypt(server_info["encrypted_password"])
-
-        # Выполняем команду
-        rcon_client = RconClientAdapter(
-            server_info["host"],
-            server_info["port"],
-            password
-        )
+        # Клиент сервера из сессии: без запроса к БД и расшифровки пароля
+        rcon_client = await session_manager.get_rcon_client(message.from_user.id)
+        if not rcon_client:
+            await message.answer("❌ Сервер не найден. Пожалуйста, авторизуйтесь заново.")
+            return
 
         await message.answer("⏳ Получаю список игроков...")
         result = await rcon_client.execute_command("list")
@@ -211,32 +199,17 @@ async def execute_simple_command(message: Message, command: str, success_message
     if command_validator.is_dangerous_command(command):
         await message.answer(f"⚠️ Команда '{command}' является опасной. Будьте осторожны!")
 
-    # Получаем информацию о сервере
-    server_info = await session_manager.get_server(message.from_user.id)
-    if not server_info:
-        await message.answer("❌ Сервер не найден. Пожалуйста, авторизуйтесь заново.")
-        return
-
     try:
-        # Дешифруем пароль
-        password = crypto.decrypt(server_info["encrypted_password"])
-
-        # Выполняем команду
-        rcon_client = RconClientAdapter(
-            server_info["host"],
-            server_info["port"],
-            password
-        )
+        # Клиент сервера из сессии: без запроса к БД и расшифровки пароля
+        rcon_client = await session_manager.get_rcon_client(message.from_user.id)
+        if not rcon_client:
+            await message.answer("❌ Сервер не найден. Пожалуйста, авторизуйтесь заново.")
+            return
 
         await message.answer(f"⏳ Выполняю команду: `{command}`", parse_mode="Markdown")
-        result = await rcon_client.execute_command(command)
-
-        if result and result.strip():
-            response = f"✅ {success_message}\n```\n{result}\n```"
-        else:
-            response = f"✅ {success_message}"
 
-        await message.answer(response, parse_mode="Markdown")
+        # Большие ответы (help, banlist) уходят по частям, не длиннее лимита Telegram
+        await send_paged(message, rcon_client.execute_command_stream(command), f"✅ {success_message}")
 
     except Exception as e:
         await message.answer(f"❌ Ошибка выполнения команды: {str(e)[:200]}")
@@ -1,11 +1,50 @@
+import asyncio
+
 from aiogram import Router, F
 from aiogram.types import Message, CallbackQuery
 from aiogram.filters import Command
 
 from bot.keyboards.monitoring_menu import get_monitoring_keyboard
+from infrastructure.parsers.async_log_parser import log_parser
+from infrastructure.parsers.log_classifier import LogEvent, LogEventType
+from infrastructure.parsers.log_watcher import log_event_bus
 
 router = Router()
 
+# События лога, которые показываются на экране мониторинга
+MONITOR_EVENT_TYPES = (LogEventType.JOIN, LogEventType.LEAVE, LogEventType.ERROR, LogEventType.LAG)
+
+# Пометка данных из демо-логов: папка логов сервера не настроена, и
+# игроки и события в них выдуманы
+DEMO_NOTE = "🧪 Демо-данные: папка логов сервера не настроена (`MINECRAFT_LOG_DIR`)"
+
+
+def format_log_event(event: LogEvent) -> str:
+    """Строка события лога для экрана мониторинга"""
+    if event.type == LogEventType.JOIN:
+        return f"`{event.time}` ➕ `{event.player}` зашел"
+    if event.type == LogEventType.LEAVE:
+        return f"`{event.time}` ➖ `{event.player}` вышел"
+    if event.type == LogEventType.LAG:
+        return f"`{event.time}` 🐢 Отставание {event.value} мс"
+    return f"`{event.time}` ❗ Ошибка сервера"
+
+
+def format_lag_stats(lag: dict) -> str:
+    """Блок статистики лагов по окнам для /stats"""
+    if not lag['count']:
+        return "\n🐢 *Лаги:* не было"
+
+    lines = [f"\n🐢 *Лаги:* {lag['count']}, максимум {lag['max_ms']} мс"]
+    for window in lag['windows']:
+        lines.append(
+            f"`{window['window']}` p50 {window['p50_ms']} / p95 {window['p95_ms']} / "
+            f"max {window['max_ms']} мс, пропущено тиков: {window['skipped_ticks']}, "
+            f"игроков: {window['max_players']}"
+        )
+    lines.append(f"_Окна по {lag['window_minutes']} мин, последние {len(lag['windows'])}_")
+    return "\n".join(lines)
+
 
 @router.message(Command("monitor"))
 async def cmd_monitor(message: Message):
@@ -33,6 +72,13 @@ async def cmd_monitor(message: Message):
         "_Данные обновляются каждые 5 минут_"
     )
 
+    # Живые события приходят из общей шины - экран не читает лог сам
+    events = log_event_bus.recent(5, types=MONITOR_EVENT_TYPES)
+    if events:
+        text += "\n\n🔔 *Последние события*\n" + "\n".join(format_log_event(event) for event in events)
+        if log_parser.demo:
+            text += f"\n{DEMO_NOTE}"
+
     await message.answer(
         text,
         parse_mode="Markdown",
@@ -67,14 +113,26 @@ async def cmd_stats(message: Message):
         await message.answer("🔒 Сначала авторизуйтесь через /start")
         return
 
+    # Разбор логов идет в пуле потоков и не задерживает других пользователей
+    try:
+        stats = await log_parser.parse_server_stats()
+    except asyncio.TimeoutError:
+        await message.answer("⏳ Логи сервера обрабатываются слишком долго, попробуйте позже")
+        return
+
+    last_restart = stats['last_restart']
+    if stats.get('last_restart_at'):
+        last_restart = stats['last_restart_at'].strftime("%d.%m.%Y %H:%M:%S")
+
     text = (
         "📈 *Статистика сервера*\n\n"
-        "• Запусков сегодня: 1\n"
-        "• Всего игроков: 42\n"
-        "• Средний онлайн: 8\n"
-        "• Максимальный онлайн: 18\n"
-        "• Ошибок за сутки: 2\n\n"
-        "_Статистика собирается с момента запуска бота_"
+        f"• Последний запуск: {last_restart or 'н/д'}\n"
+        f"• Игроков онлайн: {stats['online_players']}\n"
+        f"• Всего игроков: {stats['total_players']}\n"
+        f"• Предупреждений: {stats['warnings_count']}\n"
+        f"• Ошибок: {stats['errors_count']}\n"
+        f"{format_lag_stats(stats['lag'])}\n\n"
+        + (DEMO_NOTE if log_parser.demo else "_Статистика по текущему логу сервера_")
     )
 
     await message.answer(text, parse_mode="Markdown")
@@ -93,14 +151,22 @@ async def cmd_players(message: Message):
         await message.answer("🔒 Сначала авторизуйтесь через /start")
         return
 
+    try:
+        sessions = await log_parser.parse_player_sessions()
+    except asyncio.TimeoutError:
+        await message.answer("⏳ Логи сервера обрабатываются слишком долго, попробуйте позже")
+        return
+
+    lines = [
+        f"{number}. `{player}`" + (f" (с {started})" if started else "")
+        for number, (player, started) in enumerate(sessions.items(), start=1)
+    ]
     text = (
         "👥 *Игроки онлайн*\n\n"
-        "1. Player1 (2ч 15м)\n"
-        "2. Player2 (1ч 30м)\n"
-        "3. Player3 (45м)\n"
-        "4. Player4 (20м)\n"
-        "5. Player5 (5м)\n\n"
-        "Всего: 5/20 игроков"
+        + ("\n".join(lines) if lines else "Никого нет")
+        + f"\n\nВсего: {len(sessions)}"
     )
+    if log_parser.demo:
+        text += f"\n\n{DEMO_NOTE}"
 
     await message.answer(text, parse_mode="Markdown")
\ No newline at end of file
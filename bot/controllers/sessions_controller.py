@@ -28,7 +28,7 @@ async def cmd_sessions(message: Message):
         return
 
     remaining = await session_manager.get_remaining_time(message.from_user.id)
-    expires_str = session["expires_at"].strftime("%d.%m.%Y %H:%M")
+    expires_str = session.local_expires_at.strftime("%d.%m.%Y %H:%M")
 
     text = (
         f"🔑 *Управление сессией*\n\n"
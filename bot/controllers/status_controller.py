@@ -1,25 +1,64 @@
 from aiogram import Router, F
 from aiogram.types import CallbackQuery
+
 from bot.keyboards.status_menu import get_status_keyboard
+from domain.server_status import ServerStatus
 
 router = Router()
 
 
-@router.callback_query(F.data == "status")
-async def status_callback(callback: CallbackQuery):
-    status_text = (
+def format_status(server_info: dict, status: ServerStatus) -> str:
+    """Текст статуса сервера"""
+    address = f"{server_info['host']}:{server_info['port']}"
+
+    if not status.is_online:
+        return (
+            "📊 *Статус сервера*\n\n"
+            f"📍 `{address}`\n"
+            "🔴 Сервер: Offline\n"
+            f"❗ {status.error or 'Сервер не отвечает'}"
+        )
+
+    tps = f"{status.tps:.1f}" if status.tps else "н/д"
+    text = (
         "📊 *Статус сервера*\n\n"
+        f"📍 `{address}`\n"
         "🟢 Сервер: Online\n"
-        "👥 Игроки: 0/20\n"
-        "⚡ TPS: 20.0\n"
-        "💾 Память: 0.5/2.0 GB\n"
-        "⏰ Аптайм: 0ч 5м\n\n"
-        "_Функционал в разработке_"
+        f"👥 Игроки: {status.player_count}/{status.max_players}\n"
+        f"⚡ TPS: {tps}\n"
+        f"🏷️ Версия: `{status.version or 'Неизвестно'}`\n"
+        f"⏰ Проверено: {status.last_checked.strftime('%H:%M:%S')}"
     )
 
+    if status.error:
+        text += "\n\n⚠️ _Часть данных не получена вовремя_"
+
+    return text
+
+
+@router.callback_query(F.data == "status")
+async def status_callback(callback: CallbackQuery):
+    session_manager = getattr(callback.bot, 'session_manager', None)
+
+    if not session_manager:
+        await callback.answer("❌ Ошибка системы", show_alert=True)
+        return
+
+    try:
+        rcon_client = await session_manager.get_rcon_client(callback.from_user.id)
+        if not rcon_client:
+            await callback.answer("❌ Сервер не найден. Пожалуйста, авторизуйтесь заново.", show_alert=True)
+            return
+
+        # Запросы идут параллельно под общим дедлайном, статус может быть частичным
+        status = await rcon_client.get_server_status()
+    except Exception as e:
+        await callback.answer(f"❌ Ошибка получения статуса: {str(e)[:150]}", show_alert=True)
+        return
+
     await callback.message.edit_text(
-        status_text,
+        format_status({"host": rcon_client.host, "port": rcon_client.port}, status),
         parse_mode="Markdown",
         reply_markup=get_status_keyboard()
     )
-    await callback.answer()
\ No newline at end of file
+    await callback.answer()
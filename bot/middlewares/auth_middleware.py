@@ -1,4 +1,6 @@
 # bot/middlewares/auth_middleware.py
+import time
+from collections import OrderedDict
 from aiogram import BaseMiddleware
 from aiogram.types import Message, CallbackQuery
 from typing import Callable, Dict, Any, Awaitable
@@ -6,17 +8,53 @@ from aiogram.fsm.context import FSMContext
 
 
 class AuthMiddleware(BaseMiddleware):
-    """Middleware для проверки авторизации"""
+    """
+    Middleware для проверки авторизации.
 
-    def __init__(self, session_manager):
+    Неавторизованный пользователь получает напоминание про /start не чаще
+    раза в notice_interval секунд, остальные его сообщения отбрасываются
+    молча - поток сообщений не превращается в поток ответов Telegram.
+    Запросы к БД при этом отсекает отрицательный кэш SessionManager.
+    """
+
+    MAX_TRACKED_USERS = 10000
+
+    def __init__(self, session_manager, notice_interval: float = 10.0):
         super().__init__()
         self.session_manager = session_manager
+        self.notice_interval = notice_interval
+        # user_id -> время последнего напоминания
+        self._notices: "OrderedDict[int, float]" = OrderedDict()
+        self.suppressed = 0
+
+    def _should_notify(self, user_id: int) -> bool:
+        now = time.monotonic()
+        last = self._notices.get(user_id)
+        if last is not None and now - last < self.notice_interval:
+            self.suppressed += 1
+            return False
+
+        self._notices.pop(user_id, None)
+        self._notices[user_id] = now
+        while len(self._notices) > self.MAX_TRACKED_USERS:
+            self._notices.popitem(last=False)
+        return True
 
     async def __call__(
             self,
             handler: Callable[[Message, Dict[str, Any]], Awaitable[Any]],
             event: Message | CallbackQuery,
             data: Dict[str, Any]
+    ) -> Any:
+        # Проверка здесь и вызовы session_manager в обработчике делят один запрос к БД
+        with self.session_manager.request_scope():
+            return await self._authorize(handler, event, data)
+
+    async def _authorize(
+            self,
+            handler: Callable[[Message, Dict[str, Any]], Awaitable[Any]],
+            event: Message | CallbackQuery,
+            data: Dict[str, Any]
     ) -> Any:
         if not event.from_user:
             return await handler(event, data)
@@ -51,13 +89,19 @@ class AuthMiddleware(BaseMiddleware):
 
         # Проверяем авторизацию через session_manager
         if not await self.session_manager.is_authorized(user_id):
+            notify = self._should_notify(user_id)
             if isinstance(event, Message):
-                await event.answer("🔒 Требуется авторизация. Используйте /start")
+                if notify:
+                    await event.answer("🔒 Требуется авторизация. Используйте /start")
             elif isinstance(event, CallbackQuery):
-                await event.answer(
-                    "🔒 Доступ ограничен. Используйте /start для авторизации.",
-                    show_alert=True
-                )
+                if notify:
+                    await event.answer(
+                        "🔒 Доступ ограничен. Используйте /start для авторизации.",
+                        show_alert=True
+                    )
+                else:
+                    # Ответ на callback обязателен, иначе у кнопки висит загрузка
+                    await event.answer()
             return
 
         return await handler(event, data)
\ No newline at end of file
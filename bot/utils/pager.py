@@ -0,0 +1,81 @@
+# bot/utils/pager.py
+from typing import AsyncIterable, AsyncIterator
+
+from aiogram.types import Message
+
+# Ограничение Telegram на длину сообщения
+TELEGRAM_MESSAGE_LIMIT = 4096
+# Обрамление ```\n ... \n``` вокруг страницы
+CODE_BLOCK_OVERHEAD = 8
+# Больше страниц подряд не отправляем: пачка сообщений упирается в лимиты Telegram
+MAX_PAGES = 5
+
+
+async def paginate(fragments: AsyncIterable[str], page_size: int) -> AsyncIterator[str]:
+    """
+    Режет поток текста на страницы не длиннее page_size.
+
+    Страница по возможности заканчивается на переводе строки. В памяти
+    держится только текущая страница и последняя пришедшая часть.
+    """
+    buffer = ""
+
+    try:
+        async for fragment in fragments:
+            buffer += fragment
+
+            while len(buffer) > page_size:
+                cut = buffer.rfind("\n", 0, page_size + 1)
+                if cut <= 0:
+                    cut = page_size
+
+                page = buffer[:cut].strip()
+                buffer = buffer[cut:]
+                if page:
+                    yield page
+    finally:
+        # Если страницы перестали читать, источник закрывается сразу
+        aclose = getattr(fragments, "aclose", None)
+        if aclose is not None:
+            await aclose()
+
+    page = buffer.strip()
+    if page:
+        yield page
+
+
+async def send_paged(message: Message, fragments: AsyncIterable[str], header: str,
+                     max_pages: int = MAX_PAGES) -> int:
+    """
+    Отправляет ответ сервера постранично блоками кода.
+
+    Заголовок идет первым сообщением вместе с первой страницей;
+    если ответ пустой, отправляется только он. Отправляется не больше
+    max_pages страниц, остаток ответа не читается, а в конце идет
+    пометка об обрезке. Возвращает число отправленных страниц.
+    """
+    page_size = TELEGRAM_MESSAGE_LIMIT - len(header) - CODE_BLOCK_OVERHEAD - 1
+    pages = 0
+    truncated = False
+
+    paged = paginate(fragments, page_size)
+    try:
+        async for page in paged:
+            if pages >= max_pages:
+                truncated = True
+                break
+
+            text = f"```\n{page}\n```"
+            if pages == 0:
+                text = f"{header}\n{text}"
+            await message.answer(text, parse_mode="Markdown")
+            pages += 1
+    finally:
+        await paged.aclose()
+
+    if pages == 0:
+        await message.answer(header, parse_mode="Markdown")
+    elif truncated:
+        await message.answer(f"✂️ Ответ обрезан: показаны первые {pages} стр.")
+
+    return pages
@@ -42,10 +42,25 @@ class Settings:
         self.RCON_MAX_RETRIES = self._get_int("RCON_MAX_RETRIES", 3)
         self.RCON_RETRY_DELAY = self._get_int("RCON_RETRY_DELAY", 1)
         self.RCON_DEFAULT_PORT = self._get_int("RCON_DEFAULT_PORT", 25575)
+        self.RCON_POOL_IDLE_TIMEOUT = self._get_int("RCON_POOL_IDLE_TIMEOUT", 300)
+        self.RCON_RETRY_MAX_DELAY = self._get_int("RCON_RETRY_MAX_DELAY", 10)
+        self.RCON_BREAKER_FAILURE_THRESHOLD = self._get_int("RCON_BREAKER_FAILURE_THRESHOLD", 3)
+        self.RCON_BREAKER_OPEN_SECONDS = self._get_int("RCON_BREAKER_OPEN_SECONDS", 5)
+        self.RCON_BREAKER_MAX_OPEN_SECONDS = self._get_int("RCON_BREAKER_MAX_OPEN_SECONDS", 120)
+        self.RCON_CACHE_MAX_KB = self._get_int("RCON_CACHE_MAX_KB", 512)
+        self.RCON_STATUS_DEADLINE = self._get_float("RCON_STATUS_DEADLINE", 5.0)
+        self.RCON_HEALTH_INTERVAL = self._get_int("RCON_HEALTH_INTERVAL", 30)
+        self.RCON_HEALTH_MAX_AGE = self._get_int("RCON_HEALTH_MAX_AGE", 90)
+        self.RCON_RATE_PER_SECOND = self._get_float("RCON_RATE_PER_SECOND", 10.0)
+        self.RCON_RATE_BURST = self._get_int("RCON_RATE_BURST", 20)
 
         # ================= СЕССИИ ===================
         self.SESSION_DURATION_HOURS = self._get_int("SESSION_DURATION_HOURS", 6)
         self.SESSION_AUTO_RENEW = self._get_bool("SESSION_AUTO_RENEW", True)
+        self.SESSION_CACHE_SIZE = self._get_int("SESSION_CACHE_SIZE", 10000)
+        self.SESSION_CACHE_SWEEP_SECONDS = self._get_int("SESSION_CACHE_SWEEP_SECONDS", 60)
+        self.AUTH_NEGATIVE_CACHE_TTL = self._get_float("AUTH_NEGATIVE_CACHE_TTL", 30.0)
+        self.AUTH_NOTICE_INTERVAL = self._get_float("AUTH_NOTICE_INTERVAL", 10.0)
 
         # ================= БЕЗОПАСНОСТЬ =============
         self.ENCRYPTION_KEY = self._get("ENCRYPTION_KEY", None)
@@ -61,6 +76,16 @@ class Settings:
         self.MONITORING_INTERVAL_MINUTES = self._get_int("MONITORING_INTERVAL_MINUTES", 5)
         self.TPS_WARNING_THRESHOLD = self._get_float("TPS_WARNING_THRESHOLD", 15.0)
         self.TPS_CRITICAL_THRESHOLD = self._get_float("TPS_CRITICAL_THRESHOLD", 10.0)
+        # Папка логов Minecraft сервера. Пока она не задана, экраны логов
+        # работают на демо-логах и помечаются как демо-данные
+        self.MINECRAFT_LOG_DIR = self._get("MINECRAFT_LOG_DIR", "")
+        self.LOG_DEMO_MODE = not self.MINECRAFT_LOG_DIR
+        if self.LOG_DEMO_MODE:
+            self.MINECRAFT_LOG_DIR = "./demo_logs"
+        self.LOG_PARSER_WORKERS = self._get_int("LOG_PARSER_WORKERS", 2)
+        self.LOG_PARSER_TIMEOUT = self._get_float("LOG_PARSER_TIMEOUT", 10.0)
+        self.LOG_WATCH_POLL_INTERVAL = self._get_float("LOG_WATCH_POLL_INTERVAL", 1.0)
+        self.LOG_EVENT_HISTORY = self._get_int("LOG_EVENT_HISTORY", 50)
 
         # ================= РЕЖИМ РАЗРАБОТКИ =========
         self.DEBUG = self._get_bool("DEBUG", False)
@@ -214,6 +239,17 @@ class Settings:
             "timeout": self.RCON_TIMEOUT,
             "max_retries": self.RCON_MAX_RETRIES,
             "retry_delay": self.RCON_RETRY_DELAY,
+            "pool_idle_timeout": self.RCON_POOL_IDLE_TIMEOUT,
+            "retry_max_delay": self.RCON_RETRY_MAX_DELAY,
+            "breaker_failure_threshold": self.RCON_BREAKER_FAILURE_THRESHOLD,
+            "breaker_open_seconds": self.RCON_BREAKER_OPEN_SECONDS,
+            "breaker_max_open_seconds": self.RCON_BREAKER_MAX_OPEN_SECONDS,
+            "cache_max_kb": self.RCON_CACHE_MAX_KB,
+            "status_deadline": self.RCON_STATUS_DEADLINE,
+            "health_interval": self.RCON_HEALTH_INTERVAL,
+            "health_max_age": self.RCON_HEALTH_MAX_AGE,
+            "rate_per_second": self.RCON_RATE_PER_SECOND,
+            "rate_burst": self.RCON_RATE_BURST,
         }
 
     def get_logging_config(self) -> dict:
@@ -22,3 +22,5 @@ class CommandResult:
     message: str
     status: CommandStatus
     timestamp: datetime
+    execution_time_ms: Optional[int] = None  # Время выполнения в миллисекундах
+    error: Optional[str] = None
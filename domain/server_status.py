@@ -14,6 +14,10 @@ class ServerStatus:
     memory_total_mb: int
     uptime_seconds: int
     last_checked: datetime
+    version: Optional[str] = None  # Первая строка ответа на version
+    error: Optional[str] = None  # Почему сервер оффлайн или какие данные не получены
+    circuit_state: Optional[str] = None  # Состояние предохранителя RCON (closed/open/half_open)
+
     def __post_init__(self):
         """Валидация после создания объекта"""
         if self.player_count < 0:
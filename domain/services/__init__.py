@@ -1,4 +1,5 @@
 from .command_validator import CommandValidator, CommandType
+from .session_cache import CachedSession, NegativeCache, SessionCache
 from .session_manager import SessionManager
 
-__all__ = ["CommandValidator", "CommandType", "SessionManager"]
\ No newline at end of file
+__all__ = ["CommandValidator", "CommandType", "CachedSession", "NegativeCache", "SessionCache", "SessionManager"]
\ No newline at end of file
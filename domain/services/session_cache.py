@@ -0,0 +1,217 @@
+import heapq
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+def utc_now() -> datetime:
+    """Текущее время UTC без часового пояса - в том же виде, что expires_at в БД"""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class CachedSession:
+    """
+    Сессия пользователя в кэше SessionManager.
+
+    expires_at - время UTC без часового пояса, как в БД (datetime.utcnow);
+    сравнивается только с utc_now(), а для показа есть local_expires_at.
+
+    rcon_client - готовый RCON клиент с расшифрованным паролем. Он живет
+    ровно столько, сколько запись в кэше: при выходе, истечении или
+    вытеснении сессии ссылка на него стирается (wipe).
+    """
+
+    __slots__ = ('user_id', 'server_id', 'server_host', 'server_port', 'expires_at', 'rcon_client')
+
+    def __init__(self, user_id: int, server_id: int, server_host: str, server_port: int,
+                 expires_at: datetime, rcon_client: Optional[Any] = None):
+        self.user_id = user_id
+        self.server_id = server_id
+        self.server_host = server_host
+        self.server_port = server_port
+        self.expires_at = expires_at
+        self.rcon_client = rcon_client
+
+    def is_expired(self, now: datetime) -> bool:
+        return now >= self.expires_at
+
+    @property
+    def local_expires_at(self) -> datetime:
+        """Время истечения в часовом поясе бота - для сообщений пользователю"""
+        return self.expires_at.replace(tzinfo=timezone.utc).astimezone().replace(tzinfo=None)
+
+    def wipe(self):
+        """Забывает клиента с паролем"""
+        self.rcon_client = None
+
+    def __repr__(self) -> str:
+        return (f"CachedSession(user_id={self.user_id}, server={self.server_host}:{self.server_port}, "
+                f"expires_at={self.expires_at:%Y-%m-%d %H:%M:%S})")
+
+
+class SessionCache:
+    """
+    Ограниченный LRU кэш сессий с индексом истечения.
+
+    Не больше max_size записей: при переполнении вытесняется давно не
+    использованная. Время истечения каждой записи лежит в min-куче,
+    поэтому sweep() удаляет истекшие сессии за O(log n) на запись, не
+    просматривая весь кэш, - и сессии пользователей, которые больше не
+    пишут боту, не копятся в памяти.
+
+    Замененные и удаленные записи остаются в куче до ее очистки: sweep()
+    пропускает их, а когда таких записей становится больше живых, куча
+    пересобирается.
+    """
+
+    def __init__(self, max_size: int = 10000, clock: Callable[[], datetime] = utc_now):
+        self.max_size = max_size
+        self._clock = clock
+        self._entries: "OrderedDict[int, CachedSession]" = OrderedDict()
+        self._expiry: List[Tuple[datetime, int]] = []
+
+        # Счетчики для диагностики
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expired = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, user_id: int) -> bool:
+        return user_id in self._entries
+
+    def get(self, user_id: int) -> Optional[CachedSession]:
+        """Действующая сессия из кэша; истекшая удаляется"""
+        session = self._entries.get(user_id)
+
+        if session is None:
+            self.misses += 1
+            return None
+
+        if session.is_expired(self._clock()):
+            del self._entries[user_id]
+            session.wipe()
+            self.expired += 1
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(user_id)
+        self.hits += 1
+        return session
+
+    def peek(self, user_id: int) -> Optional[CachedSession]:
+        """Запись без проверки срока, порядка LRU и счетчиков"""
+        return self._entries.get(user_id)
+
+    def put(self, session: CachedSession):
+        previous = self._entries.get(session.user_id)
+        if previous is not None and previous is not session:
+            previous.wipe()
+
+        self._entries[session.user_id] = session
+        self._entries.move_to_end(session.user_id)
+        heapq.heappush(self._expiry, (session.expires_at, session.user_id))
+
+        while len(self._entries) > self.max_size:
+            _, evicted = self._entries.popitem(last=False)
+            evicted.wipe()
+            self.evictions += 1
+
+        self._compact()
+
+    def remove(self, user_id: int):
+        session = self._entries.pop(user_id, None)
+        if session is not None:
+            session.wipe()
+
+    def sweep(self) -> int:
+        """Удаляет истекшие сессии; возвращает их количество"""
+        now = self._clock()
+        removed = 0
+
+        while self._expiry and self._expiry[0][0] <= now:
+            expires_at, user_id = heapq.heappop(self._expiry)
+            session = self._entries.get(user_id)
+            # Запись из кучи устарела, если сессию заменили или удалили
+            if session is not None and session.expires_at == expires_at:
+                del self._entries[user_id]
+                session.wipe()
+                removed += 1
+
+        self.expired += removed
+        return removed
+
+    def _compact(self):
+        if len(self._expiry) > 2 * len(self._entries) + 64:
+            self._expiry = [(session.expires_at, user_id) for user_id, session in self._entries.items()]
+            heapq.heapify(self._expiry)
+
+    def clear(self):
+        for session in self._entries.values():
+            session.wipe()
+        self._entries.clear()
+        self._expiry.clear()
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expired": self.expired,
+        }
+
+
+class NegativeCache:
+    """
+    Пользователи без сессии, недавно проверенные по БД.
+
+    Пока запись жива (ttl секунд), проверка авторизации отвечает "нет"
+    без запроса к БД - поток сообщений от неавторизованного аккаунта не
+    нагружает базу. Размер ограничен: при переполнении вытесняются самые
+    старые записи. SessionManager удаляет запись при создании сессии.
+    """
+
+    def __init__(self, ttl: float = 30.0, max_size: int = 10000,
+                 clock: Callable[[], float] = time.monotonic):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._clock = clock
+        self._entries: "OrderedDict[int, float]" = OrderedDict()  # user_id -> истекает в
+
+        # Счетчики для диагностики
+        self.hits = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, user_id: int) -> bool:
+        expires_at = self._entries.get(user_id)
+        if expires_at is None:
+            return False
+
+        if expires_at <= self._clock():
+            del self._entries[user_id]
+            return False
+
+        self.hits += 1
+        return True
+
+    def add(self, user_id: int):
+        if self.ttl <= 0:
+            return
+
+        self._entries.pop(user_id, None)
+        self._entries[user_id] = self._clock() + self.ttl
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def discard(self, user_id: int):
+        self._entries.pop(user_id, None)
+
+    def clear(self):
+        self._entries.clear()
@@ -1,52 +1,112 @@
-from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
-from infrastructure.adapters.crypto import CryptoService
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional, Dict, Any, Tuple
+from infrastructure.adapters.crypto import CryptoService, get_crypto_service
+from domain.services.session_cache import CachedSession, NegativeCache, SessionCache, utc_now
+
+# Сессия и сервер из БД: (сессия для кэша, данные сервера с паролем)
+SessionLookup = Tuple[CachedSession, Dict[str, Any]]
+
+# Результаты запросов к БД в пределах одного обновления Telegram
+_request_lookups: ContextVar[Optional[Dict[int, Optional[SessionLookup]]]] = ContextVar(
+    "session_lookups", default=None
+)
 
 
 class SessionManager:
     """Менеджер сессий с интеграцией БД"""
 
-    def __init__(self, database, session_duration_hours: int = 6):
+    def __init__(self, database, session_duration_hours: int = 6, cache_size: int = 10000,
+                 negative_ttl: float = 30.0):
         self.database = database
         self.session_duration = session_duration_hours
-        self.crypto = CryptoService()
-        self._memory_sessions: Dict[int, dict] = {}
+        # Истекшие сессии удаляет фоновая задача (см. sweep_expired_sessions)
+        self.cache = SessionCache(max_size=cache_size)
+        # Недавно проверенные пользователи без сессии - без повторных запросов к БД
+        self.unauthorized = NegativeCache(ttl=negative_ttl, max_size=cache_size)
+
+    @property
+    def crypto(self) -> CryptoService:
+        """Общий CryptoService процесса (ключ выводится один раз)"""
+        return get_crypto_service()
+
+    def sweep_expired_sessions(self) -> int:
+        """Удаляет из кэша истекшие сессии; возвращает их количество"""
+        return self.cache.sweep()
+
+    @contextmanager
+    def request_scope(self) -> Iterator[None]:
+        """
+        Область одного обновления Telegram (AuthMiddleware и обработчик).
+
+        Внутри нее сессия и сервер пользователя читаются из БД не больше
+        одного раза, сколько бы методов менеджера ни вызывалось.
+        """
+        token = _request_lookups.set({})
+        try:
+            yield
+        finally:
+            _request_lookups.reset(token)
+
+    async def _lookup(self, user_id: int) -> Optional[SessionLookup]:
+        """Активная сессия с сервером одним запросом к БД"""
+        lookups = _request_lookups.get()
+        if lookups is not None and user_id in lookups:
+            return lookups[user_id]
+
+        async with self.database.session_scope() as repos:
+            session_db = await repos['sessions'].get_active_session_with_server(user_id)
+
+            found = None
+            if session_db:
+                server = session_db.server
+                found = (
+                    CachedSession(user_id, server.id, server.host, server.port, session_db.expires_at),
+                    {
+                        "id": server.id,
+                        "host": server.host,
+                        "port": server.port,
+                        "encrypted_password": server.encrypted_password,
+                        "name": server.name
+                    }
+                )
+
+        if found is not None:
+            # Сессия на тот же сервер - готовый RCON клиент переходит в новую запись
+            previous = self.cache.peek(user_id)
+            if previous is not None and previous.server_id == found[0].server_id:
+                found[0].rcon_client = previous.rcon_client
+            self.cache.put(found[0])
+        else:
+            self.unauthorized.add(user_id)
+
+        if lookups is not None:
+            lookups[user_id] = found
+        return found
+
+    def _forget_lookup(self, user_id: int):
+        lookups = _request_lookups.get()
+        if lookups is not None:
+            lookups.pop(user_id, None)
 
     async def is_authorized(self, user_id: int) -> bool:
         """Проверка авторизации через БД"""
         # Сначала проверяем кэш
-        if user_id in self._memory_sessions:
-            session = self._memory_sessions[user_id]
-            if session["is_active"] and datetime.now() < session["expires_at"]:
-                return True
-            else:
-                del self._memory_sessions[user_id]
+        if self.cache.get(user_id) is not None:
+            return True
+        if user_id in self.unauthorized:
+            return False
 
         # Проверяем в БД
         try:
-            async with self.database.session_scope() as repos:
-                session = await repos['sessions'].get_active_session(user_id)
-                if session:
-                    # Обновляем кэш
-                    server = await repos['servers'].get_server(session.server_id)
-                    if server:
-                        self._memory_sessions[user_id] = {
-                            "user_id": user_id,
-                            "server_id": session.server_id,
-                            "server_host": server.host,
-                            "server_port": server.port,
-                            "expires_at": session.expires_at,
-                            "is_active": True
-                        }
-                    return True
+            return await self._lookup(user_id) is not None
         except Exception:
-            pass
-        return False
+            return False
 
     async def create_session(self, user_id: int, host: str, port: int, password: str) -> bool:
         """Создание сессии с сохранением в БД"""
         try:
-            # 1. Проверяем RCON подключение
+            # 1. Проверяем RCON подключение (недавно проверенный сервер - без запроса)
             from infrastructure.adapters.rcon_client import RconClientAdapter
             rcon_client = RconClientAdapter(host, port, password)
 
@@ -69,21 +129,20 @@ class SessionManager:
                 )
 
                 # Создаем сессию
-                await repos['sessions'].create_session(
+                session_db = await repos['sessions'].create_session(
                     user_id=user_id,
                     server_id=server.id,
                     duration_hours=self.session_duration
                 )
 
-                # Обновляем кэш
-                self._memory_sessions[user_id] = {
-                    "user_id": user_id,
-                    "server_id": server.id,
-                    "server_host": host,
-                    "server_port": port,
-                    "expires_at": datetime.now() + timedelta(hours=self.session_duration),
-                    "is_active": True
-                }
+                # Обновляем кэш тем же временем истечения (UTC), что в БД;
+                # проверенный клиент сразу готов для команд
+                self.cache.put(CachedSession(
+                    user_id, server.id, host, port, session_db.expires_at,
+                    rcon_client=rcon_client
+                ))
+                self.unauthorized.discard(user_id)
+                self._forget_lookup(user_id)
 
             return True
 
@@ -91,67 +150,65 @@ class SessionManager:
             print(f"Ошибка создания сессии: {e}")
             return False
 
-    async def get_session(self, user_id: int) -> Optional[Dict[str, Any]]:
+    async def get_session(self, user_id: int) -> Optional[CachedSession]:
         """Получение сессии пользователя"""
         # Проверяем кэш
-        if user_id in self._memory_sessions:
-            session = self._memory_sessions[user_id]
-            if session["is_active"] and datetime.now() < session["expires_at"]:
-                return session
+        session = self.cache.get(user_id)
+        if session is not None:
+            return session
+        if user_id in self.unauthorized:
+            return None
 
         # Получаем из БД
         try:
-            async with self.database.session_scope() as repos:
-                session_db = await repos['sessions'].get_active_session(user_id)
-                if not session_db:
-                    return None
-
-                server = await repos['servers'].get_server(session_db.server_id)
-                if not server:
-                    return None
-
-                session_data = {
-                    "user_id": user_id,
-                    "server_id": session_db.server_id,
-                    "server_host": server.host,
-                    "server_port": server.port,
-                    "expires_at": session_db.expires_at,
-                    "is_active": True
-                }
-
-                # Обновляем кэш
-                self._memory_sessions[user_id] = session_data
-                return session_data
+            found = await self._lookup(user_id)
         except Exception:
             return None
+        return found[0] if found else None
 
     async def get_server(self, user_id: int) -> Optional[Dict[str, Any]]:
         """Получение информации о сервере с паролем"""
+        if user_id in self.unauthorized:
+            return None
+
         try:
-            async with self.database.session_scope() as repos:
-                session = await repos['sessions'].get_active_session(user_id)
-                if not session:
-                    return None
-
-                server = await repos['servers'].get_server(session.server_id)
-                if not server:
-                    return None
-
-                return {
-                    "id": server.id,
-                    "host": server.host,
-                    "port": server.port,
-                    "encrypted_password": server.encrypted_password,
-                    "name": server.name
-                }
+            found = await self._lookup(user_id)
         except Exception:
             return None
+        return dict(found[1]) if found else None
+
+    async def get_rcon_client(self, user_id: int):
+        """
+        RCON клиент сервера текущей сессии.
+
+        Клиент с расшифрованным паролем хранится в записи сессии: пока
+        сессия в кэше, команды не ходят в БД, не расшифровывают пароль и
+        не создают клиента заново. None - сессии нет.
+        """
+        session = self.cache.get(user_id)
+        if session is not None and session.rcon_client is not None:
+            return session.rcon_client
+
+        server = await self.get_server(user_id)
+        if not server:
+            return None
+
+        from infrastructure.adapters.rcon_client import RconClientAdapter
+        rcon_client = RconClientAdapter(
+            server["host"], server["port"], self.crypto.decrypt(server["encrypted_password"])
+        )
+
+        session = self.cache.peek(user_id)
+        if session is not None and session.server_id == server["id"]:
+            session.rcon_client = rcon_client
+        return rcon_client
 
     async def end_session(self, user_id: int) -> bool:
         """Завершение сессии"""
-        # Удаляем из кэша
-        if user_id in self._memory_sessions:
-            del self._memory_sessions[user_id]
+        # Удаляем из кэша вместе с расшифрованным паролем
+        self.cache.remove(user_id)
+        self.unauthorized.discard(user_id)
+        self._forget_lookup(user_id)
 
         # Удаляем из БД
         try:
@@ -167,7 +224,7 @@ class SessionManager:
         if not session:
             return None
 
-        remaining = session["expires_at"] - datetime.now()
+        remaining = session.expires_at - utc_now()
         hours = remaining.seconds // 3600
         minutes = (remaining.seconds % 3600) // 60
 
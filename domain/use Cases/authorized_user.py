@@ -1,17 +1,18 @@
 ﻿from datetime import datetime, timedelta
-from infrastructure.adapters.crypto import CryptoService
+from infrastructure.adapters.crypto import get_crypto_service
 from infrastructure.adapters.rcon_client import RconClientAdapter
 
 
 class AuthorizeUserUseCase:
     def __init__(self, database):
         self.database = database
-        self.crypto = CryptoService()
+        self.crypto = get_crypto_service()
 
     async def execute(self, user_id: int, host: str, port: int, password: str) -> bool:
-        # 1. Проверяем подключение через RCON
+        # 1. Проверяем подключение через RCON (недавно проверенный сервер - без запроса)
         rcon_client = RconClientAdapter(host, port, password)
-        if not await rcon_client.test_connection():
+        success, _ = await rcon_client.test_connection()
+        if not success:
             return False
 
         # 2. Шифруем пароль
@@ -0,0 +1,140 @@
+# infrastructure/adapters/circuit_breaker.py
+import random
+import time
+from enum import Enum
+from typing import Callable
+
+from config.settings import settings
+from infrastructure.adapters.server_registry import ServerRegistry
+
+
+class CircuitState(Enum):
+    """Состояния предохранителя"""
+    CLOSED = "closed"        # Сервер отвечает, команды идут как обычно
+    OPEN = "open"            # Сервер недоступен, команды сразу отклоняются
+    HALF_OPEN = "half_open"  # Пробуем одну команду, чтобы проверить сервер
+
+
+class CircuitOpenError(Exception):
+    """Команда отклонена без обращения к серверу"""
+
+    def __init__(self, host: str, port: int, retry_after: float):
+        self.host = host
+        self.port = port
+        self.retry_after = retry_after
+        super().__init__(
+            f"Сервер {host}:{port} недоступен, следующая попытка через {retry_after:.0f} с"
+        )
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """
+    Экспоненциальная задержка с джиттером.
+
+    Половина задержки фиксирована, вторая половина случайна - так повторы
+    от разных пользователей не приходят на сервер одновременно.
+    """
+    delay = min(cap, base * (2 ** attempt))
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+class CircuitBreaker:
+    """
+    Предохранитель для одного RCON сервера.
+
+    После failure_threshold ошибок подряд переходит в OPEN и сразу
+    отклоняет команды. Время в OPEN растет экспоненциально с каждым
+    неудачным пробным запросом. По истечении времени пропускает один
+    пробный запрос (HALF_OPEN): успех закрывает предохранитель, ошибка
+    снова открывает его.
+    """
+
+    def __init__(self, host: str, port: int,
+                 failure_threshold: int = 3,
+                 open_seconds: float = 5,
+                 max_open_seconds: float = 120,
+                 probe_timeout: float = 30,
+                 clock: Callable[[], float] = time.monotonic):
+        self.host = host
+        self.port = port
+        self.failure_threshold = failure_threshold
+        self.open_seconds = open_seconds
+        self.max_open_seconds = max_open_seconds
+        self.probe_timeout = probe_timeout
+        self._clock = clock
+
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self.trips = 0  # Сколько раз подряд открывался без успешной команды
+        self._open_until = 0.0
+        self._probe_until = 0.0
+
+    def before_call(self):
+        """Проверка перед командой. Бросает CircuitOpenError, если команду выполнять нельзя"""
+        now = self._clock()
+
+        if self.state == CircuitState.OPEN:
+            if now < self._open_until:
+                raise CircuitOpenError(self.host, self.port, self._open_until - now)
+            self.state = CircuitState.HALF_OPEN
+            self._probe_until = 0.0
+
+        if self.state == CircuitState.HALF_OPEN:
+            # Пока пробный запрос в полете, остальные отклоняются.
+            # Если проба зависла дольше probe_timeout, разрешаем новую
+            if now < self._probe_until:
+                raise CircuitOpenError(self.host, self.port, self._probe_until - now)
+            self._probe_until = now + self.probe_timeout
+
+    def record_success(self):
+        """Сервер ответил"""
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self.trips = 0
+
+    def record_failure(self):
+        """Сервер не ответил или разорвал соединение"""
+        self.failures += 1
+
+        if self.state == CircuitState.HALF_OPEN or self.failures >= self.failure_threshold:
+            self._trip()
+
+    def record_abandoned(self):
+        """
+        Команда прервана до ответа сервера (отмена, остановка потока).
+
+        Исход неизвестен, поэтому счетчики не меняются, но пробный запрос
+        больше не считается находящимся в полете.
+        """
+        if self.state == CircuitState.HALF_OPEN:
+            self._probe_until = 0.0
+
+    def _trip(self):
+        self.state = CircuitState.OPEN
+        self._open_until = self._clock() + backoff_delay(self.trips, self.open_seconds, self.max_open_seconds)
+        self.trips += 1
+
+    @property
+    def retry_after(self) -> float:
+        """Через сколько секунд предохранитель пропустит пробный запрос"""
+        if self.state != CircuitState.OPEN:
+            return 0.0
+        return max(0.0, self._open_until - self._clock())
+
+    def snapshot(self) -> dict:
+        """Состояние для статуса сервера"""
+        return {
+            "state": self.state.value,
+            "failures": self.failures,
+            "retry_after": round(self.retry_after, 1),
+        }
+
+
+# Глобальный реестр предохранителей
+circuit_breakers = ServerRegistry(
+    CircuitBreaker,
+    failure_threshold=settings.RCON_BREAKER_FAILURE_THRESHOLD,
+    open_seconds=settings.RCON_BREAKER_OPEN_SECONDS,
+    max_open_seconds=settings.RCON_BREAKER_MAX_OPEN_SECONDS,
+    probe_timeout=settings.RCON_TIMEOUT * 2
+)
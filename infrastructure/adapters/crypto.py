@@ -1,5 +1,9 @@
 ﻿# infrastructure/adapters/crypto.py
 import os
+import threading
+import time
+from functools import lru_cache
+from typing import Dict, Optional
 from cryptography.fernet import Fernet, InvalidToken
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
@@ -8,10 +12,29 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Фиксированный salt для совместимости
+KEY_SALT = b'minecraft_salt_2024_v2'  # Изменен salt!
+KEY_ITERATIONS = 100000
+
+
+@lru_cache(maxsize=4)
+def _derive_key(secret: str) -> bytes:
+    """PBKDF2 (~100 мс) выполняется один раз на секрет за время жизни процесса"""
+    kdf = PBKDF2HMAC(
+        algorithm=hashes.SHA256(),
+        length=32,
+        salt=KEY_SALT,
+        iterations=KEY_ITERATIONS,
+    )
+    return base64.urlsafe_b64encode(kdf.derive(secret.encode('utf-8')))
+
 
 class CryptoService:
     def __init__(self, secret_key: str = None):
         """Инициализация с исправленной логикой"""
+        started = time.perf_counter()
+        # Время этапов инициализации, мс (см. get_crypto_service)
+        self.timings: Dict[str, float] = {}
 
         # 1. Получаем ключ из настроек если не передан
         if not secret_key:
@@ -26,7 +49,9 @@ class CryptoService:
         if secret_key:
             logger.info("Использую ключ из конфигурации")
             try:
+                derive_started = time.perf_counter()
                 key = self._generate_key_from_secret(secret_key)
+                self.timings['derive_ms'] = (time.perf_counter() - derive_started) * 1000
                 self.cipher_suite = Fernet(key)
                 logger.debug(f"Ключ создан успешно")
             except Exception as e:
@@ -46,7 +71,10 @@ class CryptoService:
             self._save_key_to_env(key)
 
         # 4. Тестируем шифрование
+        test_started = time.perf_counter()
         self._test_encryption()
+        self.timings['self_test_ms'] = (time.perf_counter() - test_started) * 1000
+        self.timings['total_ms'] = (time.perf_counter() - started) * 1000
 
     def _save_key_to_env(self, key: bytes):
         """Сохраняет ключ в .env файл"""
@@ -85,19 +113,7 @@ class CryptoService:
             if not isinstance(secret, str):
                 secret = str(secret)
 
-            # Фиксированный salt для совместимости
-            salt = b'minecraft_salt_2024_v2'  # Изменен salt!
-
-            kdf = PBKDF2HMAC(
-                algorithm=hashes.SHA256(),
-                length=32,
-                salt=salt,
-                iterations=100000,
-            )
-
-            # Конвертируем secret в bytes
-            secret_bytes = secret.encode('utf-8')
-            key = base64.urlsafe_b64encode(kdf.derive(secret_bytes))
+            key = _derive_key(secret)
 
             logger.debug(f"Сгенерирован ключ из secret длиной {len(secret)}")
             return key
@@ -169,4 +185,24 @@ class CryptoService:
         except Exception as e:
             logger.error(f"Ошибка дешифровки {type(e).__name__}: {e}")
             logger.error(f"Данные тип: {type(encrypted_data)}, длина: {len(encrypted_data)}")
-            raise
\ No newline at end of file
+            raise
+
+
+_shared_service: Optional[CryptoService] = None
+_shared_lock = threading.Lock()
+
+
+def get_crypto_service() -> CryptoService:
+    """
+    Общий CryptoService процесса.
+
+    Создается при первом обращении: импорт модулей, которым нужно
+    шифрование, не запускает PBKDF2 и самопроверку, а ключ выводится
+    один раз на процесс, сколько бы модулей его ни использовало.
+    """
+    global _shared_service
+    if _shared_service is None:
+        with _shared_lock:
+            if _shared_service is None:
+                _shared_service = CryptoService()
+    return _shared_service
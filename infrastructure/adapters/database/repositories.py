@@ -3,6 +3,7 @@ from typing import List, Optional, Dict, Any
 from datetime import datetime, timedelta
 from sqlalchemy import select, update, delete, desc, func
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
 
 from .models import (
     ServerModel, UserSessionModel, AdminModel,
@@ -116,6 +117,29 @@ class SessionRepository:
 
         return session
 
+    async def get_active_session_with_server(self, user_id: int) -> Optional[UserSessionModel]:
+        """
+        Активная сессия пользователя вместе с сервером (session.server).
+
+        Сервер с зашифрованным паролем загружается тем же запросом (JOIN),
+        без отдельного get_server.
+        """
+        stmt = select(UserSessionModel).options(
+            joinedload(UserSessionModel.server, innerjoin=True)
+        ).where(
+            UserSessionModel.user_id == user_id,
+            UserSessionModel.expires_at > datetime.utcnow()
+        )
+        result = await self.session.execute(stmt)
+        session = result.scalar_one_or_none()
+
+        if session:
+            # Обновляем время последней активности
+            session.last_activity = datetime.utcnow()
+            await self.session.flush()
+
+        return session
+
     async def delete_user_session(self, user_id: int) -> bool:
         """Удаление сессии пользователя"""
         stmt = delete(UserSessionModel).where(UserSessionModel.user_id == user_id)
@@ -0,0 +1,129 @@
+# infrastructure/adapters/rcon_cache.py
+import sys
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Set, Tuple
+
+from config.settings import settings
+from infrastructure.adapters.rcon_pool import PoolKey
+
+CacheKey = Tuple[PoolKey, str]
+
+# Команды только для чтения, ответы на которые можно кэшировать.
+# Список ведется здесь, а не в CommandValidator: он не должен менять
+# набор команд, разрешенных пользователям
+CACHEABLE_COMMANDS = frozenset({"list", "version", "tps", "forge tps", "seed"})
+
+
+class RconResponseCache:
+    """
+    LRU кэш ответов на команды только для чтения (CACHEABLE_COMMANDS).
+
+    Записи живут TTL секунд (свой для каждой команды), общий объем
+    ограничен max_bytes. Ключ включает хэш пароля, поэтому ответ
+    не достается клиенту с другими учетными данными.
+    """
+
+    # TTL по умолчанию для отдельных команд, секунды
+    DEFAULT_TTLS = {
+        "list": 2,
+        "tps": 5,
+        "forge tps": 5,
+        "version": 600,
+        "seed": 3600,
+    }
+
+    def __init__(self, max_bytes: int = 512 * 1024, default_ttl: float = 5,
+                 ttls: Optional[Dict[str, float]] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.ttls = dict(self.DEFAULT_TTLS if ttls is None else ttls)
+        self._clock = clock
+
+        # key -> (истекает в, ответ, размер в байтах)
+        self._entries: "OrderedDict[CacheKey, Tuple[float, str, int]]" = OrderedDict()
+        # (host, port) -> ключи записей сервера, для быстрой инвалидации
+        self._by_server: Dict[Tuple[str, int], Set[CacheKey]] = {}
+        self.size_bytes = 0
+
+        # Счетчики для диагностики
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def ttl_for(self, command: str) -> float:
+        return self.ttls.get(command, self.default_ttl)
+
+    def get(self, server_key: PoolKey, command: str) -> Optional[str]:
+        key = (server_key, command)
+        entry = self._entries.get(key)
+
+        if entry is None:
+            self.misses += 1
+            return None
+
+        if entry[0] <= self._clock():
+            self._remove(key)
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, server_key: PoolKey, command: str, response: str):
+        ttl = self.ttl_for(command)
+        size = sys.getsizeof(response)
+        if ttl <= 0 or size > self.max_bytes:
+            return
+
+        key = (server_key, command)
+        if key in self._entries:
+            self._remove(key)
+
+        self._entries[key] = (self._clock() + ttl, response, size)
+        self._by_server.setdefault(server_key[:2], set()).add(key)
+        self.size_bytes += size
+
+        while self.size_bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def invalidate_server(self, host: str, port: int):
+        """Сбрасывает все ответы сервера (после изменяющей команды)"""
+        for key in list(self._by_server.get((host, port), ())):
+            self._remove(key)
+
+    def clear(self):
+        self._entries.clear()
+        self._by_server.clear()
+        self.size_bytes = 0
+
+    def _remove(self, key: CacheKey):
+        _, _, size = self._entries.pop(key)
+        self.size_bytes -= size
+
+        server_keys = self._by_server.get(key[0][:2])
+        if server_keys is not None:
+            server_keys.discard(key)
+            if not server_keys:
+                del self._by_server[key[0][:2]]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_stats(self) -> dict:
+        """Статистика кэша"""
+        return {
+            "entries": len(self._entries),
+            "size_bytes": self.size_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+# Глобальный кэш ответов RCON
+rcon_response_cache = RconResponseCache(max_bytes=settings.RCON_CACHE_MAX_KB * 1024)
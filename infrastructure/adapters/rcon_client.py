@@ -1,12 +1,22 @@
 ﻿# infrastructure/adapters/rcon_client.py
 import asyncio
+import re
 import socket
-from typing import Optional, Tuple
-from rcon.source import rcon as rcon_async
-from rcon.exceptions import EmptyResponse, SessionTimeout, WrongPassword
+import time
+from datetime import datetime
+from typing import AsyncIterator, List, Optional, Tuple
 
+from domain.command_result import CommandResult, CommandStatus
+from domain.server_status import ServerStatus
 from loggers.app_logger import logger
 from config.settings import settings
+from infrastructure.adapters.rcon_pool import rcon_pool, make_pool_key
+from infrastructure.adapters.single_flight import rcon_single_flight
+from infrastructure.adapters.rcon_cache import rcon_response_cache, CACHEABLE_COMMANDS
+from infrastructure.adapters.rcon_health import rcon_health
+from infrastructure.adapters.rcon_scheduler import rcon_schedulers, command_priority
+from infrastructure.adapters.circuit_breaker import circuit_breakers, CircuitOpenError, backoff_delay
+from infrastructure.adapters.rcon_protocol import RconAuthError, RconConnectionClosed
 
 
 class RconClientAdapter:
@@ -14,6 +24,10 @@ class RconClientAdapter:
     Адаптер для работы с RCON протоколом Minecraft серверов.
     """
 
+    # Команды только для чтения: одновременные одинаковые запросы к серверу
+    # объединяются в один
+    COALESCED_COMMANDS = frozenset({"list", "version", "tps", "forge tps"})
+
     def __init__(self, host: str, port: int, password: str):
         self.host = host
         self.port = port
@@ -23,6 +37,10 @@ class RconClientAdapter:
 
     async def test_connection(self) -> Tuple[bool, str]:
         """Упрощенная проверка RCON подключения"""
+        # Сервер недавно отвечал с этим паролем - повторный запрос не нужен
+        if rcon_health.is_known_good(self.host, self.port, self.password):
+            return True, "RCON подключено (проверено недавно)"
+
         try:
             logger.info(f"Проверка RCON: {self.host}:{self.port}")
 
@@ -36,7 +54,7 @@ class RconClientAdapter:
             # Это нормально и означает успешное подключение
             return True, f"RCON подключено: {response[:50] if response else 'пустой ответ'}"
 
-        except WrongPassword:
+        except RconAuthError:
             return False, "Неверный пароль RCON"
         except ConnectionRefusedError:
             return False, "Соединение отклонено. Проверьте порт и включен ли RCON"
@@ -46,11 +64,131 @@ class RconClientAdapter:
             error_msg = self._parse_rcon_error(e)
             return False, f"Ошибка RCON: {error_msg}"
 
-    async def execute_command(self, command: str) -> str:
+    async def execute_command(self, command: str, fresh: bool = False) -> str:
+        """
+        Выполняет команду на сервере с повторными попытками.
+
+        Ответы на команды только для чтения (CACHEABLE_COMMANDS) берутся
+        из кэша, остальные команды сбрасывают кэш сервера. С fresh=True
+        ответ запрашивается у сервера в любом случае (и обновляет кэш).
+        """
+        normalized = " ".join(command.lower().split())
+        # Пароль входит в ключи, чтобы не отдавать ответ клиенту с другими учетными данными
+        server_key = make_pool_key(self.host, self.port, self.password)
+        read_only = normalized in CACHEABLE_COMMANDS
+
+        if read_only and not fresh:
+            cached = rcon_response_cache.get(server_key, normalized)
+            if cached is not None:
+                return cached
+
+        if normalized in self.COALESCED_COMMANDS:
+            response = await rcon_single_flight.run(
+                server_key + (normalized,),
+                lambda: self._execute_with_retry(command)
+            )
+        else:
+            response = await self._execute_with_retry(command)
+
+        if read_only:
+            rcon_response_cache.put(server_key, normalized, response)
+        else:
+            rcon_response_cache.invalidate_server(self.host, self.port)
+
+        return response
+
+    async def execute_command_stream(self, command: str) -> AsyncIterator[str]:
+        """
+        Потоковый вариант execute_command для команд с большим ответом
+        (help, banlist, whitelist list, forge entity list).
+
+        Части ответа отдаются по мере прихода RCON пакетов, ответ целиком
+        не собирается. Кэш и объединение запросов не используются, повторов
+        нет: часть ответа уже могла уйти пользователю.
         """
-        Выполняет команду на сервере с повторными попытками
+        normalized = " ".join(command.lower().split())
+        read_only = normalized in CACHEABLE_COMMANDS
+        breaker = circuit_breakers.get(self.host, self.port)
+        breaker.before_call()
+        delivered = False
+        recorded = False
+
+        try:
+            await rcon_schedulers.get(self.host, self.port).acquire(command_priority(normalized))
+            started = time.perf_counter()
+
+            async for fragment in rcon_pool.stream(
+                host=self.host,
+                port=self.port,
+                password=self.password,
+                command=command,
+                timeout=settings.RCON_TIMEOUT
+            ):
+                delivered = True
+                yield fragment
+        except RconAuthError as e:
+            recorded = True
+            breaker.record_success()
+            rcon_health.record_auth_failure(self.host, self.port, self.password, str(e))
+            raise
+        except Exception as e:
+            if self._is_server_failure(e):
+                recorded = True
+                breaker.record_failure()
+                rcon_health.record_failure(self.host, self.port, self.password, self._parse_rcon_error(e))
+            raise
+        else:
+            recorded = True
+            breaker.record_success()
+            rcon_health.record_success(
+                self.host, self.port, self.password,
+                latency_ms=int((time.perf_counter() - started) * 1000)
+            )
+        finally:
+            # Потребитель остановил поток или задачу отменили: если сервер
+            # уже отвечал, он доступен, иначе исход пробного запроса неизвестен
+            if not recorded:
+                if delivered:
+                    breaker.record_success()
+                else:
+                    breaker.record_abandoned()
+            if not read_only:
+                rcon_response_cache.invalidate_server(self.host, self.port)
+
+    async def execute_many(self, commands: List[str], concurrency: int = 5) -> List[CommandResult]:
+        """
+        Выполняет список команд через одну авторизованную RCON сессию.
+
+        До concurrency команд ждут ответа одновременно (по соединению они
+        выполняются по очереди). Результаты
+        возвращаются в порядке команд, у каждого свое время выполнения и ошибка.
         """
-        return await self._execute_with_retry(command)
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def run(command: str) -> CommandResult:
+            async with semaphore:
+                started = time.perf_counter()
+                try:
+                    response = await self.execute_command(command)
+                    success, status, error = True, CommandStatus.SUCCESS, None
+                except asyncio.TimeoutError:
+                    response = ""
+                    success, status, error = False, CommandStatus.TIMEOUT, "Таймаут ожидания ответа"
+                except Exception as e:
+                    response = ""
+                    success, status, error = False, CommandStatus.SERVER_ERROR, self._parse_rcon_error(e)
+
+                return CommandResult(
+                    success=success,
+                    command=command,
+                    message=response if success else error,
+                    status=status,
+                    timestamp=datetime.now(),
+                    execution_time_ms=int((time.perf_counter() - started) * 1000),
+                    error=error
+                )
+
+        return list(await asyncio.gather(*(run(command) for command in commands)))
 
     async def send_command(self, command: str) -> Tuple[bool, str]:
         """
@@ -65,34 +203,84 @@ class RconClientAdapter:
 
     async def _execute_with_retry(self, command: str) -> str:
         """
-        Внутренний метод с повторными попытками
+        Внутренний метод с повторными попытками.
+
+        Повторы идут с экспоненциальной задержкой. Если сервер недоступен,
+        общий для всех пользователей предохранитель сразу отклоняет команду.
+        Каждая попытка проходит через очередь сервера (см. RconScheduler).
         """
+        breaker = circuit_breakers.get(self.host, self.port)
+        scheduler = rcon_schedulers.get(self.host, self.port)
+        priority = command_priority(command)
         last_exception = None
 
         for attempt in range(settings.RCON_MAX_RETRIES):
             try:
+                breaker.before_call()
+            except CircuitOpenError:
+                # Предохранитель открылся во время повторов - отдаем реальную ошибку
+                if last_exception:
+                    raise last_exception
+                raise
+
+            try:
+                await scheduler.acquire(priority)
                 logger.debug(f"RCON команда [{attempt + 1}/{settings.RCON_MAX_RETRIES}]: {command}")
+                started = time.perf_counter()
 
-                response = await rcon_async(
-                    command=command,
+                # Соединение берется из пула: без нового TCP подключения и авторизации
+                response = await rcon_pool.execute(
                     host=self.host,
                     port=self.port,
-                    passwd=self.password,
+                    password=self.password,
+                    command=command,
                     timeout=settings.RCON_TIMEOUT
                 )
 
+                breaker.record_success()
+                rcon_health.record_success(
+                    self.host, self.port, self.password,
+                    latency_ms=int((time.perf_counter() - started) * 1000)
+                )
                 return response.strip() if response else ""
 
-            except EmptyResponse:
-                return ""
+            except RconAuthError as e:
+                # Сервер ответил, а неверный пароль повтор не исправит
+                breaker.record_success()
+                rcon_health.record_auth_failure(self.host, self.port, self.password, str(e))
+                raise
+            except asyncio.CancelledError:
+                # Отмена (например, по дедлайну статуса) не держит пробный запрос
+                breaker.record_abandoned()
+                raise
             except Exception as e:
                 last_exception = e
+                if self._is_server_failure(e):
+                    breaker.record_failure()
+                    rcon_health.record_failure(self.host, self.port, self.password, self._parse_rcon_error(e))
+                else:
+                    breaker.record_abandoned()
                 logger.warning(f"Попытка {attempt + 1} неудачна: {e}")
                 if attempt < settings.RCON_MAX_RETRIES - 1:
-                    await asyncio.sleep(settings.RCON_RETRY_DELAY)
+                    await asyncio.sleep(
+                        backoff_delay(attempt, settings.RCON_RETRY_DELAY, settings.RCON_RETRY_MAX_DELAY)
+                    )
 
         raise last_exception or Exception("Все попытки выполнения команды неудачны")
 
+    @staticmethod
+    def _is_server_failure(error: Exception) -> bool:
+        """Ошибка говорит о недоступности сервера (а не о проблеме команды)"""
+        return isinstance(error, (OSError, asyncio.TimeoutError))
+
+    def get_circuit_state(self) -> dict:
+        """Состояние предохранителя сервера"""
+        return circuit_breakers.get(self.host, self.port).snapshot()
+
+    def get_queue_stats(self) -> dict:
+        """Глубина очереди и время ожидания команд сервера"""
+        return rcon_schedulers.get(self.host, self.port).get_stats()
+
     def _parse_rcon_error(self, error: Exception) -> str:
         """
         Парсинг ошибок RCON для понятного сообщения
@@ -107,60 +295,106 @@ class RconClientAdapter:
             return "Таймаут ожидания ответа"
         elif "authentication" in error_str:
             return "Ошибка аутентификации RCON"
-        elif isinstance(error, WrongPassword):
+        elif isinstance(error, RconAuthError):
             return "Неверный пароль RCON"
-        elif isinstance(error, SessionTimeout):
-            return "Таймаут сессии RCON"
+        elif isinstance(error, RconConnectionClosed):
+            return "Соединение RCON закрыто сервером"
+        elif isinstance(error, CircuitOpenError):
+            return str(error)
         else:
             return f"Ошибка RCON: {type(error).__name__}: {error}"
 
-    async def get_server_status(self) -> dict:
+    # Запросы, из которых собирается статус сервера
+    STATUS_COMMANDS = ("list", "version", "tps")
+
+    async def get_server_status(self, deadline: Optional[float] = None) -> ServerStatus:
         """
-        Получение статуса сервера с проверкой
+        Получение статуса сервера.
+
+        list, version и tps запрашиваются одновременно под одним общим
+        дедлайном (по соединению они выполняются по очереди). Запросы, не
+        успевшие к дедлайну, отменяются, а статус собирается из того, что пришло.
+
+        Сервер считается онлайн, только если на list пришел живой ответ:
+        version и tps могут быть взяты из кэша и доступность не доказывают.
         """
-        status = {
-            "online": False,
-            "players": "0/0",
-            "version": "Неизвестно",
-            "motd": "Неизвестно",
-            "error": None
+        if deadline is None:
+            deadline = settings.RCON_STATUS_DEADLINE
+
+        tasks = {
+            command: asyncio.create_task(self.execute_command(command, fresh=command == "list"))
+            for command in self.STATUS_COMMANDS
         }
+        done, pending = await asyncio.wait(tasks.values(), timeout=deadline)
+        for task in pending:
+            task.cancel()
 
-        try:
-            # Проверяем базовое подключение
-            success, message = await self.test_connection()
+        responses = {}
+        errors = []
+        for command, task in tasks.items():
+            if task not in done:
+                errors.append(f"{command}: таймаут")
+            elif task.exception() is not None:
+                errors.append(f"{command}: {self._parse_rcon_error(task.exception())}")
+            else:
+                responses[command] = task.result()
 
-            if not success:
-                status["error"] = message
-                return status
+        is_online = "list" in responses
+        if is_online:
+            error = "; ".join(errors) or None
+        elif tasks["list"] in done:
+            error = self._parse_rcon_error(tasks["list"].exception())
+        else:
+            error = "Таймаут. Сервер не отвечает"
 
-            status["online"] = True
+        if not is_online:
+            # Ответы из кэша не выдаем за данные недоступного сервера
+            responses = {}
 
-            # Получаем список игроков
-            try:
-                list_response = await self.execute_command("list")
-                if list_response:
-                    import re
-                    # Ищем паттерн "There are X/Y players online:"
-                    match = re.search(r'(\d+)/(\d+)', list_response)
-                    if match:
-                        status["players"] = f"{match.group(1)}/{match.group(2)}"
-            except:
-                pass
-
-            # Получаем версию
-            try:
-                version_response = await self.execute_command("version")
-                if version_response:
-                    status["version"] = version_response.split('\n')[0]
-            except:
-                pass
+        player_count, max_players = self._parse_player_count(responses.get("list", ""))
+        version = responses.get("version")
 
-            return status
+        return ServerStatus(
+            is_online=is_online,
+            player_count=player_count,
+            max_players=max_players,
+            tps=self._parse_tps(responses.get("tps", "")),
+            memory_used_mb=0,
+            memory_total_mb=0,
+            uptime_seconds=0,
+            last_checked=datetime.now(),
+            version=version.split('\n')[0] if version else None,
+            error=error,
+            circuit_state=self.get_circuit_state()["state"]
+        )
 
-        except Exception as e:
-            status["error"] = str(e)
-            return status
+    @staticmethod
+    def _parse_player_count(list_response: str) -> Tuple[int, int]:
+        """
+        Количество игроков из ответа list.
+
+        Форматы: "There are 3 of a max of 20 players online: ..." (ванилла 1.13+)
+        и "There are 3/20 players online: ..." (старые версии, Bukkit)
+        """
+        match = re.search(r'(\d+)\s*(?:/|of a max of|of a max)\s*(\d+)', list_response)
+        if not match:
+            return 0, 0
+        return int(match.group(1)), int(match.group(2))
+
+    @staticmethod
+    def _parse_tps(tps_response: str) -> float:
+        """
+        TPS за последнюю минуту из ответа tps (Paper/Spigot).
+
+        Пример: "TPS from last 1m, 5m, 15m: 20.0, 19.98, 19.95".
+        На ванильном сервере команды нет - возвращается 0.0
+        """
+        # Убираем цветовые коды вида §a
+        cleaned = re.sub(r'§.', '', tps_response)
+        if 'tps' not in cleaned.lower():
+            return 0.0
+        match = re.search(r':\s*\*?(\d+(?:\.\d+)?)', cleaned)
+        return float(match.group(1)) if match else 0.0
 
 
 # Фабрика с улучшенной проверкой
@@ -0,0 +1,127 @@
+# infrastructure/adapters/rcon_health.py
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional
+
+from loggers.app_logger import logger
+from config.settings import settings
+from infrastructure.adapters.rcon_pool import PoolKey, RconConnectionPool, make_pool_key, rcon_pool
+
+
+@dataclass
+class ServerHealth:
+    """Последнее известное состояние RCON сервера для конкретного пароля"""
+    alive: bool
+    authenticated: bool
+    checked_at: float  # time.monotonic() момента проверки
+    latency_ms: Optional[int] = None
+    error: Optional[str] = None
+
+
+class RconHealthProber:
+    """
+    Хранит доступность сервера и результат авторизации по (host, port, хэш пароля).
+
+    Состояние обновляется двумя путями:
+    - пассивно: каждая команда через RconClientAdapter сообщает результат;
+    - активно: фоновая задача пингует соединения из пула пустым пакетом,
+      который сервер не выполняет как команду.
+
+    Авторизация и статус читают состояние за O(1) вместо отдельного запроса.
+    """
+
+    def __init__(self, pool: RconConnectionPool, interval: float = 30, max_age: float = 90,
+                 clock: Callable[[], float] = time.monotonic):
+        self.pool = pool
+        self.interval = interval
+        self.max_age = max_age
+        self._clock = clock
+        self._health: Dict[PoolKey, ServerHealth] = {}
+
+    def get(self, host: str, port: int, password: str) -> Optional[ServerHealth]:
+        """Свежее состояние сервера или None, если данных нет или они устарели"""
+        key = make_pool_key(host, port, password)
+        health = self._health.get(key)
+        if health is None:
+            return None
+        if self._clock() - health.checked_at > self.max_age:
+            del self._health[key]
+            return None
+        return health
+
+    def is_known_good(self, host: str, port: int, password: str) -> bool:
+        """Сервер недавно отвечал и принимал этот пароль"""
+        health = self.get(host, port, password)
+        return health is not None and health.alive and health.authenticated
+
+    def record_success(self, host: str, port: int, password: str, latency_ms: Optional[int] = None):
+        self._record(make_pool_key(host, port, password), True, True, latency_ms, None)
+
+    def record_auth_failure(self, host: str, port: int, password: str, error: str):
+        self._record(make_pool_key(host, port, password), True, False, None, error)
+
+    def record_failure(self, host: str, port: int, password: str, error: str):
+        self._record(make_pool_key(host, port, password), False, False, None, error)
+
+    def _record(self, key: PoolKey, alive: bool, authenticated: bool,
+                latency_ms: Optional[int], error: Optional[str]):
+        self._health[key] = ServerHealth(
+            alive=alive,
+            authenticated=authenticated,
+            checked_at=self._clock(),
+            latency_ms=latency_ms,
+            error=error
+        )
+
+    def clear(self):
+        self._health.clear()
+
+    async def probe_once(self):
+        """
+        Пингует свободные соединения пула.
+
+        Занятые соединения пропускаются: пинг ждал бы в очереди за командой,
+        а результат самой команды и так попадает в состояние. Соединение,
+        не ответившее на пинг, закрывается и убирается из пула.
+        """
+        connections = [(key, connection) for key, connection in self.pool.connections()
+                       if not connection.in_flight]
+
+        async def probe(key: PoolKey, connection):
+            try:
+                latency = await asyncio.wait_for(connection.ping(), timeout=settings.RCON_TIMEOUT)
+                self._record(key, True, True, int(latency * 1000), None)
+            except Exception as e:
+                logger.debug(f"RCON пинг {key[0]}:{key[1]} неудачен: {e}")
+                self.pool.forget(connection)
+                self._record(key, False, False, None, f"Сервер не отвечает: {type(e).__name__}")
+
+        await asyncio.gather(*(probe(key, connection) for key, connection in connections))
+
+        # Убираем устаревшие записи о серверах без соединений
+        now = self._clock()
+        for key in [key for key, health in self._health.items() if now - health.checked_at > self.max_age]:
+            del self._health[key]
+
+    async def run(self):
+        """Фоновая задача проверки серверов"""
+        logger.info("💓 Запуск проверки RCON серверов...")
+
+        try:
+            while True:
+                await asyncio.sleep(self.interval)
+                try:
+                    await self.probe_once()
+                except Exception as e:
+                    logger.warning(f"⚠️  Ошибка проверки RCON серверов: {e}")
+        except asyncio.CancelledError:
+            logger.info("⏹ Проверка RCON серверов остановлена")
+
+
+# Глобальное состояние серверов
+rcon_health = RconHealthProber(
+    rcon_pool,
+    interval=settings.RCON_HEALTH_INTERVAL,
+    max_age=settings.RCON_HEALTH_MAX_AGE
+)
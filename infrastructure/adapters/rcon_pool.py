@@ -0,0 +1,188 @@
+# infrastructure/adapters/rcon_pool.py
+import asyncio
+import hashlib
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+from loggers.app_logger import logger
+from config.settings import settings
+from infrastructure.adapters.rcon_protocol import RconConnection, RconConnectionClosed
+
+# Ключ пула: (host, port, sha256 пароля) - сам пароль в ключе не храним
+PoolKey = Tuple[str, int, str]
+
+
+def make_pool_key(host: str, port: int, password: str) -> PoolKey:
+    """Ключ пула для сервера и пароля"""
+    password_hash = hashlib.sha256(password.encode('utf-8')).hexdigest()
+    return host, port, password_hash
+
+
+class RconConnectionPool:
+    """
+    Пул авторизованных RCON соединений.
+
+    На каждый (host, port, хэш пароля) держится одно соединение, через
+    которое по очереди идут все команды (см. RconConnection). Соединение
+    проверяется при выдаче, закрывается после RCON_POOL_IDLE_TIMEOUT простоя
+    и переоткрывается, если сервер его разорвал.
+    """
+
+    def __init__(self, idle_timeout: float = 300):
+        self.idle_timeout = idle_timeout
+        self._connections: Dict[PoolKey, RconConnection] = {}
+        self._locks: Dict[PoolKey, asyncio.Lock] = {}
+
+        # Счетчики для диагностики
+        self.opened = 0
+        self.reused = 0
+        self.discarded = 0
+
+    async def acquire(self, host: str, port: int, password: str, timeout: float) -> RconConnection:
+        """Возвращает живое соединение к серверу, открывая его при необходимости"""
+        connection, _ = await self._acquire(host, port, password, timeout)
+        return connection
+
+    async def _acquire(self, host: str, port: int, password: str,
+                       timeout: float) -> Tuple[RconConnection, bool]:
+        """Соединение и признак того, что его открыл именно этот вызов"""
+        key = make_pool_key(host, port, password)
+
+        connection = self._get_usable(key)
+        if connection is not None:
+            self.reused += 1
+            return connection, False
+
+        # Одновременные запросы к новому серверу ждут одно подключение
+        async with self._locks.setdefault(key, asyncio.Lock()):
+            connection = self._get_usable(key)
+            if connection is not None:
+                self.reused += 1
+                return connection, False
+
+            connection = await RconConnection.open(host, port, password, timeout)
+            self.opened += 1
+            self._connections[key] = connection
+            return connection, True
+
+    async def execute(self, host: str, port: int, password: str,
+                      command: str, timeout: float) -> str:
+        """
+        Выполняет команду через соединение из пула.
+
+        Если соединение из пула оказалось мертвым (сервер перезапущен),
+        команда один раз повторяется на новом соединении. Соединение,
+        только что открытое этим вызовом, не повторяется: сервер разорвал
+        его сразу, и второе подключение вряд ли поможет. После таймаута
+        соединение закрывается: зависшее соединение не выдается другим командам.
+        """
+        connection, fresh = await self._acquire(host, port, password, timeout)
+
+        try:
+            return await self._execute_on(connection, command, timeout)
+        except RconConnectionClosed as e:
+            if fresh:
+                raise
+            logger.debug(f"RCON соединение {host}:{port} устарело ({e}), переподключаемся")
+
+        connection = await self.acquire(host, port, password, timeout)
+        return await self._execute_on(connection, command, timeout)
+
+    async def _execute_on(self, connection: RconConnection, command: str, timeout: float) -> str:
+        """Команда на соединении; после таймаута или ошибки соединение убирается из пула"""
+        try:
+            return await asyncio.wait_for(connection.execute(command), timeout=timeout)
+        except Exception:
+            self.forget(connection)
+            raise
+
+    async def stream(self, host: str, port: int, password: str,
+                     command: str, timeout: float) -> AsyncIterator[str]:
+        """
+        Потоковый вариант execute: части ответа отдаются по мере прихода.
+
+        timeout ограничивает ожидание каждой следующей части, а не всего
+        ответа. Повтор на новом соединении возможен, только пока ни одна
+        часть ответа еще не отдана.
+        """
+        connection, fresh = await self._acquire(host, port, password, timeout)
+        delivered = False
+
+        try:
+            async for fragment in self._stream_from(connection, command, timeout):
+                delivered = True
+                yield fragment
+            return
+        except RconConnectionClosed as e:
+            if delivered or fresh:
+                raise
+            logger.debug(f"RCON соединение {host}:{port} устарело ({e}), переподключаемся")
+
+        connection = await self.acquire(host, port, password, timeout)
+        async for fragment in self._stream_from(connection, command, timeout):
+            yield fragment
+
+    async def _stream_from(self, connection: RconConnection, command: str, timeout: float) -> AsyncIterator[str]:
+        """Поток с соединения; после таймаута или ошибки соединение убирается из пула"""
+        fragments = connection.execute_stream(command)
+        try:
+            while True:
+                async with asyncio.timeout(timeout):
+                    fragment = await anext(fragments, None)
+                if fragment is None:
+                    return
+                yield fragment
+        except Exception:
+            self.forget(connection)
+            raise
+        finally:
+            await fragments.aclose()
+
+    def _get_usable(self, key: PoolKey) -> Optional[RconConnection]:
+        connection = self._connections.get(key)
+        if connection is None:
+            return None
+        if connection.is_usable(self.idle_timeout):
+            return connection
+        self.forget(connection)
+        return None
+
+    def forget(self, connection: RconConnection):
+        """Убирает соединение из пула и закрывает его"""
+        for key, pooled in list(self._connections.items()):
+            if pooled is connection:
+                del self._connections[key]
+        self.discarded += 1
+        connection.close()
+
+    def connections(self) -> List[Tuple[PoolKey, RconConnection]]:
+        """Живые соединения пула; простаивающие дольше idle_timeout закрываются"""
+        return [
+            (key, connection) for key in list(self._connections)
+            if (connection := self._get_usable(key)) is not None
+        ]
+
+    def close_server(self, host: str, port: int):
+        """Закрывает все соединения к серверу"""
+        for key in [key for key in self._connections if key[0] == host and key[1] == port]:
+            self._connections.pop(key).close()
+
+    def close_all(self):
+        """Закрывает все соединения (при остановке бота)"""
+        for connection in self._connections.values():
+            connection.close()
+        self._connections.clear()
+        self._locks.clear()
+
+    def get_stats(self) -> dict:
+        """Статистика пула"""
+        return {
+            "connections": len(self._connections),
+            "in_flight": sum(connection.in_flight for connection in self._connections.values()),
+            "opened": self.opened,
+            "reused": self.reused,
+            "discarded": self.discarded,
+        }
+
+
+# Глобальный пул соединений
+rcon_pool = RconConnectionPool(idle_timeout=settings.RCON_POOL_IDLE_TIMEOUT)
@@ -0,0 +1,354 @@
+# infrastructure/adapters/rcon_protocol.py
+"""
+Собственная asyncio реализация Source RCON (используется Minecraft).
+
+Формат пакета (как в tests/raw_rcon_test.py):
+    <int32 длина><int32 request_id><int32 тип><тело>\\x00\\x00
+Длина не включает собственные 4 байта. Все числа little-endian.
+
+Minecraft читает пакет одним вызовом read и разрывает соединение, если
+прочитано не ровно один пакет. Поэтому по соединению одновременно идет
+только одна команда, а остальные ждут своей очереди. Ответ на команду
+может прийти несколькими пакетами: после первого пакета ответа
+отправляется пустой пакет-маркер с другим id. Сервер отвечает на пакеты
+строго по очереди, значит ответ на маркер означает, что все части ответа
+на команду получены. Если команда прервана (таймаут, отмена), ответы на
+нее могут прийти позже, и такое соединение закрывается.
+
+Для больших ответов есть потоковый вариант (execute_stream): части
+отдаются по мере прихода пакетов, без сборки всего ответа.
+"""
+import asyncio
+import codecs
+import contextlib
+import itertools
+import struct
+import time
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+from loggers.app_logger import logger
+
+SERVERDATA_AUTH = 3
+SERVERDATA_AUTH_RESPONSE = 2
+SERVERDATA_EXECCOMMAND = 2
+SERVERDATA_RESPONSE_VALUE = 0
+
+# Минимальная длина: id + тип + два нулевых байта
+MIN_PACKET_SIZE = 10
+# Защита от мусора в потоке: Minecraft не шлет пакеты больше ~4 КБ
+MAX_PACKET_SIZE = 1024 * 1024
+
+MAX_REQUEST_ID = 2_147_483_647
+
+
+class RconError(Exception):
+    """Базовая ошибка RCON протокола"""
+
+
+class RconAuthError(RconError):
+    """Сервер отклонил пароль"""
+
+    def __init__(self, message: str = "Wrong password"):
+        super().__init__(message)
+
+
+class RconConnectionClosed(RconError, ConnectionError):
+    """Соединение закрыто сервером или из-за ошибки протокола"""
+
+
+def encode_packet(request_id: int, packet_type: int, body: bytes) -> bytes:
+    """Собирает пакет с длиной в начале"""
+    payload = struct.pack('<ii', request_id, packet_type) + body + b'\x00\x00'
+    return struct.pack('<i', len(payload)) + payload
+
+
+async def read_packet(reader: asyncio.StreamReader) -> Tuple[int, int, bytes]:
+    """Читает один пакет: (request_id, тип, тело)"""
+    size = struct.unpack('<i', await reader.readexactly(4))[0]
+    if not MIN_PACKET_SIZE <= size <= MAX_PACKET_SIZE:
+        raise RconConnectionClosed(f"Некорректная длина RCON пакета: {size}")
+
+    data = await reader.readexactly(size)
+    request_id, packet_type = struct.unpack('<ii', data[:8])
+    return request_id, packet_type, data[8:-2]
+
+
+class _PendingRequest:
+    """
+    Команда, ожидающая ответа.
+
+    started завершается с первым пакетом ответа: после него отправляется маркер.
+    Обычная команда копит части в fragments и получает ответ через future.
+    Потоковая кладет части в queue, конец ответа - None, ошибка - исключение.
+    """
+
+    __slots__ = ("started", "fragments", "future", "queue")
+
+    def __init__(self, started: asyncio.Future,
+                 future: Optional[asyncio.Future] = None, queue: Optional[asyncio.Queue] = None):
+        self.started = started
+        self.fragments: List[bytes] = []
+        self.future = future
+        self.queue = queue
+
+
+class RconConnection:
+    """
+    Авторизованное RCON соединение; команды по нему выполняются по очереди.
+    """
+
+    def __init__(self, host: str, port: int,
+                 reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                 encoding: str = 'utf-8'):
+        self.host = host
+        self.port = port
+        self.encoding = encoding
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+
+        self._reader = reader
+        self._writer = writer
+        self._ids = itertools.count(1)
+        self._pending: Dict[int, _PendingRequest] = {}
+        # id маркера -> id команды, чей ответ он завершает
+        self._sentinels: Dict[int, int] = {}
+        # id пакета проверки связи -> ожидающий ответа future
+        self._pings: Dict[int, asyncio.Future] = {}
+        # Один запрос на соединении; _users - запросы в работе и в очереди
+        self._lock = asyncio.Lock()
+        self._users = 0
+        self._reader_task: Optional[asyncio.Task] = None
+        self._closed = False
+
+    @classmethod
+    async def open(cls, host: str, port: int, password: str, timeout: float) -> 'RconConnection':
+        """Открывает TCP соединение и проходит авторизацию"""
+        reader, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout=timeout)
+        connection = cls(host, port, reader, writer)
+
+        try:
+            await asyncio.wait_for(connection._login(password), timeout=timeout)
+        except asyncio.IncompleteReadError as e:
+            connection.close()
+            raise RconConnectionClosed("Сервер закрыл соединение при авторизации") from e
+        except BaseException:
+            connection.close()
+            raise
+
+        connection._reader_task = asyncio.create_task(connection._read_loop())
+        logger.debug(f"RCON соединение открыто: {host}:{port}")
+        return connection
+
+    async def _login(self, password: str):
+        request_id = self._next_id()
+        self._writer.write(encode_packet(request_id, SERVERDATA_AUTH, password.encode(self.encoding)))
+        await self._writer.drain()
+
+        # Некоторые серверы присылают пустой RESPONSE_VALUE перед AUTH_RESPONSE
+        while True:
+            response_id, packet_type, _ = await read_packet(self._reader)
+            if packet_type == SERVERDATA_AUTH_RESPONSE:
+                break
+
+        if response_id == -1 or response_id != request_id:
+            raise RconAuthError()
+
+    async def execute(self, command: str) -> str:
+        """Выполняет команду; конкурентные вызовы ждут своей очереди"""
+        async with self._turn():
+            loop = asyncio.get_running_loop()
+            pending = _PendingRequest(loop.create_future(), future=loop.create_future())
+            async with self._request(command, pending):
+                return await pending.future
+
+    async def execute_stream(self, command: str) -> AsyncIterator[str]:
+        """
+        Выполняет команду и отдает части ответа по мере прихода пакетов.
+
+        Многобайтовый символ на границе пакетов не разрывается: байты
+        декодируются инкрементально. Соединение занято, пока ответ не
+        дочитан; если потребитель остановился раньше, соединение закрывается.
+        """
+        async with self._turn():
+            queue: asyncio.Queue = asyncio.Queue()
+            pending = _PendingRequest(asyncio.get_running_loop().create_future(), queue=queue)
+            decoder = codecs.getincrementaldecoder(self.encoding)(errors='replace')
+
+            async with self._request(command, pending):
+                while True:
+                    item = await queue.get()
+                    if item is None:
+                        break
+                    if isinstance(item, Exception):
+                        raise item
+                    text = decoder.decode(item)
+                    if text:
+                        yield text
+
+            tail = decoder.decode(b"", final=True)
+            if tail:
+                yield tail
+
+    @contextlib.asynccontextmanager
+    async def _turn(self):
+        """Ожидание очереди: следующий запрос отправляется после ответа на предыдущий"""
+        if self._closed:
+            raise RconConnectionClosed("RCON соединение закрыто")
+
+        self._users += 1
+        try:
+            async with self._lock:
+                if self._closed:
+                    raise RconConnectionClosed("RCON соединение закрыто")
+                yield
+        finally:
+            self._users -= 1
+
+    @contextlib.asynccontextmanager
+    async def _request(self, command: str, pending: _PendingRequest):
+        """
+        Отправляет команду, а после первого пакета ответа - маркер конца.
+
+        Маркер отправляется отдельным пакетом: сервер должен прочитать
+        команду раньше, чем в сокет попадет следующий пакет. Если ответ на
+        маркер не получен (таймаут, отмена, ранний выход), соединение
+        закрывается: запоздавшие ответы сбили бы очередь.
+        """
+        request_id = self._next_id()
+        sentinel_id = self._next_id()
+        self._pending[request_id] = pending
+        self._sentinels[sentinel_id] = request_id
+
+        try:
+            await self._write(encode_packet(request_id, SERVERDATA_EXECCOMMAND, command.encode(self.encoding)))
+            await pending.started
+            await self._write(encode_packet(sentinel_id, SERVERDATA_RESPONSE_VALUE, b""))
+            yield
+        finally:
+            self._pending.pop(request_id, None)
+            if self._sentinels.pop(sentinel_id, None) is not None:
+                self.close()
+
+    async def _write(self, packet: bytes):
+        """Отправляет пакет; ошибка записи закрывает соединение"""
+        try:
+            self._writer.write(packet)
+            await self._writer.drain()
+        except ConnectionError as e:
+            if isinstance(e, RconConnectionClosed):
+                raise
+            self.close()
+            raise RconConnectionClosed(str(e)) from e
+
+    async def ping(self) -> float:
+        """
+        Дешевая проверка связи: пустой пакет RESPONSE_VALUE без команды.
+
+        Сервер отвечает на него сразу и ничего не выполняет. Время простоя
+        соединения (last_used) пинг не обновляет. Возвращает задержку в секундах.
+        """
+        async with self._turn():
+            ping_id = self._next_id()
+            future = asyncio.get_running_loop().create_future()
+            self._pings[ping_id] = future
+            started = time.monotonic()
+
+            try:
+                await self._write(encode_packet(ping_id, SERVERDATA_RESPONSE_VALUE, b""))
+                await future
+                return time.monotonic() - started
+            finally:
+                # Ответ на пинг не получен: он может прийти позже
+                if self._pings.pop(ping_id, None) is not None:
+                    self.close()
+
+    async def _read_loop(self):
+        """Разбирает входящие пакеты и раздает их ожидающим командам"""
+        try:
+            while True:
+                request_id, _, body = await read_packet(self._reader)
+
+                pending = self._pending.get(request_id)
+                if pending is not None:
+                    if not pending.started.done():
+                        pending.started.set_result(None)
+                    if pending.queue is not None:
+                        pending.queue.put_nowait(body)
+                    else:
+                        pending.fragments.append(body)
+                    continue
+
+                command_id = self._sentinels.pop(request_id, None)
+                if command_id is not None:
+                    pending = self._pending.get(command_id)
+                    if pending is not None and pending.queue is not None:
+                        pending.queue.put_nowait(None)
+                    elif pending is not None and not pending.future.done():
+                        pending.future.set_result(b"".join(pending.fragments).decode(self.encoding, errors='replace'))
+                    self.last_used = time.monotonic()
+                    continue
+
+                ping = self._pings.pop(request_id, None)
+                if ping is not None:
+                    if not ping.done():
+                        ping.set_result(None)
+                    continue
+
+                logger.debug(f"RCON {self.host}:{self.port}: пакет с неизвестным id {request_id}")
+        except asyncio.CancelledError:
+            raise
+        except (asyncio.IncompleteReadError, ConnectionError) as e:
+            self._fail_pending(RconConnectionClosed(f"Сервер закрыл RCON соединение: {e}"))
+        except Exception as e:
+            logger.warning(f"RCON {self.host}:{self.port}: ошибка чтения: {e}")
+            self._fail_pending(RconConnectionClosed(f"Ошибка RCON протокола: {e}"))
+        finally:
+            self._closed = True
+            self._writer.close()
+
+    def _fail_pending(self, error: Exception):
+        futures = list(self._pings.values())
+        for pending in self._pending.values():
+            # Пока ответа нет, команда ждет started, а не future или queue
+            if not pending.started.done():
+                futures.append(pending.started)
+            elif pending.queue is not None:
+                pending.queue.put_nowait(error)
+            else:
+                futures.append(pending.future)
+
+        for future in futures:
+            if not future.done():
+                future.set_exception(error)
+
+    def _next_id(self) -> int:
+        request_id = next(self._ids)
+        if request_id >= MAX_REQUEST_ID:
+            self._ids = itertools.count(1)
+            request_id = next(self._ids)
+        return request_id
+
+    @property
+    def in_flight(self) -> int:
+        """Количество запросов в работе и в очереди"""
+        return self._users
+
+    @property
+    def is_closed(self) -> bool:
+        return self._closed or self._writer.is_closing()
+
+    def is_usable(self, idle_timeout: float) -> bool:
+        """Проверка соединения при выдаче из пула"""
+        if self.is_closed:
+            return False
+        if self.in_flight:
+            return True
+        return time.monotonic() - self.last_used < idle_timeout
+
+    def close(self):
+        self._closed = True
+        if self._reader_task and not self._reader_task.done():
+            self._reader_task.cancel()
+        self._fail_pending(RconConnectionClosed("RCON соединение закрыто"))
+        if not self._writer.is_closing():
+            self._writer.close()
@@ -0,0 +1,166 @@
+# infrastructure/adapters/rcon_scheduler.py
+import asyncio
+import heapq
+import itertools
+import time
+from enum import IntEnum
+from typing import Callable, Dict, List, Optional, Tuple
+
+from loggers.app_logger import logger
+from config.settings import settings
+from domain.services.command_validator import CommandValidator, CommandType
+from infrastructure.adapters.rcon_cache import CACHEABLE_COMMANDS
+from infrastructure.adapters.server_registry import ServerRegistry
+
+command_validator = CommandValidator()
+
+
+class CommandPriority(IntEnum):
+    """Приоритет команды в очереди сервера (меньше - раньше)"""
+    URGENT = 0   # Опасные и управляющие команды: stop, kick, ban, save-all
+    NORMAL = 1   # Остальные команды администраторов
+    POLLING = 2  # Команды только для чтения: статус, мониторинг
+
+
+def command_priority(command: str) -> CommandPriority:
+    """Приоритет команды по CommandValidator"""
+    normalized = " ".join(command.lower().split())
+    if command_validator.is_dangerous_command(normalized):
+        return CommandPriority.URGENT
+
+    command_type = command_validator.get_command_type(normalized)
+    if command_type == CommandType.SERVER_MANAGEMENT:
+        return CommandPriority.URGENT
+    if command_type == CommandType.SERVER_INFO or normalized in CACHEABLE_COMMANDS:
+        return CommandPriority.POLLING
+    return CommandPriority.NORMAL
+
+
+class TokenBucket:
+    """
+    Ведро токенов: rate токенов в секунду, не больше burst в запасе.
+    """
+
+    def __init__(self, rate: float, burst: int, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._clock = clock
+        self.tokens = float(self.burst)
+        self._updated_at = clock()
+
+    def _refill(self):
+        now = self._clock()
+        self.tokens = min(self.burst, self.tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    def try_take(self) -> float:
+        """Берет токен; возвращает 0 или через сколько секунд появится токен"""
+        self._refill()
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+class RconScheduler:
+    """
+    Очередь команд одного RCON сервера.
+
+    Сервер выполняет RCON команды в основном игровом цикле, поэтому всплеск
+    команд от нескольких администраторов снижает TPS. Команды пропускаются
+    со скоростью ведра токенов; если токенов нет, ждут в очереди по
+    приоритету (CommandPriority), при равном приоритете - по порядку прихода.
+    """
+
+    def __init__(self, host: str, port: int, rate: float = 10, burst: int = 20,
+                 clock: Callable[[], float] = time.monotonic):
+        self.host = host
+        self.port = port
+        self.enabled = rate > 0
+        self._bucket = TokenBucket(rate, burst, clock) if self.enabled else None
+        self._clock = clock
+
+        # (приоритет, порядковый номер, время постановки, future)
+        self._queue: List[Tuple[int, int, float, asyncio.Future]] = []
+        self._seq = itertools.count()
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+        # Счетчики для диагностики
+        self.granted = 0
+        self.queued = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    async def acquire(self, priority: CommandPriority = CommandPriority.NORMAL):
+        """Ждет разрешения на отправку одной команды серверу"""
+        if not self.enabled:
+            return
+
+        if not self._queue and self._bucket.try_take() == 0:
+            self.granted += 1
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._queue, (int(priority), next(self._seq), self._clock(), future))
+        self.queued += 1
+        if self._timer is None:
+            self._timer = asyncio.get_running_loop().call_soon(self._pump)
+
+        # Отмененный ожидающий остается в куче и пропускается в _pump
+        await future
+
+    def _pump(self):
+        """Выдает токены ожидающим в порядке приоритета"""
+        self._timer = None
+
+        while self._queue:
+            _, _, enqueued_at, future = self._queue[0]
+            if future.done():
+                heapq.heappop(self._queue)
+                continue
+
+            delay = self._bucket.try_take()
+            if delay > 0:
+                self._timer = asyncio.get_running_loop().call_later(delay, self._pump)
+                return
+
+            heapq.heappop(self._queue)
+            self._record_wait(self._clock() - enqueued_at)
+            future.set_result(None)
+
+    def _record_wait(self, waited: float):
+        self.granted += 1
+        self.total_wait += waited
+        if waited > self.max_wait:
+            self.max_wait = waited
+        if waited >= 1:
+            logger.debug(f"RCON {self.host}:{self.port}: команда ждала в очереди {waited:.1f} с")
+
+    @property
+    def depth(self) -> int:
+        """Количество команд в очереди"""
+        return sum(1 for entry in self._queue if not entry[3].done())
+
+    def get_stats(self) -> dict:
+        """Статистика очереди сервера"""
+        waiting: Dict[str, int] = {priority.name.lower(): 0 for priority in CommandPriority}
+        for priority, _, _, future in self._queue:
+            if not future.done():
+                waiting[CommandPriority(priority).name.lower()] += 1
+
+        return {
+            "depth": self.depth,
+            "waiting": waiting,
+            "granted": self.granted,
+            "queued": self.queued,
+            "avg_wait_ms": int(self.total_wait / self.queued * 1000) if self.queued else 0,
+            "max_wait_ms": int(self.max_wait * 1000),
+        }
+
+
+# Глобальный реестр очередей
+rcon_schedulers = ServerRegistry(
+    RconScheduler,
+    rate=settings.RCON_RATE_PER_SECOND,
+    burst=settings.RCON_RATE_BURST
+)
@@ -0,0 +1,29 @@
+# infrastructure/adapters/server_registry.py
+from typing import Callable, Dict, Generic, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class ServerRegistry(Generic[T]):
+    """
+    Общие объекты по (host, port) для всех пользователей сервера.
+
+    Объект создается при первом обращении вызовом factory(host, port, **options)
+    и дальше выдается всем клиентам этого сервера (предохранители, очереди).
+    """
+
+    def __init__(self, factory: Callable[..., T], **options):
+        self.factory = factory
+        self.options = options
+        self._items: Dict[Tuple[str, int], T] = {}
+
+    def get(self, host: str, port: int) -> T:
+        key = (host, port)
+        item = self._items.get(key)
+        if item is None:
+            item = self.factory(host, port, **self.options)
+            self._items[key] = item
+        return item
+
+    def reset(self):
+        self._items.clear()
@@ -0,0 +1,67 @@
+# infrastructure/adapters/single_flight.py
+import asyncio
+from typing import Awaitable, Callable, Dict, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Объединяет одинаковые одновременные запросы в один.
+
+    Пока запрос с ключом key выполняется, остальные вызовы с тем же
+    ключом ждут его результат (или ошибку) вместо собственного запроса.
+    """
+
+    def __init__(self):
+        self._in_flight: Dict[Hashable, asyncio.Future] = {}
+
+        # Счетчики для диагностики
+        self.started = 0
+        self.shared = 0
+
+    async def run(self, key: Hashable, factory: Callable[[], Awaitable[T]]) -> T:
+        while True:
+            future = self._in_flight.get(key)
+            if future is None:
+                break
+
+            self.shared += 1
+            try:
+                # shield: отмена одного из ожидающих не трогает общий результат
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+                # Отменили ведущий запрос - выполняем сами
+
+        # Ведущий запрос выполняется в текущей задаче, без create_task:
+        # порядок отправки команд на сервер остается порядком вызовов
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        self.started += 1
+
+        try:
+            result = await factory()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Ошибку заберут ожидающие; без них asyncio ругался бы на непрочитанную ошибку
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            if self._in_flight.get(key) is future:
+                del self._in_flight[key]
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._in_flight)
+
+
+# Общий слой объединения запросов для RCON
+rcon_single_flight = SingleFlight()
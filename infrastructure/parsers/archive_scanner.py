@@ -0,0 +1,172 @@
+# infrastructure/parsers/archive_scanner.py
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List, Optional, Sequence, Tuple
+
+from infrastructure.parsers.log_archive_index import ArchiveMatch, LogArchiveIndex, scan_archive_file
+from infrastructure.parsers.pattern_search import (
+    POLL_INTERVAL, START_TIMEOUT, SearchResult, SearchWorkerPool, pattern_source
+)
+
+
+class ParallelArchiveScanner:
+    """
+    Поиск по архивам логов в процессах поиска (SearchWorkerPool).
+
+    Распаковка gzip и регулярные выражения нагружают CPU, поэтому каждый
+    архив ищется в отдельном процессе: архивы распределяются по процессам
+    пула, а результаты собираются в порядке архивов (от новых к старым).
+    Процессы живут между поисками; их запуск в time_budget не входит -
+    время отсчитывается с момента, когда первый архив принят в работу.
+
+    Как только набрано limit совпадений, еще не начатые архивы не ищутся.
+    По истечении time_budget или при отмене поиск останавливается, а
+    процессы с еще не законченными архивами завершаются (регулярное
+    выражение пользователя может зависнуть на одной строке).
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, workers: Optional[SearchWorkerPool] = None):
+        self._owns_workers = workers is None
+        self.workers = workers or SearchWorkerPool(max_workers or os.cpu_count() or 1)
+        # Потоки только ждут результаты процессов: по одному на процесс пула
+        self._threads = ThreadPoolExecutor(max_workers=self.workers.size, thread_name_prefix="archive-scan")
+
+    def _scan(self, path: str, source: str, ranges: list, limit: int, time_budget: float,
+              started: threading.Event, cancel_event: threading.Event) -> SearchResult:
+        return SearchResult.collect(self.workers.run(
+            scan_archive_file, (path, source, ranges, limit, time_budget),
+            time_budget, cancel_event, started
+        ))
+
+    def _submit(self, index: LogArchiveIndex, plan: List[Tuple[str, str, list]], source: str,
+                limit: int, time_budget: float,
+                started: threading.Event, cancel_event: threading.Event) -> List[Future]:
+        return [
+            self._threads.submit(self._scan, str(index.log_dir / name), source, ranges, limit, time_budget,
+                                 started, cancel_event)
+            for name, _, ranges in plan
+        ]
+
+    @staticmethod
+    def _started(started: threading.Event, futures: List[Future]) -> bool:
+        """Первый архив принят процессом (или какой-то архив уже завершился ошибкой)"""
+        return not futures or started.is_set() or any(future.done() for future in futures)
+
+    @staticmethod
+    def _finish(futures: List[Future], cancel_event: threading.Event, stopped: bool):
+        """
+        Еще не начатые архивы отменяются. Если поиск прерван, начатые
+        завершаются вместе с процессами; иначе они дорабатывают сами
+        (каждый ограничен limit и time_budget) и процессы остаются в пуле.
+        """
+        for future in futures:
+            future.cancel()
+        if stopped:
+            cancel_event.set()
+
+    def search(self, index: LogArchiveIndex, pattern: str, limit: int = 10,
+               player: Optional[str] = None,
+               date_from: Optional[str] = None,
+               date_to: Optional[str] = None,
+               hours: Optional[Sequence[int]] = None,
+               time_budget: float = 30.0,
+               regex: bool = False) -> SearchResult:
+        """Поиск с ожиданием в текущем потоке; truncated=True - поиск прерван по времени"""
+        plan = index.plan_search(player, date_from, date_to, hours)
+        started, cancel_event = threading.Event(), threading.Event()
+        futures = self._submit(index, plan, pattern_source(pattern, regex), limit, time_budget,
+                               started, cancel_event)
+        matches = SearchResult()
+        stopped = True
+
+        try:
+            start_deadline = time.monotonic() + START_TIMEOUT
+            while not self._started(started, futures):
+                if time.monotonic() >= start_deadline:
+                    matches.truncated = True
+                    return matches
+                started.wait(POLL_INTERVAL)
+            deadline = time.monotonic() + time_budget
+
+            for (name, date, _), future in zip(plan, futures):
+                try:
+                    lines = future.result(timeout=max(0.0, deadline - time.monotonic()))
+                except TimeoutError:
+                    matches.truncated = True
+                    return matches
+
+                matches.truncated = matches.truncated or lines.truncated
+                for line in lines:
+                    matches.append(ArchiveMatch(name, date, line))
+                    if len(matches) >= limit:
+                        stopped = False
+                        return matches
+
+            stopped = False
+        finally:
+            self._finish(futures, cancel_event, stopped)
+
+        return matches
+
+    async def search_async(self, index: LogArchiveIndex, pattern: str, limit: int = 10,
+                           player: Optional[str] = None,
+                           date_from: Optional[str] = None,
+                           date_to: Optional[str] = None,
+                           hours: Optional[Sequence[int]] = None,
+                           time_budget: float = 30.0,
+                           regex: bool = False) -> SearchResult:
+        """
+        Поиск без блокировки event loop: обновление индекса и выбор архивов
+        идут в отдельном потоке, поиск - в процессах. При отмене вызова
+        процессы с начатыми архивами завершаются.
+        """
+        def plan_search():
+            index.update()
+            return index.plan_search(player, date_from, date_to, hours)
+
+        plan = await asyncio.to_thread(plan_search)
+        started, cancel_event = threading.Event(), threading.Event()
+        futures = self._submit(index, plan, pattern_source(pattern, regex), limit, time_budget,
+                               started, cancel_event)
+        matches = SearchResult()
+        stopped = True
+
+        try:
+            start_deadline = time.monotonic() + START_TIMEOUT
+            while not self._started(started, futures):
+                if time.monotonic() >= start_deadline:
+                    matches.truncated = True
+                    return matches
+                await asyncio.sleep(POLL_INTERVAL)
+            deadline = time.monotonic() + time_budget
+
+            for (name, date, _), future in zip(plan, futures):
+                try:
+                    lines = await asyncio.wait_for(
+                        asyncio.wrap_future(future), timeout=max(0.0, deadline - time.monotonic())
+                    )
+                except asyncio.TimeoutError:
+                    matches.truncated = True
+                    return matches
+
+                matches.truncated = matches.truncated or lines.truncated
+                for line in lines:
+                    matches.append(ArchiveMatch(name, date, line))
+                    if len(matches) >= limit:
+                        stopped = False
+                        return matches
+
+            stopped = False
+        finally:
+            self._finish(futures, cancel_event, stopped)
+
+        return matches
+
+    def shutdown(self):
+        """Останавливает потоки и, если пул процессов создан сканером, процессы"""
+        self._threads.shutdown(wait=False, cancel_futures=True)
+        if self._owns_workers:
+            self.workers.shutdown()
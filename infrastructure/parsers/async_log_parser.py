@@ -0,0 +1,113 @@
+# infrastructure/parsers/async_log_parser.py
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from config.settings import settings
+from infrastructure.parsers.log_archive_index import ArchiveMatch
+from infrastructure.parsers.minecraft_log_parser import MinecraftLogParser
+from infrastructure.parsers.pattern_search import SearchResult
+
+
+class AsyncLogParser:
+    """
+    Асинхронный фасад MinecraftLogParser для обработчиков бота.
+
+    Чтение файлов и регулярные выражения выполняются в ограниченном пуле
+    потоков, event loop только ждет результат. У каждого вызова есть
+    таймаут; при таймауте или отмене поиск по latest.log прерывается
+    через cancel_event. Обновление состояния latest.log не прерывается
+    (иначе потерялись бы прочитанные строки) - оно дорабатывает в фоне.
+
+    Состояние latest.log и индекс архивов защищены блокировкой: вызовы,
+    которые их меняют, идут по одному; поиск по latest.log состояния не
+    меняет и выполняется параллельно.
+    """
+
+    def __init__(self, log_dir: str, max_workers: int = 2, timeout: float = 10.0, demo: bool = True):
+        self.log_dir = log_dir
+        self.timeout = timeout
+        self.demo = demo
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="log-parser")
+        self._parser: Optional[MinecraftLogParser] = None
+        self._parser_lock = threading.Lock()
+        self._state_lock = threading.Lock()
+
+    def _get_parser(self) -> MinecraftLogParser:
+        # Парсер создает папку и демо-логи - это тоже работа с диском, поэтому в потоке
+        with self._parser_lock:
+            if self._parser is None:
+                self._parser = MinecraftLogParser(self.log_dir, demo=self.demo)
+            return self._parser
+
+    async def _run(self, func: Callable[..., Any], *args,
+                   timeout: Optional[float] = None,
+                   cancel_event: Optional[threading.Event] = None) -> Any:
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self._executor, func, *args)
+
+        try:
+            return await asyncio.wait_for(future, timeout=self.timeout if timeout is None else timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError):
+            if cancel_event is not None:
+                cancel_event.set()
+            raise
+
+    def _locked(self, method: str, *args, **kwargs) -> Any:
+        parser = self._get_parser()
+        with self._state_lock:
+            return getattr(parser, method)(*args, **kwargs)
+
+    async def parse_online_players(self, timeout: Optional[float] = None) -> List[str]:
+        return await self._run(self._locked, "parse_online_players", timeout=timeout)
+
+    async def parse_player_sessions(self, timeout: Optional[float] = None) -> Dict[str, Optional[str]]:
+        return await self._run(self._locked, "parse_player_sessions", timeout=timeout)
+
+    async def parse_server_stats(self, timeout: Optional[float] = None) -> Dict[str, Any]:
+        return await self._run(self._locked, "parse_server_stats", timeout=timeout)
+
+    async def search_logs(self, pattern: str, limit: int = 10,
+                          timeout: Optional[float] = None,
+                          regex: bool = False) -> SearchResult:
+        """
+        Поиск по latest.log; при таймауте или отмене поиск останавливается
+        (регулярное выражение - вместе с процессом, в котором выполняется).
+        Если поиск не уложился в SEARCH_TIME_BUDGET, у результата truncated=True.
+        """
+        cancel_event = threading.Event()
+
+        def search() -> SearchResult:
+            return self._get_parser().search_logs(pattern, limit, cancel_event=cancel_event, regex=regex)
+
+        return await self._run(search, timeout=timeout, cancel_event=cancel_event)
+
+    async def search_archives(self, pattern: str, limit: int = 10,
+                              timeout: Optional[float] = None, **filters) -> List[ArchiveMatch]:
+        """
+        Поиск по архивам в пуле процессов (см. ParallelArchiveScanner).
+
+        При таймауте поиск отменяется: еще не начатые архивы не ищутся,
+        процессы с регулярным выражением завершаются.
+        """
+        parser = await self._run(self._get_parser)
+        return await asyncio.wait_for(
+            parser.search_archives_async(pattern, limit, **filters),
+            timeout=self.timeout if timeout is None else timeout
+        )
+
+    def close(self):
+        """Останавливает пул потоков и закрывает парсер"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        if self._parser is not None:
+            self._parser.close()
+
+
+# Общий парсер логов сервера для обработчиков бота
+log_parser = AsyncLogParser(
+    settings.MINECRAFT_LOG_DIR,
+    max_workers=settings.LOG_PARSER_WORKERS,
+    timeout=settings.LOG_PARSER_TIMEOUT,
+    demo=settings.LOG_DEMO_MODE
+)
@@ -0,0 +1,110 @@
+# infrastructure/parsers/lag_analyzer.py
+from bisect import bisect_left
+from collections import deque
+from typing import Deque, Dict, List, Optional
+
+# Верхние границы корзин гистограммы отставания, мс: геометрическая
+# сетка с шагом 25% от 50 мс до ~10 минут. Перцентиль по корзине
+# отличается от точного не больше чем на шаг сетки.
+LAG_BUCKETS = tuple(int(50 * 1.25 ** i) for i in range(43))
+
+
+class LagWindow:
+    """
+    Отставания сервера за одно окно времени.
+
+    Хранит только счетчики и гистограмму фиксированного размера: память
+    окна не зависит от числа строк "Can't keep up!" в нем.
+    """
+
+    __slots__ = ('start', 'count', 'total_ms', 'max_ms', 'skipped_ticks', 'max_players', 'buckets')
+
+    def __init__(self, start: int):
+        self.start = start          # Начало окна, секунды от полуночи
+        self.count = 0
+        self.total_ms = 0
+        self.max_ms = 0
+        self.skipped_ticks = 0
+        self.max_players = 0        # Больше всего игроков онлайн во время лагов
+        self.buckets = [0] * (len(LAG_BUCKETS) + 1)
+
+    def add(self, lag_ms: int, skipped_ticks: int = 0, players_online: int = 0):
+        self.count += 1
+        self.total_ms += lag_ms
+        self.max_ms = max(self.max_ms, lag_ms)
+        self.skipped_ticks += skipped_ticks
+        self.max_players = max(self.max_players, players_online)
+        self.buckets[bisect_left(LAG_BUCKETS, lag_ms)] += 1
+
+    def percentile(self, q: float) -> int:
+        """Оценка перцентиля q (0..1) отставания в мс"""
+        if not self.count:
+            return 0
+
+        rank = max(1, round(q * self.count))
+        seen = 0
+        for index, bucket in enumerate(self.buckets):
+            seen += bucket
+            if seen >= rank:
+                bound = LAG_BUCKETS[index] if index < len(LAG_BUCKETS) else self.max_ms
+                return min(bound, self.max_ms)
+        return self.max_ms
+
+    @property
+    def label(self) -> str:
+        return f"{self.start // 3600:02d}:{self.start // 60 % 60:02d}"
+
+    def summary(self) -> Dict[str, object]:
+        return {
+            'window': self.label,
+            'count': self.count,
+            'p50_ms': self.percentile(0.5),
+            'p95_ms': self.percentile(0.95),
+            'max_ms': self.max_ms,
+            'avg_ms': round(self.total_ms / self.count) if self.count else 0,
+            'skipped_ticks': self.skipped_ticks,
+            'max_players': self.max_players,
+        }
+
+
+class LagAnalyzer:
+    """
+    Ряд отставаний сервера по окнам (по умолчанию 5 минут).
+
+    События добавляются по одному в порядке лога. Хранятся только окна,
+    в которых были лаги, и не больше max_windows последних. Переход
+    через полночь открывает новое окно, как и любая смена окна.
+    """
+
+    def __init__(self, window_seconds: int = 300, max_windows: int = 12):
+        self.window_seconds = window_seconds
+        self.windows: Deque[LagWindow] = deque(maxlen=max_windows)
+        self.total_count = 0
+        self.max_ms = 0
+
+    def add(self, at: str, lag_ms: int, skipped_ticks: Optional[int] = None, players_online: int = 0):
+        """Строка "Can't keep up!" в момент at (HH:MM:SS)"""
+        hours, minutes, seconds = (int(part) for part in at.split(":"))
+        start = (hours * 3600 + minutes * 60 + seconds) // self.window_seconds * self.window_seconds
+
+        if not self.windows or self.windows[-1].start != start:
+            self.windows.append(LagWindow(start))
+
+        self.windows[-1].add(lag_ms, skipped_ticks or 0, players_online)
+        self.total_count += 1
+        self.max_ms = max(self.max_ms, lag_ms)
+
+    def window_summaries(self, limit: Optional[int] = None) -> List[Dict[str, object]]:
+        """Сводки последних окон, от старых к новым"""
+        windows = list(self.windows)
+        if limit is not None:
+            windows = windows[-limit:] if limit else []
+        return [window.summary() for window in windows]
+
+    def summary(self, limit: int = 3) -> Dict[str, object]:
+        return {
+            'count': self.total_count,
+            'max_ms': self.max_ms,
+            'window_minutes': self.window_seconds // 60,
+            'windows': self.window_summaries(limit),
+        }
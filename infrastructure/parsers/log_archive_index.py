@@ -0,0 +1,340 @@
+# infrastructure/parsers/log_archive_index.py
+"""
+Индекс архивов логов Minecraft (logs/YYYY-MM-DD-N.log.gz).
+
+Для каждого архива один раз сохраняется компактная сводка в SQLite рядом
+с логами: диапазон времени, игроки, счетчики по уровням и смещения начала
+каждого часа в распакованном потоке. Вопросы вида "когда Steve заходил
+последний раз" отвечаются по индексу без распаковки, а поиск по шаблону
+открывает только архивы, подходящие по дате и игроку, и проверяет
+шаблоном только строки нужных часов. (gzip не умеет переходить к
+смещению без распаковки предыдущих данных, но эти данные не разбираются.)
+"""
+import gzip
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from infrastructure.parsers.log_classifier import LINE_PATTERN, LogEventType, classify_message
+from infrastructure.parsers.pattern_search import compile_pattern
+
+ARCHIVE_NAME_PATTERN = re.compile(r'^(\d{4}-\d{2}-\d{2})-(\d+)\.log\.gz$')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    name TEXT PRIMARY KEY,
+    date TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    mtime REAL NOT NULL,
+    first_time TEXT,
+    last_time TEXT,
+    lines INTEGER NOT NULL,
+    info_count INTEGER NOT NULL,
+    warn_count INTEGER NOT NULL,
+    error_count INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS players (
+    file TEXT NOT NULL,
+    player TEXT NOT NULL,
+    joins INTEGER NOT NULL,
+    last_join TEXT,
+    PRIMARY KEY (file, player)
+);
+CREATE INDEX IF NOT EXISTS players_by_name ON players (player);
+CREATE TABLE IF NOT EXISTS hours (
+    file TEXT NOT NULL,
+    ordinal INTEGER NOT NULL,
+    hour INTEGER NOT NULL,
+    offset INTEGER NOT NULL,
+    PRIMARY KEY (file, ordinal)
+);
+"""
+
+
+class ArchiveMatch(NamedTuple):
+    """Совпадение в архиве"""
+    file: str
+    date: str
+    line: str
+
+
+class LogArchiveIndex:
+    """
+    Индекс архивов логов в SQLite файле рядом с ними.
+
+    update() индексирует новые и измененные архивы (по размеру и mtime),
+    удаляет записи об исчезнувших. Остальные методы работают только с
+    индексом и распаковывают лишь подходящие архивы.
+    """
+
+    INDEX_FILE = "archive_index.sqlite3"
+    MAX_MATCH_CHARS = 500
+
+    def __init__(self, log_dir: Path, index_path: Optional[Path] = None):
+        self.log_dir = Path(log_dir)
+        self.index_path = Path(index_path) if index_path else self.log_dir / self.INDEX_FILE
+        self._db = sqlite3.connect(self.index_path, check_same_thread=False)
+        self._db.executescript(SCHEMA)
+        # Индекс используется из потоков (AsyncLogParser, search_archives_async)
+        self._lock = threading.Lock()
+
+    def close(self):
+        self._db.close()
+
+    def archives(self) -> List[Path]:
+        """Архивы в папке логов, от старых к новым"""
+        found = []
+        for path in self.log_dir.glob("*.log.gz"):
+            match = ARCHIVE_NAME_PATTERN.match(path.name)
+            if match:
+                found.append((match.group(1), int(match.group(2)), path))
+        return [path for _, _, path in sorted(found)]
+
+    def update(self) -> int:
+        """Индексирует новые и измененные архивы; возвращает их количество"""
+        with self._lock:
+            return self._update()
+
+    def _update(self) -> int:
+        known = {
+            name: (size, mtime)
+            for name, size, mtime in self._db.execute("SELECT name, size, mtime FROM files")
+        }
+        archives = self.archives()
+        indexed = 0
+
+        for path in archives:
+            stat = path.stat()
+            if known.get(path.name) == (stat.st_size, stat.st_mtime):
+                continue
+            self._index_file(path, stat.st_size, stat.st_mtime)
+            indexed += 1
+
+        present = {path.name for path in archives}
+        for name in set(known) - present:
+            self._delete(name)
+        self._db.commit()
+
+        return indexed
+
+    def _index_file(self, path: Path, size: int, mtime: float):
+        date, seq = ARCHIVE_NAME_PATTERN.match(path.name).groups()
+        levels = {'INFO': 0, 'WARN': 0, 'ERROR': 0}
+        players: Dict[str, List] = {}  # игрок -> [входы, время последнего входа]
+        hours: List[Tuple[int, int]] = []
+        first_time = last_time = None
+        lines = 0
+        offset = 0
+
+        with gzip.open(path, 'rb') as f:
+            for raw in f:
+                line_offset = offset
+                offset += len(raw)
+                lines += 1
+
+                line_match = LINE_PATTERN.match(raw.decode('utf-8', errors='ignore'))
+                if line_match is None:
+                    # Стектрейсы и прочие строки без префикса
+                    continue
+
+                line_time, thread, level, message = line_match.groups()
+                first_time = first_time or line_time
+                last_time = line_time
+
+                level = 'ERROR' if level == 'FATAL' else level
+                if level in levels:
+                    levels[level] += 1
+
+                hour = int(line_time[:2])
+                if not hours or hours[-1][0] != hour:
+                    hours.append((hour, line_offset))
+
+                event = classify_message(line_time, level, message.rstrip("\r\n"), thread)
+                if event is not None and event.player:
+                    entry = players.setdefault(event.player, [0, None])
+                    if event.type == LogEventType.JOIN:
+                        entry[0] += 1
+                        entry[1] = event.time
+
+        self._delete(path.name)
+        self._db.execute(
+            "INSERT INTO files VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (path.name, date, int(seq), size, mtime, first_time, last_time, lines,
+             levels['INFO'], levels['WARN'], levels['ERROR'])
+        )
+        self._db.executemany(
+            "INSERT INTO players VALUES (?, ?, ?, ?)",
+            [(path.name, player, joins, last_join) for player, (joins, last_join) in players.items()]
+        )
+        self._db.executemany(
+            "INSERT INTO hours VALUES (?, ?, ?, ?)",
+            [(path.name, ordinal, hour, hour_offset) for ordinal, (hour, hour_offset) in enumerate(hours)]
+        )
+
+    def _delete(self, name: str):
+        for table, column in (("files", "name"), ("players", "file"), ("hours", "file")):
+            self._db.execute(f"DELETE FROM {table} WHERE {column} = ?", (name,))
+
+    def _query(self, sql: str, params: Sequence = ()) -> List[tuple]:
+        with self._lock:
+            return self._db.execute(sql, params).fetchall()
+
+    def file_summary(self, name: str) -> Optional[dict]:
+        """Сводка по одному архиву"""
+        rows = self._query(
+            "SELECT date, first_time, last_time, lines, info_count, warn_count, error_count "
+            "FROM files WHERE name = ?", (name,)
+        )
+        if not rows:
+            return None
+        row = rows[0]
+
+        players = [player for player, in self._query(
+            "SELECT player FROM players WHERE file = ? ORDER BY player", (name,)
+        )]
+        return {
+            "date": row[0],
+            "first_time": row[1],
+            "last_time": row[2],
+            "lines": row[3],
+            "levels": {"INFO": row[4], "WARN": row[5], "ERROR": row[6]},
+            "players": players,
+        }
+
+    def last_join(self, player: str) -> Optional[Tuple[str, str]]:
+        """Дата и время последнего входа игрока по архивам (без распаковки)"""
+        rows = self._query(
+            "SELECT f.date, p.last_join FROM players p JOIN files f ON f.name = p.file "
+            "WHERE p.player = ? COLLATE NOCASE AND p.last_join IS NOT NULL "
+            "ORDER BY f.date DESC, f.seq DESC, p.last_join DESC LIMIT 1",
+            (player,)
+        )
+        return rows[0] if rows else None
+
+    def candidate_files(self, player: Optional[str] = None,
+                        date_from: Optional[str] = None,
+                        date_to: Optional[str] = None) -> List[str]:
+        """Архивы, подходящие по игроку и датам (YYYY-MM-DD), от новых к старым"""
+        query = "SELECT name FROM files f WHERE 1 = 1"
+        params: list = []
+
+        if player:
+            query += " AND EXISTS (SELECT 1 FROM players p WHERE p.file = f.name AND p.player = ? COLLATE NOCASE)"
+            params.append(player)
+        if date_from:
+            query += " AND f.date >= ?"
+            params.append(date_from)
+        if date_to:
+            query += " AND f.date <= ?"
+            params.append(date_to)
+
+        query += " ORDER BY f.date DESC, f.seq DESC"
+        return [name for name, in self._query(query, params)]
+
+    def hour_ranges(self, name: str, hours: Sequence[int]) -> List[Tuple[int, Optional[int]]]:
+        """Диапазоны (начало, конец) распакованных байт для нужных часов архива"""
+        markers = self._query(
+            "SELECT hour, offset FROM hours WHERE file = ? ORDER BY ordinal", (name,)
+        )
+        wanted = set(hours)
+        return [
+            (offset, markers[i + 1][1] if i + 1 < len(markers) else None)
+            for i, (hour, offset) in enumerate(markers) if hour in wanted
+        ]
+
+    def plan_search(self, player: Optional[str] = None,
+                    date_from: Optional[str] = None,
+                    date_to: Optional[str] = None,
+                    hours: Optional[Sequence[int]] = None) -> List[Tuple[str, str, list]]:
+        """Архивы для поиска (имя, дата, диапазоны байт), от новых к старым"""
+        plan = []
+        for name in self.candidate_files(player, date_from, date_to):
+            ranges = self.hour_ranges(name, hours) if hours is not None else [(0, None)]
+            if ranges:
+                plan.append((name, ARCHIVE_NAME_PATTERN.match(name).group(1), ranges))
+        return plan
+
+    def search(self, pattern: str, limit: int = 10,
+               player: Optional[str] = None,
+               date_from: Optional[str] = None,
+               date_to: Optional[str] = None,
+               hours: Optional[Sequence[int]] = None,
+               time_budget: float = 10.0,
+               regex: bool = False) -> List[ArchiveMatch]:
+        """
+        Поиск строк по шаблону в архивах, от новых к старым.
+
+        Распаковываются только архивы из candidate_files; если заданы часы,
+        из архива читаются только их диапазоны. По умолчанию pattern ищется
+        как текст. Поиск идет в текущем потоке и прерывается только между
+        строками, поэтому регулярные выражения пользователей ищутся через
+        ParallelArchiveScanner.
+        """
+        return list(self.iter_search(pattern, limit, player, date_from, date_to, hours, time_budget, regex))
+
+    def iter_search(self, pattern: str, limit: int = 10,
+                    player: Optional[str] = None,
+                    date_from: Optional[str] = None,
+                    date_to: Optional[str] = None,
+                    hours: Optional[Sequence[int]] = None,
+                    time_budget: float = 10.0,
+                    regex: bool = False) -> Iterator[ArchiveMatch]:
+        compiled = compile_pattern(pattern, regex)
+        deadline = time.monotonic() + time_budget
+        found = 0
+
+        for name, date, ranges in self.plan_search(player, date_from, date_to, hours):
+            for line in scan_archive(self.log_dir / name, compiled, ranges, deadline):
+                yield ArchiveMatch(name, date, line[:self.MAX_MATCH_CHARS])
+                found += 1
+                if found >= limit:
+                    return
+
+            if time.monotonic() >= deadline:
+                return
+
+
+def scan_archive(path: Path, regex: re.Pattern, ranges: List[Tuple[int, Optional[int]]],
+                 deadline: float) -> Iterator[str]:
+    """Строки архива, подходящие под regex, в заданных диапазонах распакованных байт"""
+    with gzip.open(path, 'rb') as f:
+        for start, end in ranges:
+            f.seek(start)
+            position = start
+
+            for raw in f:
+                if end is not None and position >= end:
+                    break
+                position += len(raw)
+
+                line = raw.decode('utf-8', errors='ignore').rstrip("\r\n")
+                if regex.search(line):
+                    yield line
+
+                if time.monotonic() >= deadline:
+                    return
+
+
+def scan_archive_file(path: str, pattern: str, ranges: List[Tuple[int, Optional[int]]],
+                      limit: int, time_budget: float) -> List[str]:
+    """
+    Поиск в одном архиве - задача для процесса-воркера (см. ParallelArchiveScanner).
+
+    pattern - готовое регулярное выражение (см. pattern_source). Принимает
+    и возвращает только простые типы, чтобы их можно было передать между
+    процессами.
+    """
+    regex = re.compile(pattern, re.IGNORECASE)
+    deadline = time.monotonic() + time_budget
+    matches = []
+
+    for line in scan_archive(Path(path), regex, ranges, deadline):
+        matches.append(line[:LogArchiveIndex.MAX_MATCH_CHARS])
+        if len(matches) >= limit:
+            break
+
+    return matches
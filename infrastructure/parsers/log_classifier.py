@@ -0,0 +1,193 @@
+# infrastructure/parsers/log_classifier.py
+"""
+Однопроходный классификатор строк лога Minecraft.
+
+Каждая строка разбирается двумя заранее скомпилированными выражениями:
+префикс ([время] [поток/уровень]) и одно общее выражение для всех
+интересных сообщений. Тип события определяется по имени сработавшей
+группы (match.lastgroup), без перебора шаблонов в цикле.
+
+В строках лога есть только время (HH:MM:SS). Полные дата и время
+восстанавливаются LogClock: от даты начала файла с переходом на
+следующий день, когда время "откатывается" через полночь.
+"""
+import re
+from bisect import bisect_left
+from datetime import date, datetime, timedelta
+from enum import Enum
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Sequence
+
+
+class LogEventType(Enum):
+    """Типы событий лога"""
+    JOIN = "join"          # Игрок зашел
+    LEAVE = "leave"        # Игрок вышел (left the game / lost connection)
+    CHAT = "chat"          # Сообщение в чате
+    COMMAND = "command"    # Игрок выполнил команду
+    LAG = "lag"            # Can't keep up! - сервер не успевает
+    RESTART = "restart"    # Запуск сервера (Starting minecraft server)
+    READY = "ready"        # Сервер запущен (Done ... For help)
+    STOP = "stop"          # Остановка сервера
+    WARN = "warn"          # Прочие предупреждения
+    ERROR = "error"        # Прочие ошибки
+
+
+class LogEvent(NamedTuple):
+    """Событие лога (кортеж без __dict__ у экземпляров)"""
+    type: LogEventType
+    time: str                     # HH:MM:SS из строки лога
+    level: str                    # INFO / WARN / ERROR / FATAL
+    player: Optional[str] = None
+    text: Optional[str] = None    # Сообщение чата, команда, версия или текст строки
+    value: Optional[int] = None   # Для LAG - отставание в мс
+    ticks: Optional[int] = None   # Для LAG - пропущено тиков
+    thread: Optional[str] = None  # Поток (Server thread, ...); в формате Paper его нет
+    timestamp: Optional[datetime] = None  # Полные дата и время, если известна дата файла
+
+
+class LogClock:
+    """
+    Восстановление полных даты и времени для строк одного лог-файла.
+
+    Дата начала файла задается явно (архивы YYYY-MM-DD-N.log.gz) или
+    вычисляется по reference - времени последнего изменения файла: если
+    первое событие позже reference по времени суток, файл начат накануне.
+    Время, ушедшее назад больше чем на ROLLOVER_TOLERANCE секунд,
+    означает переход через полночь. Небольшие откаты (строки разных
+    потоков, коррекция часов) дня не меняют.
+
+    Событий в логе много, поэтому начало текущей минуты кешируется, а
+    секунды добавляются готовыми timedelta.
+    """
+
+    ROLLOVER_TOLERANCE = 3600
+
+    def __init__(self, start: Optional[date] = None, reference: Optional[datetime] = None):
+        self.start = start
+        self.reference = reference
+        self.rollovers = 0
+        self._day: Optional[datetime] = None
+        self._last_minutes = 0
+        self._minute: Optional[str] = None
+        self._minute_start: Optional[datetime] = None
+
+    def resolve(self, time: str) -> datetime:
+        """Полные дата и время для очередного события с временем HH:MM:SS"""
+        if time[:5] != self._minute:
+            self._set_minute(time)
+        return self._minute_start + _SECONDS[int(time[6:8])]
+
+    def _set_minute(self, time: str):
+        minutes = int(time[0:2]) * 60 + int(time[3:5])
+
+        if self._day is None:
+            if self.start is None:
+                reference = self.reference or datetime.now()
+                self.start = reference.date()
+                if time > reference.strftime("%H:%M:%S"):
+                    self.start -= timedelta(days=1)
+            self._day = datetime.combine(self.start, datetime.min.time())
+        elif (minutes - self._last_minutes) * 60 < -self.ROLLOVER_TOLERANCE:
+            self._day += timedelta(days=1)
+            self.rollovers += 1
+
+        self._last_minutes = minutes
+        self._minute = time[:5]
+        self._minute_start = self._day + timedelta(minutes=minutes)
+
+
+# Секунды внутри минуты (60 - для секунды координации)
+_SECONDS = tuple(timedelta(seconds=second) for second in range(61))
+
+
+# Vanilla/Forge: [время] [поток/уровень] ([логгер])...: сообщение
+# Paper/Spigot:  [время уровень]: сообщение
+# Группы: время, поток (None для Paper), уровень, сообщение.
+# Префикс разбирается строго, чтобы сообщение в чате не подделало событие
+LINE_PATTERN = re.compile(
+    r'\[(\d{2}:\d{2}:\d{2})(?:\] \[([^\]]*?)/| )([A-Z]+)\](?: \[[^\]]*\])*: (.*)'
+)
+
+MESSAGE_PATTERN = re.compile(
+    r'(?P<join>(?P<join_player>\w+) joined the game)'
+    r'|(?P<leave>(?P<leave_player>\w+) (?:left the game|lost connection))'
+    r'|(?P<chat>(?:\[Not Secure\] )?<(?P<chat_player>\w+)> (?P<chat_text>.*))'
+    r'|(?P<command>(?P<command_player>\w+) issued server command: (?P<command_text>.*))'
+    r"|(?P<lag>Can't keep up!.*?Running (?P<lag_ms>\d+)ms behind(?:, skipping (?P<lag_ticks>\d+) tick)?)"
+    r'|(?P<restart>Starting minecraft server version (?P<version>\S+))'
+    r'|(?P<ready>Done \([\d.,]+s\)! For help)'
+    r'|(?P<stop>Stopping (?:the )?server)'
+)
+
+
+def classify_line(line: str, clock: Optional[LogClock] = None) -> Optional[LogEvent]:
+    """Событие для строки лога или None для неинтересной строки"""
+    line_match = LINE_PATTERN.match(line)
+    if line_match is None:
+        return None
+
+    time, thread, level, message = line_match.groups()
+    return classify_message(time, level, message, thread, clock)
+
+
+def classify_message(time: str, level: str, message: str,
+                     thread: Optional[str] = None,
+                     clock: Optional[LogClock] = None) -> Optional[LogEvent]:
+    """Событие для уже разобранной строки (время, уровень, сообщение)"""
+    match = MESSAGE_PATTERN.match(message)
+    if match is None and level not in ('WARN', 'ERROR', 'FATAL'):
+        return None
+
+    # Дата нужна только событиям: неинтересные строки часы не двигают,
+    # переход через полночь виден и по соседним событиям
+    timestamp = clock.resolve(time) if clock is not None else None
+
+    if match is None:
+        event_type = LogEventType.WARN if level == 'WARN' else LogEventType.ERROR
+        return LogEvent(event_type, time, level, text=message, thread=thread, timestamp=timestamp)
+
+    kind = match.lastgroup
+    if kind == 'join':
+        return LogEvent(LogEventType.JOIN, time, level, player=match['join_player'],
+                        thread=thread, timestamp=timestamp)
+    if kind == 'leave':
+        return LogEvent(LogEventType.LEAVE, time, level, player=match['leave_player'],
+                        thread=thread, timestamp=timestamp)
+    if kind == 'chat':
+        return LogEvent(LogEventType.CHAT, time, level, player=match['chat_player'], text=match['chat_text'],
+                        thread=thread, timestamp=timestamp)
+    if kind == 'command':
+        return LogEvent(LogEventType.COMMAND, time, level,
+                        player=match['command_player'], text=match['command_text'],
+                        thread=thread, timestamp=timestamp)
+    if kind == 'lag':
+        ticks = match['lag_ticks']
+        return LogEvent(LogEventType.LAG, time, level, value=int(match['lag_ms']),
+                        ticks=int(ticks) if ticks else None, thread=thread, timestamp=timestamp)
+    if kind == 'restart':
+        return LogEvent(LogEventType.RESTART, time, level, text=match['version'],
+                        thread=thread, timestamp=timestamp)
+    if kind == 'ready':
+        return LogEvent(LogEventType.READY, time, level, thread=thread, timestamp=timestamp)
+    return LogEvent(LogEventType.STOP, time, level, thread=thread, timestamp=timestamp)
+
+
+def classify_lines(lines: Iterable[str], clock: Optional[LogClock] = None) -> Iterator[LogEvent]:
+    """События для потока строк; с clock у событий заполняется timestamp"""
+    for line in lines:
+        event = classify_line(line, clock)
+        if event is not None:
+            yield event
+
+
+def events_between(events: Sequence[LogEvent], start: Optional[datetime] = None,
+                   end: Optional[datetime] = None) -> List[LogEvent]:
+    """
+    События с timestamp в [start, end) двоичным поиском.
+
+    events должны быть отсортированы по timestamp (события одного файла,
+    разобранные с LogClock, уже идут в этом порядке).
+    """
+    low = bisect_left(events, start, key=lambda event: event.timestamp) if start else 0
+    high = bisect_left(events, end, key=lambda event: event.timestamp) if end else len(events)
+    return list(events[low:high])
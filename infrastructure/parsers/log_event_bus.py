@@ -0,0 +1,117 @@
+# infrastructure/parsers/log_event_bus.py
+import asyncio
+from collections import deque
+from typing import AsyncIterator, Deque, Iterable, List, Optional, Set
+
+from infrastructure.parsers.log_classifier import LogEvent, LogEventType
+
+
+class LogSubscription:
+    """
+    Подписка на события лога.
+
+    События копятся в собственной очереди подписчика. Если подписчик
+    не успевает их разбирать, самые старые события вытесняются (счетчик
+    dropped), чтобы медленный подписчик не задерживал остальных.
+    """
+
+    def __init__(self, bus: "LogEventBus", types: Optional[Set[LogEventType]], maxsize: int):
+        self._bus = bus
+        self.types = types
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.dropped = 0
+
+    def accepts(self, event: LogEvent) -> bool:
+        return self.types is None or event.type in self.types
+
+    def deliver(self, event: LogEvent):
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(event)
+
+    async def get(self) -> LogEvent:
+        return await self.queue.get()
+
+    def get_nowait(self) -> List[LogEvent]:
+        """Все накопленные события без ожидания"""
+        events = []
+        while not self.queue.empty():
+            events.append(self.queue.get_nowait())
+        return events
+
+    def close(self):
+        self._bus.unsubscribe(self)
+
+    def __enter__(self) -> "LogSubscription":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __aiter__(self) -> AsyncIterator[LogEvent]:
+        return self
+
+    async def __anext__(self) -> LogEvent:
+        return await self.get()
+
+
+class LogEventBus:
+    """
+    Внутрипроцессная шина событий лога (издатель-подписчик).
+
+    Лог читает один LogWatcher, а все заинтересованные части бота
+    подписываются на шину: число подписчиков не добавляет чтений диска.
+    Последние события хранятся в истории для экранов, которым нужна
+    сводка, а не живой поток.
+
+    Методы вызываются из потока event loop.
+    """
+
+    def __init__(self, history: int = 50, queue_size: int = 100):
+        self.queue_size = queue_size
+        self._history: Deque[LogEvent] = deque(maxlen=history)
+        self._subscriptions: List[LogSubscription] = []
+        self.published = 0
+
+    @property
+    def subscribers(self) -> int:
+        return len(self._subscriptions)
+
+    def subscribe(self, types: Optional[Iterable[LogEventType]] = None,
+                  maxsize: Optional[int] = None) -> LogSubscription:
+        """Подписка на события указанных типов (None - на все)"""
+        subscription = LogSubscription(
+            self,
+            set(types) if types is not None else None,
+            maxsize or self.queue_size
+        )
+        self._subscriptions.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: LogSubscription):
+        if subscription in self._subscriptions:
+            self._subscriptions.remove(subscription)
+
+    def publish(self, event: LogEvent) -> int:
+        """Рассылает событие подписчикам; возвращает число получателей"""
+        self._history.append(event)
+        self.published += 1
+
+        delivered = 0
+        for subscription in self._subscriptions:
+            if subscription.accepts(event):
+                subscription.deliver(event)
+                delivered += 1
+        return delivered
+
+    def recent(self, limit: int = 10, types: Optional[Iterable[LogEventType]] = None) -> List[LogEvent]:
+        """Последние события из истории, от старых к новым"""
+        wanted = set(types) if types is not None else None
+        events = [event for event in self._history if wanted is None or event.type in wanted]
+        return events[-limit:] if limit else []
+
+    def clear(self):
+        self._history.clear()
+        self._subscriptions.clear()
+        self.published = 0
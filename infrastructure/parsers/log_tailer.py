@@ -0,0 +1,87 @@
+# infrastructure/parsers/log_tailer.py
+import os
+from pathlib import Path
+from typing import Callable, Iterator, Optional
+
+
+class LogTailer:
+    """
+    Инкрементальное чтение растущего лог-файла (как tail -F).
+
+    Запоминает позицию и inode файла: при каждом вызове read_lines()
+    читаются только дописанные байты. Незаконченная последняя строка
+    ждет следующего вызова.
+
+    Ротация (latest.log архивирован и создан заново - сменился inode)
+    и усечение (файл стал короче позиции) начинают чтение с начала файла
+    и вызывают on_reset. Файл открывается только на время чтения, чтобы
+    не мешать серверу переименовывать его.
+    """
+
+    CHUNK_SIZE = 1024 * 1024
+
+    def __init__(self, path: Path, on_reset: Optional[Callable[[], None]] = None,
+                 encoding: str = 'utf-8'):
+        self.path = Path(path)
+        self.on_reset = on_reset
+        self.encoding = encoding
+
+        self.offset = 0
+        self.inode: Optional[int] = None
+        self._partial = b""
+
+        # Счетчики для диагностики
+        self.bytes_read = 0
+        self.resets = 0
+
+    def seek_end(self):
+        """Пропускает уже записанное: следующее чтение вернет только новые строки"""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return
+        self.inode = stat.st_ino
+        self.offset = stat.st_size
+        self._partial = b""
+
+    def read_lines(self) -> Iterator[str]:
+        """Новые полные строки с прошлого вызова"""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return
+
+        if self.inode is not None and (stat.st_ino != self.inode or stat.st_size < self.offset):
+            self._reset()
+        self.inode = stat.st_ino
+
+        if stat.st_size == self.offset:
+            return
+
+        with open(self.path, 'rb') as f:
+            f.seek(self.offset)
+            while True:
+                chunk = f.read(self.CHUNK_SIZE)
+                if not chunk:
+                    break
+                self.offset += len(chunk)
+                self.bytes_read += len(chunk)
+                yield from self._split(chunk)
+
+    def _split(self, chunk: bytes) -> Iterator[str]:
+        data = self._partial + chunk
+        end = data.rfind(b"\n")
+        if end < 0:
+            self._partial = data
+            return
+
+        self._partial = data[end + 1:]
+        for line in data[:end].decode(self.encoding, errors='ignore').split("\n"):
+            yield line.rstrip("\r")
+
+    def _reset(self):
+        self.offset = 0
+        self._partial = b""
+        self.resets += 1
+        if self.on_reset:
+            self.on_reset()
@@ -0,0 +1,165 @@
+# infrastructure/parsers/log_watcher.py
+import asyncio
+import ctypes
+import ctypes.util
+import os
+import struct
+from pathlib import Path
+from typing import List, Optional
+
+from config.settings import settings
+from infrastructure.parsers.log_classifier import LogClock, LogEvent, classify_line
+from infrastructure.parsers.log_event_bus import LogEventBus
+from infrastructure.parsers.log_tailer import LogTailer
+from loggers.app_logger import logger
+
+# Флаги inotify из <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, len
+
+
+class Inotify:
+    """Минимальная обертка над inotify (Linux) через libc"""
+
+    def __init__(self, directory: Path):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1")
+
+        if libc.inotify_add_watch(self.fd, os.fsencode(str(directory)), WATCH_MASK) < 0:
+            error = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(error, f"inotify_add_watch {directory}")
+
+    def read_names(self) -> Optional[List[str]]:
+        """Имена измененных файлов; None при переполнении очереди inotify"""
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+
+        names = []
+        position = 0
+        while position + EVENT_HEADER.size <= len(data):
+            _, mask, _, length = EVENT_HEADER.unpack_from(data, position)
+            position += EVENT_HEADER.size
+            if mask & IN_Q_OVERFLOW:
+                return None
+            names.append(data[position:position + length].rstrip(b"\0").decode(errors='ignore'))
+            position += length
+        return names
+
+    def close(self):
+        os.close(self.fd)
+
+
+class LogWatcher:
+    """
+    Наблюдение за latest.log сервера с публикацией событий в LogEventBus.
+
+    На Linux изменения в папке логов приходят через inotify: файл
+    читается только когда сервер в него пишет. Если inotify недоступен
+    (другая ОС, исчерпан лимит наблюдателей, нет папки), используется
+    опрос с интервалом poll_interval - LogTailer при этом лишь сверяет
+    размер файла. Читаются только дописанные строки, ротация latest.log
+    отрабатывается LogTailer.
+    """
+
+    LOG_FILE = "latest.log"
+
+    def __init__(self, log_dir: str, bus: LogEventBus, poll_interval: float = 1.0,
+                 use_inotify: bool = True):
+        self.log_dir = Path(log_dir)
+        self.bus = bus
+        self.poll_interval = poll_interval
+        self.use_inotify = use_inotify
+        self.mode: Optional[str] = None  # "inotify" / "polling" после запуска
+        self._tailer = LogTailer(self.log_dir / self.LOG_FILE, on_reset=self._reset_clock)
+        # Новые строки пишутся сейчас: дата берется по текущему времени
+        self._clock = LogClock()
+        self._changed = asyncio.Event()
+
+    def _reset_clock(self):
+        self._clock = LogClock()
+
+    def _open_inotify(self) -> Optional[Inotify]:
+        if not self.use_inotify:
+            return None
+        try:
+            return Inotify(self.log_dir)
+        except (OSError, AttributeError) as e:
+            # AttributeError - в libc нет inotify (не Linux)
+            logger.info(f"ℹ️ inotify недоступен ({e}), логи будут опрашиваться")
+            return None
+
+    def _on_inotify(self, inotify: Inotify):
+        names = inotify.read_names()
+        if names is None or self.LOG_FILE in names:
+            self._changed.set()
+
+    def _read_events(self) -> List[LogEvent]:
+        # Часы берутся для каждой строки: при ротации read_lines меняет их
+        # (on_reset) уже после начала цикла
+        events = []
+        for line in self._tailer.read_lines():
+            event = classify_line(line, self._clock)
+            if event is not None:
+                events.append(event)
+        return events
+
+    async def poll_once(self) -> int:
+        """Читает новые строки и публикует события; возвращает их количество"""
+        events = await asyncio.to_thread(self._read_events)
+        for event in events:
+            self.bus.publish(event)
+        return len(events)
+
+    async def run(self):
+        """Фоновая задача наблюдения за логом"""
+        # История уже есть в MinecraftLogParser, публикуются только новые строки
+        await asyncio.to_thread(self._tailer.seek_end)
+
+        loop = asyncio.get_running_loop()
+        inotify = self._open_inotify()
+        self.mode = "inotify" if inotify else "polling"
+        if inotify:
+            loop.add_reader(inotify.fd, self._on_inotify, inotify)
+
+        logger.info(f"👀 Наблюдение за логом сервера ({self.mode}): {self._tailer.path}")
+
+        try:
+            while True:
+                if inotify:
+                    await self._changed.wait()
+                    self._changed.clear()
+                else:
+                    await asyncio.sleep(self.poll_interval)
+
+                try:
+                    await self.poll_once()
+                except Exception as e:
+                    logger.warning(f"⚠️  Ошибка чтения лога сервера: {e}")
+        except asyncio.CancelledError:
+            logger.info("⏹ Наблюдение за логом сервера остановлено")
+        finally:
+            if inotify:
+                loop.remove_reader(inotify.fd)
+                inotify.close()
+
+
+# Общая шина событий лога и наблюдатель, который ее наполняет
+log_event_bus = LogEventBus(history=settings.LOG_EVENT_HISTORY)
+log_watcher = LogWatcher(
+    settings.MINECRAFT_LOG_DIR,
+    log_event_bus,
+    poll_interval=settings.LOG_WATCH_POLL_INTERVAL
+)
@@ -1,18 +1,167 @@
-import re
-from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+import asyncio
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Generator, List, Dict, Optional
 from pathlib import Path
 
+from infrastructure.parsers.log_tailer import LogTailer
+from infrastructure.parsers.log_classifier import LogClock, LogEvent, LogEventType, classify_line
+from infrastructure.parsers.session_tracker import PlayerSessionTracker
+from infrastructure.parsers.lag_analyzer import LagAnalyzer
+from infrastructure.parsers.log_archive_index import ArchiveMatch, LogArchiveIndex
+from infrastructure.parsers.archive_scanner import ParallelArchiveScanner
+from infrastructure.parsers.pattern_search import (
+    Match, SearchResult, SearchWorkerPool, compile_pattern, file_matches, iter_file_matches
+)
+
+
+class LogState:
+    """Агрегированное состояние latest.log, обновляется по одному событию"""
+
+    def __init__(self):
+        self.players = PlayerSessionTracker()
+        self.errors_count = 0
+        self.warnings_count = 0
+        self.lag_count = 0
+        self.lag = LagAnalyzer()
+        self.chat_messages = 0
+        self.commands_count = 0
+        self.last_restart: Optional[str] = None
+        self.last_restart_at: Optional[datetime] = None
+
+    def apply(self, event: LogEvent):
+        if event.level == 'WARN':
+            self.warnings_count += 1
+        elif event.level in ('ERROR', 'FATAL'):
+            self.errors_count += 1
+
+        if event.type == LogEventType.JOIN:
+            self.players.join(event.player, event.time)
+        elif event.type == LogEventType.LEAVE:
+            self.players.leave(event.player, event.time)
+        elif event.type == LogEventType.CHAT:
+            self.chat_messages += 1
+        elif event.type == LogEventType.COMMAND:
+            self.commands_count += 1
+        elif event.type == LogEventType.LAG:
+            self.lag_count += 1
+            self.lag.add(event.time, event.value, event.ticks, len(self.players.sessions))
+        elif event.type in (LogEventType.RESTART, LogEventType.STOP):
+            self.players.server_restart(event.time)
+        elif event.type == LogEventType.READY:
+            self.last_restart = event.time
+            self.last_restart_at = event.timestamp
+
 
 class MinecraftLogParser:
-    """Парсер логов Minecraft для быстрой демонстрации"""
+    """
+    Парсер логов Minecraft.
 
-    def __init__(self, log_dir: str = "./demo_logs"):
+    С demo=True (по умолчанию) в папке создается демо-лог, а при пустых
+    результатах подставляются демо-данные. С demo=False парсер читает
+    только то, что есть в папке сервера.
+    """
+
+    # Ограничения поиска по шаблону пользователя
+    SEARCH_TIME_BUDGET = 2.0             # секунды на весь поиск
+    SEARCH_WINDOW = 1024 * 1024          # байт на один шаг поиска
+    SEARCH_MAX_MATCH_CHARS = 500         # длина одного результата
+    SEARCH_MAX_PATTERN_LENGTH = 200
+    SEARCH_WORKERS = None                # процессов поиска (None - по числу ядер)
+
+    def __init__(self, log_dir: str = "./demo_logs", demo: bool = True):
         self.log_dir = Path(log_dir)
-        self.log_dir.mkdir(exist_ok=True)
+        self.demo = demo
+
+        if demo:
+            # Создаем демо-логи, если их нет
+            self.log_dir.mkdir(exist_ok=True)
+            self._create_demo_logs()
+
+        # latest.log читается инкрементально: только новые строки с прошлого вызова
+        self._state = LogState()
+        self._tailer = LogTailer(self.log_dir / "latest.log", on_reset=self._reset_state)
+        self._clock = self._new_clock()
+
+        # Индекс архивов *.log.gz создается при первом обращении
+        self._archive_index: Optional[LogArchiveIndex] = None
+        self._archive_lock = threading.Lock()
+        self._archive_scanner: Optional[ParallelArchiveScanner] = None
+        self._search_workers: Optional[SearchWorkerPool] = None
+        self._search_lock = threading.Lock()
 
-        # Создаем демо-логи, если их нет
-        self._create_demo_logs()
+    def _reset_state(self):
+        """Лог ротирован или усечен - состояние собирается заново"""
+        self._state = LogState()
+        self._clock = self._new_clock()
+
+    def _new_clock(self) -> LogClock:
+        """Часы для latest.log: дата начала выводится из времени изменения файла"""
+        try:
+            reference = datetime.fromtimestamp(self._tailer.path.stat().st_mtime)
+        except FileNotFoundError:
+            reference = None
+        return LogClock(reference=reference)
+
+    def _refresh(self) -> LogState:
+        """Применяет к состоянию строки, дописанные в лог с прошлого вызова"""
+        # Ротацию read_lines замечает уже внутри цикла и меняет часы и
+        # состояние (on_reset), поэтому они берутся заново для каждой строки
+        for line in self._tailer.read_lines():
+            event = classify_line(line, self._clock)
+            if event is not None:
+                self._state.apply(event)
+        return self._state
+
+    @property
+    def archive_index(self) -> LogArchiveIndex:
+        """Индекс архивов, обновленный по новым и измененным файлам"""
+        index = self._open_archive_index()
+        index.update()
+        return index
+
+    def _open_archive_index(self) -> LogArchiveIndex:
+        """Индекс архивов без обновления; открывает SQLite файл - вызывать не из event loop"""
+        with self._archive_lock:
+            if self._archive_index is None:
+                self._archive_index = LogArchiveIndex(self.log_dir)
+            return self._archive_index
+
+    @property
+    def archive_scanner(self) -> ParallelArchiveScanner:
+        """Поиск по архивам в процессах поиска, создается при первом обращении"""
+        with self._search_lock:
+            if self._archive_scanner is None:
+                self._archive_scanner = ParallelArchiveScanner(workers=self._get_search_workers())
+            return self._archive_scanner
+
+    @property
+    def search_workers(self) -> SearchWorkerPool:
+        """
+        Процессы поиска, общие для регулярных выражений по latest.log и
+        поиска по архивам; создаются при первом обращении
+        """
+        with self._search_lock:
+            return self._get_search_workers()
+
+    def _get_search_workers(self) -> SearchWorkerPool:
+        if self._search_workers is None:
+            self._search_workers = SearchWorkerPool(self.SEARCH_WORKERS or os.cpu_count() or 1)
+        return self._search_workers
+
+    def close(self):
+        """Закрывает индекс архивов и процессы поиска"""
+        if self._archive_scanner is not None:
+            self._archive_scanner.shutdown()
+            self._archive_scanner = None
+        if self._search_workers is not None:
+            self._search_workers.shutdown()
+            self._search_workers = None
+        if self._archive_index is not None:
+            self._archive_index.close()
+            self._archive_index = None
 
     def _create_demo_logs(self):
         """Создание демо-логов для презентации"""
@@ -39,29 +188,20 @@ class MinecraftLogParser:
 
     def parse_online_players(self) -> List[str]:
         """Парсит игроков онлайн из логов"""
-        players = []
         log_file = self.log_dir / "latest.log"
 
         if not log_file.exists():
-            return ["Alex", "Steve", "Notch"]  # Демо данные
-
-        content = log_file.read_text(encoding='utf-8', errors='ignore')
-
-        # Ищем игроков, которые зашли
-        join_pattern = r'(\w+) joined the game'
-        players_joined = re.findall(join_pattern, content)
+            return ["Alex", "Steve", "Notch"] if self.demo else []  # Демо данные
 
-        # Ищем игроков, которые вышли
-        leave_pattern = r'(\w+) lost connection'
-        players_left = re.findall(leave_pattern, content)
-
-        # Простая логика: кто зашел и не вышел
-        for player in players_joined:
-            if player not in players_left:
-                players.append(player)
+        # Кто зашел и еще не вышел - по новым строкам лога
+        players = self._refresh().players.online
 
         # Если не нашли, возвращаем демо-данные
-        return players if players else ["Steve", "Notch", "Herobrine"]
+        return players if players or not self.demo else ["Steve", "Notch", "Herobrine"]
+
+    def parse_player_sessions(self) -> Dict[str, Optional[str]]:
+        """Игроки онлайн и время начала их сессий (в порядке входа)"""
+        return dict(self._refresh().players.sessions)
 
     def parse_server_stats(self) -> Dict[str, any]:
         """Парсит базовую статистику сервера"""
@@ -71,11 +211,15 @@ class MinecraftLogParser:
             'errors_count': 0,
             'warnings_count': 0,
             'last_restart': None,
-            'uptime': '5ч 30м'
+            'last_restart_at': None,
+            'uptime': '5ч 30м' if self.demo else None,
+            'lag': LagAnalyzer().summary()
         }
 
         log_file = self.log_dir / "latest.log"
         if not log_file.exists():
+            if not self.demo:
+                return stats
             stats.update({
                 'online_players': 3,
                 'total_players': 15,
@@ -85,31 +229,137 @@ class MinecraftLogParser:
             })
             return stats
 
-        content = log_file.read_text(encoding='utf-8', errors='ignore')
-        lines = content.split('\n')
-
-        # Подсчет статистики
-        stats['online_players'] = len(self.parse_online_players())
-        stats['errors_count'] = sum(1 for line in lines if 'ERROR' in line)
-        stats['warnings_count'] = sum(1 for line in lines if 'WARN' in line)
-
-        # Ищем время запуска
-        for line in lines:
-            if 'Done' in line and 'For help' in line:
-                time_match = re.search(r'\[(\d{2}:\d{2}:\d{2})\]', line)
-                if time_match:
-                    stats['last_restart'] = time_match.group(1)
-                break
+        # Подсчет статистики по накопленному состоянию
+        state = self._refresh()
+        # Без демо-подстановки parse_online_players: пустой сервер - это 0
+        stats['online_players'] = len(state.players.sessions)
+        stats['total_players'] = len(state.players.seen_players)
+        stats['errors_count'] = state.errors_count
+        stats['warnings_count'] = state.warnings_count
+        stats['last_restart'] = state.last_restart
+        stats['last_restart_at'] = state.last_restart_at
+        stats['lag'] = state.lag.summary()
 
         return stats
 
-    def search_logs(self, pattern: str, limit: int = 10) -> List[str]:
-        """Поиск по логам с регулярным выражением"""
+    def search_logs(self, pattern: str, limit: int = 10,
+                    time_budget: Optional[float] = None,
+                    cancel_event: Optional[threading.Event] = None,
+                    regex: bool = False) -> SearchResult:
+        """
+        Поиск по логам: текст или, с regex=True, регулярное выражение.
+
+        У результата truncated=True, если поиск прерван по времени или отмене.
+        """
         log_file = self.log_dir / "latest.log"
         if not log_file.exists():
-            return [f"Demo match for: {pattern}"]
+            return SearchResult([f"Demo match for: {pattern}"] if self.demo else [])
+
+        return SearchResult.collect(self.iter_search_logs(pattern, limit, time_budget, cancel_event, regex))
+
+    def iter_search_logs(self, pattern: str, limit: int = 10,
+                         time_budget: Optional[float] = None,
+                         cancel_event: Optional[threading.Event] = None,
+                         regex: bool = False) -> Generator[Match, None, bool]:
+        """
+        Ищет совпадения в latest.log и отдает их по одному.
+
+        Файл отображается в память (mmap) и читается окнами; поиск
+        останавливается после limit совпадений или по истечении time_budget
+        секунд. Совпадения не пересекают границы окон по SEARCH_WINDOW байт
+        (окна выровнены по строкам). Длинные совпадения обрезаются до
+        SEARCH_MAX_MATCH_CHARS символов. Установленный cancel_event
+        прерывает поиск из другого потока. Генератор возвращает True, если
+        поиск прерван по времени или отмене.
+
+        По умолчанию pattern ищется как текст. С regex=True это регулярное
+        выражение: оно выполняется в процессе поиска (search_workers),
+        который по истечении времени или отмене завершается. Время
+        отсчитывается с момента, когда процесс принял задачу.
+        """
+        self._check_pattern(pattern)
+        compiled = compile_pattern(pattern, regex)
+
+        log_file = self.log_dir / "latest.log"
+        if limit <= 0 or not log_file.exists() or log_file.stat().st_size == 0:
+            return False
+
+        budget = self.SEARCH_TIME_BUDGET if time_budget is None else time_budget
+
+        if regex:
+            return (yield from self.search_workers.run(
+                file_matches,
+                (str(log_file), compiled.pattern, self.SEARCH_WINDOW, self.SEARCH_MAX_MATCH_CHARS, limit),
+                budget, cancel_event
+            ))
+
+        deadline = time.monotonic() + budget
+        stopped = False
+
+        def should_stop() -> bool:
+            nonlocal stopped
+            stopped = time.monotonic() >= deadline or (cancel_event is not None and cancel_event.is_set())
+            return stopped
+
+        matches = iter_file_matches(log_file, compiled, self.SEARCH_WINDOW, self.SEARCH_MAX_MATCH_CHARS, should_stop)
+        try:
+            for found, match in enumerate(matches, 1):
+                yield match
+                if found >= limit:
+                    return False
+        finally:
+            matches.close()
+        return stopped
+
+    def search_archives(self, pattern: str, limit: int = 10,
+                        player: Optional[str] = None,
+                        date_from: Optional[str] = None,
+                        date_to: Optional[str] = None,
+                        hours: Optional[List[int]] = None,
+                        parallel: bool = False,
+                        regex: bool = False) -> List[ArchiveMatch]:
+        """
+        Поиск по архивам логов, от новых к старым.
+
+        Открываются только архивы, где встречался player и которые попадают
+        в даты date_from..date_to (YYYY-MM-DD); hours ограничивает часы.
+        parallel=True распределяет архивы по процессам (ParallelArchiveScanner).
+        Регулярные выражения (regex=True) всегда ищутся в процессах, которые
+        можно остановить; у такого результата truncated=True, если поиск
+        прерван по времени.
+        """
+        self._check_pattern(pattern)
+        compile_pattern(pattern, regex)
+
+        if parallel or regex:
+            return self.archive_scanner.search(
+                self.archive_index, pattern, limit,
+                player=player, date_from=date_from, date_to=date_to, hours=hours, regex=regex
+            )
+        return self.archive_index.search(
+            pattern, limit, player=player, date_from=date_from, date_to=date_to, hours=hours
+        )
+
+    async def search_archives_async(self, pattern: str, limit: int = 10,
+                                    player: Optional[str] = None,
+                                    date_from: Optional[str] = None,
+                                    date_to: Optional[str] = None,
+                                    hours: Optional[List[int]] = None,
+                                    regex: bool = False) -> List[ArchiveMatch]:
+        """Поиск по архивам в пуле процессов, не блокирующий event loop бота"""
+        self._check_pattern(pattern)
+        compile_pattern(pattern, regex)
+
+        index = await asyncio.to_thread(self._open_archive_index)
+        return await self.archive_scanner.search_async(
+            index, pattern, limit,
+            player=player, date_from=date_from, date_to=date_to, hours=hours, regex=regex
+        )
 
-        content = log_file.read_text(encoding='utf-8', errors='ignore')
-        matches = re.findall(pattern, content, re.IGNORECASE)
+    def _check_pattern(self, pattern: str):
+        if len(pattern) > self.SEARCH_MAX_PATTERN_LENGTH:
+            raise ValueError(f"Шаблон длиннее {self.SEARCH_MAX_PATTERN_LENGTH} символов")
 
-        return matches[:limit]
\ No newline at end of file
+    def archive_last_join(self, player: str) -> Optional[tuple]:
+        """(дата, время) последнего входа игрока по архивам, без распаковки"""
+        return self.archive_index.last_join(player)
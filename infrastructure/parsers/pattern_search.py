@@ -0,0 +1,307 @@
+# infrastructure/parsers/pattern_search.py
+"""
+Поиск по шаблону пользователя в логах.
+
+По умолчанию шаблон ищется как обычный текст без учета регистра
+(re.escape): такое выражение не перебирает варианты и работает за
+линейное время. Регулярное выражение пользователя может перебирать
+варианты экспоненциально долго даже на одной строке ((a|a)+b), и
+проверки времени между совпадениями его не прерывают. Поэтому
+регулярные выражения выполняются в долгоживущих процессах поиска
+(SearchWorkerPool): процесс, не уложившийся во время или отмененный,
+завершается принудительно, а следующий поиск запускает новый.
+
+Модуль не импортирует ничего, кроме стандартной библиотеки: он
+загружается в каждом процессе поиска.
+"""
+import itertools
+import mmap
+import multiprocessing
+import pickle
+import queue
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Generator, Iterable, Iterator, List, Optional, Union
+
+# Совпадение как в re.findall: строка или кортеж групп
+Match = Union[str, tuple]
+
+# Как часто процесс поиска проверяет отмену, пока ждет результаты
+POLL_INTERVAL = 0.05
+# Сколько ждать, пока новый процесс поиска примет задачу: при spawn он
+# заново импортирует главный модуль бота, и это может занять секунды
+START_TIMEOUT = 60.0
+
+# Сообщения процесса поиска: (id задачи, тип, данные)
+_STARTED, _ITEM, _DONE, _ERROR = range(4)
+
+
+class SearchError(RuntimeError):
+    """Процесс поиска завершился, не закончив задачу"""
+
+
+class SearchResult(list):
+    """
+    Совпадения поиска.
+
+    truncated=True - поиск прерван по времени или отмене и просмотрел не
+    все данные: совпадений может быть больше, а пустой список не значит,
+    что их нет.
+    """
+
+    def __init__(self, matches: Iterable = (), truncated: bool = False):
+        super().__init__(matches)
+        self.truncated = truncated
+
+    @classmethod
+    def collect(cls, matches: Generator[Any, None, bool]) -> 'SearchResult':
+        """Список из генератора, который возвращает признак прерывания"""
+        result = cls()
+        while True:
+            try:
+                result.append(next(matches))
+            except StopIteration as stop:
+                result.truncated = bool(stop.value)
+                return result
+
+
+def pattern_source(pattern: str, regex: bool = False) -> str:
+    """Текст регулярного выражения для шаблона: сам шаблон или экранированный текст"""
+    return pattern if regex else re.escape(pattern)
+
+
+def compile_pattern(pattern: str, regex: bool = False) -> re.Pattern:
+    """Шаблон поиска без учета регистра; ошибка в регулярном выражении - re.error"""
+    return re.compile(pattern_source(pattern, regex), re.IGNORECASE)
+
+
+def format_match(match: re.Match, max_chars: int) -> Match:
+    """Совпадение как в re.findall: группа, кортеж групп или вся строка"""
+    groups = match.groups()
+    if not groups:
+        return match.group(0)[:max_chars]
+    if len(groups) == 1:
+        return (groups[0] or "")[:max_chars]
+    return tuple((group or "")[:max_chars] for group in groups)
+
+
+def iter_file_matches(path: Path, regex: re.Pattern, window_size: int, max_chars: int,
+                      should_stop: Callable[[], bool] = lambda: False) -> Iterator[Match]:
+    """
+    Совпадения regex в файле.
+
+    Файл отображается в память (mmap) и читается окнами по window_size
+    байт, выровненными по строкам; совпадения не пересекают границы окон.
+    should_stop проверяется перед каждым окном и после каждого совпадения.
+    """
+    with open(path, 'rb') as f:
+        if f.seek(0, 2) == 0:
+            return
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            size = len(data)
+            start = 0
+
+            while start < size and not should_stop():
+                end = min(size, start + window_size)
+                if end < size:
+                    newline = data.rfind(b"\n", start, end)
+                    if newline > start:
+                        end = newline + 1
+
+                # Окно декодируется целиком: границы по строкам не режут символы
+                window = data[start:end].decode('utf-8', errors='ignore')
+                for match in regex.finditer(window):
+                    yield format_match(match, max_chars)
+                    if should_stop():
+                        return
+
+                start = end
+
+
+def file_matches(path: str, source: str, window_size: int, max_chars: int, limit: int) -> Iterator[Match]:
+    """Задача для процесса поиска: первые limit совпадений регулярного выражения source в файле"""
+    regex = re.compile(source, re.IGNORECASE)
+    return itertools.islice(iter_file_matches(Path(path), regex, window_size, max_chars), limit)
+
+
+def _worker_main(tasks, results):
+    """
+    Цикл процесса поиска: выполняет задачи (id, функция, аргументы) по одной.
+
+    Сообщения отправляются через Pipe синхронно: у multiprocessing.Queue
+    отправку делает фоновый поток, а регулярное выражение держит GIL, и
+    сообщение о начале задачи не ушло бы до конца перебора.
+    """
+    while True:
+        try:
+            task = tasks.recv()
+        except EOFError:
+            return
+        if task is None:
+            return
+
+        task_id, func, args = task
+        results.send((task_id, _STARTED, None))
+        try:
+            for item in func(*args):
+                results.send((task_id, _ITEM, item))
+        except Exception as e:
+            try:
+                pickle.dumps(e)
+            except Exception:
+                e = SearchError(f"{type(e).__name__}: {e}")
+            results.send((task_id, _ERROR, e))
+        else:
+            results.send((task_id, _DONE, None))
+
+
+class SearchWorker:
+    """
+    Долгоживущий процесс поиска.
+
+    Процесс запускается при первой задаче (или заранее, start) и дальше
+    выполняет задачи по одной. Время задачи отсчитывается с момента, когда
+    процесс ее принял: запуск процесса в бюджет поиска не входит. Задача,
+    не уложившаяся во время, отмененная или брошенная потребителем,
+    завершается вместе с процессом.
+    """
+
+    def __init__(self):
+        # spawn: бот многопоточный, fork в таком процессе небезопасен
+        self._context = multiprocessing.get_context("spawn")
+        self._process: Optional[multiprocessing.Process] = None
+        self._tasks = None
+        self._results = None
+        self._ids = itertools.count(1)
+
+    @property
+    def is_alive(self) -> bool:
+        return self._process is not None and self._process.is_alive()
+
+    def start(self):
+        """Запускает процесс, если он не запущен"""
+        if self.is_alive:
+            return
+        self.kill()
+
+        task_reader, self._tasks = self._context.Pipe(duplex=False)
+        self._results, result_writer = self._context.Pipe(duplex=False)
+        self._process = self._context.Process(
+            target=_worker_main, args=(task_reader, result_writer),
+            name="log-search", daemon=True
+        )
+        self._process.start()
+        # Концы процесса поиска нужны только ему
+        task_reader.close()
+        result_writer.close()
+
+    def kill(self):
+        """Завершает процесс вместе с текущей задачей"""
+        process, self._process = self._process, None
+        if process is not None:
+            if process.is_alive():
+                process.terminate()
+            process.join()
+
+        for channel in (self._tasks, self._results):
+            if channel is not None:
+                channel.close()
+        self._tasks = self._results = None
+
+    def run(self, func: Callable[..., Iterable], args: tuple, time_budget: float,
+            cancel_event: Optional[threading.Event] = None,
+            started: Optional[threading.Event] = None) -> Generator[Any, None, bool]:
+        """
+        Выполняет func(*args) в процессе и отдает результаты по мере получения.
+
+        func и ее результаты передаются между процессами, поэтому func -
+        функция уровня модуля. started устанавливается, когда процесс принял
+        задачу. Возвращает True, если задача прервана по time_budget или
+        cancel_event.
+        """
+        self.start()
+        process, results = self._process, self._results
+        task_id = next(self._ids)
+        self._tasks.send((task_id, func, args))
+
+        finished = False
+        deadline = time.monotonic() + START_TIMEOUT
+        try:
+            while cancel_event is None or not cancel_event.is_set():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return True
+                if not results.poll(min(remaining, POLL_INTERVAL)):
+                    continue
+
+                try:
+                    message_id, kind, payload = results.recv()
+                except EOFError:
+                    process.join()
+                    raise SearchError(f"Процесс поиска завершился с кодом {process.exitcode}")
+
+                if message_id != task_id:
+                    continue
+                if kind == _STARTED:
+                    deadline = time.monotonic() + time_budget
+                    if started is not None:
+                        started.set()
+                elif kind == _ITEM:
+                    yield payload
+                else:
+                    finished = True
+                    if kind == _ERROR:
+                        raise payload
+                    return False
+            return True
+        finally:
+            if not finished:
+                self.kill()
+
+
+class SearchWorkerPool:
+    """
+    Ограниченный набор процессов поиска, общий для всех поисков.
+
+    Каждый поиск берет свободный процесс и возвращает его после задачи;
+    если все заняты, поиск ждет. Процессы запускаются по мере надобности:
+    сначала переиспользуются уже работающие.
+    """
+
+    def __init__(self, size: int):
+        self.size = max(1, size)
+        self._workers: List[SearchWorker] = [SearchWorker() for _ in range(self.size)]
+        self._idle: queue.LifoQueue = queue.LifoQueue()
+        for worker in reversed(self._workers):
+            self._idle.put(worker)
+
+    def run(self, func: Callable[..., Iterable], args: tuple, time_budget: float,
+            cancel_event: Optional[threading.Event] = None,
+            started: Optional[threading.Event] = None) -> Generator[Any, None, bool]:
+        """SearchWorker.run на свободном процессе; ожидание процесса прерывает cancel_event"""
+        while True:
+            if cancel_event is not None and cancel_event.is_set():
+                return True
+            try:
+                worker = self._idle.get(timeout=POLL_INTERVAL)
+                break
+            except queue.Empty:
+                continue
+
+        try:
+            return (yield from worker.run(func, args, time_budget, cancel_event, started))
+        finally:
+            self._idle.put(worker)
+
+    def start(self):
+        """Запускает все процессы заранее"""
+        for worker in self._workers:
+            worker.start()
+
+    def shutdown(self):
+        """Завершает все процессы"""
+        for worker in self._workers:
+            worker.kill()
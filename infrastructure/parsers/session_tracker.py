@@ -0,0 +1,47 @@
+# infrastructure/parsers/session_tracker.py
+from typing import Dict, List, Optional
+
+
+class PlayerSessionTracker:
+    """
+    Онлайн игроков по событиям лога в порядке их появления.
+
+    Вход открывает сессию, выход (left the game / lost connection)
+    закрывает ее, рестарт сервера закрывает все сессии. Каждое событие
+    обрабатывается за O(1), весь лог - за один линейный проход.
+    """
+
+    def __init__(self):
+        # Игрок -> время начала сессии; порядок ключей - порядок входа
+        self.sessions: Dict[str, Optional[str]] = {}
+        self.seen_players: set = set()
+
+        # Счетчики для статистики
+        self.joins = 0
+        self.completed_sessions = 0
+
+    def join(self, player: str, at: Optional[str] = None):
+        """Игрок зашел; повторный вход без выхода не сбрасывает начало сессии"""
+        self.seen_players.add(player)
+        if player not in self.sessions:
+            self.sessions[player] = at
+            self.joins += 1
+
+    def leave(self, player: str, at: Optional[str] = None):
+        """Игрок вышел; повторное сообщение о выходе игнорируется"""
+        if player in self.sessions:
+            del self.sessions[player]
+            self.completed_sessions += 1
+
+    def server_restart(self, at: Optional[str] = None):
+        """Сервер перезапущен - все сессии закрыты"""
+        self.completed_sessions += len(self.sessions)
+        self.sessions.clear()
+
+    @property
+    def online(self) -> List[str]:
+        """Игроки онлайн в порядке входа"""
+        return list(self.sessions)
+
+    def is_online(self, player: str) -> bool:
+        return player in self.sessions
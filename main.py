@@ -26,8 +26,17 @@ from infrastructure.adapters.database import Database
 # Импорты логгера
 from loggers.app_logger import logger
 
-# Импорт менеджера сессий
+# Импорт менеджера сессий и шифрования
 from domain.services.session_manager import SessionManager
+from infrastructure.adapters.crypto import get_crypto_service
+
+# Импорт пула RCON соединений и проверки серверов
+from infrastructure.adapters.rcon_pool import rcon_pool
+from infrastructure.adapters.rcon_health import rcon_health
+
+# Импорт парсера логов сервера
+from infrastructure.parsers.async_log_parser import log_parser
+from infrastructure.parsers.log_watcher import log_watcher
 
 # ============= ИМПОРТ КОНТРОЛЛЕРОВ =============
 from bot.controllers.start_controller import router as start_router
@@ -73,7 +82,9 @@ async def setup_session_manager(database: Database) -> SessionManager:
     try:
         session_manager = SessionManager(
             database=database,
-            session_duration_hours=settings.SESSION_DURATION_HOURS
+            session_duration_hours=settings.SESSION_DURATION_HOURS,
+            cache_size=settings.SESSION_CACHE_SIZE,
+            negative_ttl=settings.AUTH_NEGATIVE_CACHE_TTL
         )
 
         logger.info("✅ Менеджер сессий создан")
@@ -97,7 +108,7 @@ async def setup_middlewares(dp: Dispatcher, database: Database, session_manager:
     dp.update.outer_middleware(database_middleware)
 
     # Middleware для проверки авторизации
-    auth_middleware = AuthMiddleware(session_manager)
+    auth_middleware = AuthMiddleware(session_manager, notice_interval=settings.AUTH_NOTICE_INTERVAL)
     dp.message.middleware(auth_middleware)
     dp.callback_query.middleware(auth_middleware)
 
@@ -136,6 +147,14 @@ async def startup_tasks(database: Database):
     except Exception as e:
         logger.warning(f"⚠️  Ошибка при очистке данных: {e}")
 
+    # Вывод ключа шифрования (PBKDF2) - один раз на процесс и до первой команды
+    crypto = await asyncio.to_thread(get_crypto_service)
+    timings = crypto.timings
+    logger.info(
+        f"🔐 Шифрование готово за {timings['total_ms']:.0f} мс "
+        f"(вывод ключа {timings.get('derive_ms', 0):.0f} мс, самопроверка {timings['self_test_ms']:.0f} мс)"
+    )
+
     logger.info("✅ Задачи запуска выполнены")
 
 
@@ -161,6 +180,20 @@ async def periodic_tasks(database: Database):
         logger.error(f"❌ Ошибка в фоновых задачах: {e}")
 
 
+async def sweep_session_cache(session_manager: SessionManager):
+    """Удаление истекших сессий из кэша менеджера сессий"""
+    try:
+        while True:
+            await asyncio.sleep(settings.SESSION_CACHE_SWEEP_SECONDS)
+
+            removed = session_manager.sweep_expired_sessions()
+            if removed:
+                logger.debug(f"🧹 Из кэша удалено истекших сессий: {removed}")
+
+    except asyncio.CancelledError:
+        logger.info("⏹ Очистка кэша сессий остановлена")
+
+
 async def main():
     """Основная функция запуска бота"""
 
@@ -240,6 +273,9 @@ async def main():
 
     # Запуск фоновых задач
     background_task = asyncio.create_task(periodic_tasks(database))
+    health_task = asyncio.create_task(rcon_health.run())
+    watcher_task = asyncio.create_task(log_watcher.run())
+    sweeper_task = asyncio.create_task(sweep_session_cache(session_manager))
 
     # Запуск бота
     try:
@@ -258,11 +294,12 @@ async def main():
         logger.critical(f"💥 Критич еская ошибка при работе бота: {e}", exc_info=True)
     finally:
         # Остановка фоновых задач
-        background_task.cancel()
-        try:
-            await background_task
-        except asyncio.CancelledError:
-            pass
+        for task in (background_task, health_task, watcher_task, sweeper_task):
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
 
         # Закрытие соединений
         logger.info("🔌 Закрытие соединений...")
@@ -272,6 +309,9 @@ async def main():
         except Exception as e:
             logger.warning(f"⚠️  Ошибка при закрытии сессии бота: {e}")
 
+        rcon_pool.close_all()
+        log_parser.close()
+
         try:
             await database.close() if database else None
         except Exception as e:
@@ -0,0 +1,80 @@
+import sys
+import os
+import random
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from infrastructure.parsers.log_classifier import LogClock, classify_lines
+from infrastructure.parsers.log_tailer import LogTailer
+
+PLAYERS = [f"Player{i}" for i in range(200)]
+
+TEMPLATES = [
+    (50, "[{t}] [Server thread/INFO]: <{p}> hello there, anyone selling diamonds?"),
+    (20, "[{t}] [Server thread/INFO]: Saving chunks for level 'ServerLevel[world]'/minecraft:overworld"),
+    (8, "[{t}] [Server thread/INFO]: {p} joined the game"),
+    (8, "[{t}] [Server thread/INFO]: {p} lost connection: Disconnected"),
+    (5, "[{t}] [Server thread/INFO]: {p} issued server command: /home base"),
+    (4, "[{t}] [Server thread/WARN]: Can't keep up! Is the server overloaded? Running 2150ms behind, skipping 43 tick(s)"),
+    (3, "[{t}] [Server thread/WARN]: {p} moved too quickly! 12.3,0.0,4.1"),
+    (2, "[{t}] [Server thread/ERROR]: Encountered an unexpected exception"),
+]
+
+
+def generate_log(path: Path, size_mb: int):
+    """Синтетический latest.log заданного размера"""
+    weights = [weight for weight, _ in TEMPLATES]
+    templates = [template for _, template in TEMPLATES]
+    target = size_mb * 1024 * 1024
+    written = 0
+    second = 0
+
+    with open(path, 'w', encoding='utf-8') as f:
+        while written < target:
+            block = []
+            for template in random.choices(templates, weights, k=10000):
+                second += 1
+                t = f"{second // 3600 % 24:02d}:{second // 60 % 60:02d}:{second % 60:02d}"
+                block.append(template.format(t=t, p=random.choice(PLAYERS)))
+            text = "\n".join(block) + "\n"
+            f.write(text)
+            written += len(text.encode('utf-8'))
+
+
+def benchmark(size_mb: int):
+    print(f"🧪 Бенчмарк классификатора логов ({size_mb} МБ)")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        log_file = Path(temp_dir) / "latest.log"
+
+        started = time.perf_counter()
+        generate_log(log_file, size_mb)
+        print(f"📝 Лог создан за {time.perf_counter() - started:.1f} с")
+
+        size = log_file.stat().st_size
+        tailer = LogTailer(log_file)
+
+        started = time.perf_counter()
+        counts = Counter(event.type.value for event in classify_lines(tailer.read_lines(), LogClock()))
+        elapsed = time.perf_counter() - started
+
+    print(f"\n⚡ Обработано {size / 1024 / 1024:.1f} МБ за {elapsed:.2f} с")
+    print(f"   Скорость: {size / 1024 / 1024 / elapsed:.1f} МБ/с")
+    print("\n📊 События:")
+    for event_type, count in counts.most_common():
+        print(f"   {event_type}: {count}")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Бенчмарк классификатора логов Minecraft')
+    parser.add_argument('--size-mb', type=int, default=1024, help='Размер синтетического лога в МБ')
+
+    args = parser.parse_args()
+    benchmark(args.size_mb)
@@ -0,0 +1,123 @@
+# tests/fake_rcon_server.py
+"""
+Локальный RCON сервер для unit-тестов.
+
+Ведет себя как RCON поток Minecraft: читает пакет одним вызовом read
+не больше 1460 байт и разрывает соединение, если прочитано не ровно
+один пакет; отвечает на авторизацию, выполняет команды по очереди и режет
+длинные ответы на пакеты по 4096 байт.
+"""
+import asyncio
+import struct
+from typing import Callable, Dict, List, Optional
+
+AUTH = 3
+EXEC_COMMAND = 2
+AUTH_RESPONSE = 2
+RESPONSE_VALUE = 0
+MAX_PAYLOAD = 4096
+# Размер буфера чтения RconClient в Minecraft
+READ_SIZE = 1460
+
+
+class FakeRconServer:
+    """Минимальный RCON сервер на asyncio"""
+
+    def __init__(self, password: str = "secret",
+                 responses: Optional[Dict[str, str]] = None,
+                 delays: Optional[Dict[str, float]] = None):
+        self.password = password
+        self.responses = responses or {}
+        self.delays = delays or {}
+        self.handler: Optional[Callable[[str], str]] = None
+
+        self.host = "127.0.0.1"
+        self.port = 0
+        self.connections = 0
+        self.logins = 0
+        self.commands: List[str] = []
+        # Соединения, разорванные из-за нескольких пакетов в одном чтении
+        self.framing_errors = 0
+
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._writers: List[asyncio.StreamWriter] = []
+
+    async def start(self) -> "FakeRconServer":
+        self._server = await asyncio.start_server(self._handle_client, self.host, 0)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self):
+        self.drop_connections()
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+
+    def drop_connections(self):
+        """Разрывает все клиентские соединения (как при рестарте сервера)"""
+        for writer in self._writers:
+            writer.close()
+        self._writers.clear()
+
+    def respond(self, command: str) -> str:
+        if self.handler:
+            return self.handler(command)
+        if command in self.responses:
+            return self.responses[command]
+        if not command:
+            return "Unknown or incomplete command, see below for error"
+        return f"Executed: {command}"
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        self._writers.append(writer)
+        authenticated = False
+
+        try:
+            while True:
+                data = await reader.read(READ_SIZE)
+                if len(data) < 10:
+                    break
+                size = struct.unpack('<i', data[:4])[0]
+                if size != len(data) - 4:
+                    self.framing_errors += 1
+                    break
+                data = data[4:]
+                request_id, packet_type = struct.unpack('<ii', data[:8])
+                body = data[8:-2].decode('utf-8')
+
+                if packet_type == AUTH:
+                    if body == self.password:
+                        authenticated = True
+                        self.logins += 1
+                        self._send(writer, request_id, AUTH_RESPONSE, "")
+                    else:
+                        self._send(writer, -1, AUTH_RESPONSE, "")
+                elif not authenticated:
+                    self._send(writer, -1, AUTH_RESPONSE, "")
+                elif packet_type == EXEC_COMMAND:
+                    self.commands.append(body)
+                    delay = self.delays.get(body)
+                    if delay:
+                        await asyncio.sleep(delay)
+                    response = self.respond(body).encode('utf-8')
+                    chunks = [response[i:i + MAX_PAYLOAD]
+                              for i in range(0, len(response), MAX_PAYLOAD)] or [b""]
+                    for chunk in chunks:
+                        self._send_raw(writer, request_id, RESPONSE_VALUE, chunk)
+                else:
+                    self._send(writer, request_id, RESPONSE_VALUE, f"Unknown request {packet_type:x}")
+
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    def _send(self, writer: asyncio.StreamWriter, request_id: int, packet_type: int, body: str):
+        self._send_raw(writer, request_id, packet_type, body.encode('utf-8'))
+
+    @staticmethod
+    def _send_raw(writer: asyncio.StreamWriter, request_id: int, packet_type: int, payload: bytes):
+        packet = struct.pack('<ii', request_id, packet_type) + payload + b'\x00\x00'
+        writer.write(struct.pack('<i', len(packet)) + packet)
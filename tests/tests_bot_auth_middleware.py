@@ -0,0 +1,65 @@
+import unittest
+from contextlib import nullcontext
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+from aiogram.types import CallbackQuery, Message
+
+from bot.middlewares.auth_middleware import AuthMiddleware
+
+
+def make_message(user_id: int, text: str = "привет") -> Message:
+    message = MagicMock(spec=Message)
+    message.from_user = SimpleNamespace(id=user_id)
+    message.text = text
+    message.answer = AsyncMock()
+    return message
+
+
+class TestAuthMiddleware(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.session_manager = SimpleNamespace(
+            is_authorized=AsyncMock(return_value=False),
+            request_scope=nullcontext
+        )
+        self.middleware = AuthMiddleware(self.session_manager, notice_interval=60)
+        self.handler = AsyncMock()
+
+    async def test_notice_rate_limited(self):
+        """Тест что неавторизованный получает одно напоминание на интервал"""
+        message = make_message(1)
+        for _ in range(5):
+            await self.middleware(self.handler, message, {})
+
+        self.assertEqual(message.answer.await_count, 1)
+        self.assertEqual(self.middleware.suppressed, 4)
+        self.handler.assert_not_awaited()
+
+        # Другой пользователь получает свое напоминание
+        other = make_message(2)
+        await self.middleware(self.handler, other, {})
+        self.assertEqual(other.answer.await_count, 1)
+
+    async def test_suppressed_callback_is_still_answered(self):
+        """Тест что callback отвечается без алерта, когда напоминание подавлено"""
+        callback = MagicMock(spec=CallbackQuery)
+        callback.from_user = SimpleNamespace(id=1)
+        callback.data = "refresh_monitor"
+        callback.answer = AsyncMock()
+
+        await self.middleware(self.handler, callback, {})
+        await self.middleware(self.handler, callback, {})
+
+        self.assertEqual(callback.answer.await_args_list[0].kwargs, {"show_alert": True})
+        self.assertEqual(callback.answer.await_args_list[1].args, ())
+
+    async def test_authorized_passes(self):
+        """Тест что авторизованный пользователь проходит к обработчику"""
+        self.session_manager.is_authorized.return_value = True
+        await self.middleware(self.handler, make_message(1), {})
+        self.handler.assert_awaited_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
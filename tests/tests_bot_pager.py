@@ -0,0 +1,71 @@
+import unittest
+from unittest.mock import AsyncMock
+
+from bot.utils.pager import paginate, send_paged, TELEGRAM_MESSAGE_LIMIT
+
+
+async def stream(*fragments: str):
+    for fragment in fragments:
+        yield fragment
+
+
+class TestPager(unittest.IsolatedAsyncioTestCase):
+
+    async def test_pages_cut_on_lines(self):
+        """Тест что страницы режутся по строкам и не превышают размер"""
+        lines = [f"line {i}" for i in range(100)]
+        text = "\n".join(lines)
+        fragments = [text[i:i + 37] for i in range(0, len(text), 37)]
+
+        pages = [page async for page in paginate(stream(*fragments), page_size=100)]
+
+        self.assertTrue(all(len(page) <= 100 for page in pages))
+        self.assertEqual("\n".join(pages).split("\n"), lines)
+
+    async def test_long_line_is_split(self):
+        """Тест строки длиннее страницы"""
+        pages = [page async for page in paginate(stream("x" * 250), page_size=100)]
+        self.assertEqual([len(page) for page in pages], [100, 100, 50])
+
+    async def test_send_paged_respects_telegram_limit(self):
+        """Тест что сообщения не превышают лимит Telegram"""
+        message = AsyncMock()
+        header = "✅ Команда выполнена"
+
+        pages = await send_paged(message, stream("a" * 5000, "\n", "b" * 5000), header)
+
+        texts = [call.args[0] for call in message.answer.call_args_list]
+        self.assertEqual(len(texts), pages)
+        self.assertTrue(texts[0].startswith(header))
+        self.assertTrue(all(len(text) <= TELEGRAM_MESSAGE_LIMIT for text in texts))
+
+    async def test_send_paged_caps_page_count(self):
+        """Тест что длинный ответ обрезается с пометкой, а поток закрывается"""
+        message = AsyncMock()
+        closed = []
+
+        async def endless():
+            try:
+                while True:
+                    yield "Player was banned\n" * 100
+            finally:
+                closed.append(True)
+
+        pages = await send_paged(message, endless(), "✅ Список банов", max_pages=3)
+
+        texts = [call.args[0] for call in message.answer.call_args_list]
+        self.assertEqual(pages, 3)
+        self.assertEqual(len(texts), 4)
+        self.assertIn("обрезан", texts[-1])
+        self.assertEqual(closed, [True])
+
+    async def test_send_paged_empty_response(self):
+        """Тест пустого ответа - отправляется только заголовок"""
+        message = AsyncMock()
+
+        self.assertEqual(await send_paged(message, stream(), "✅ Мир сохранен"), 0)
+        message.answer.assert_awaited_once_with("✅ Мир сохранен", parse_mode="Markdown")
+
+
+if __name__ == '__main__':
+    unittest.main()
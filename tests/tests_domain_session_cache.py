@@ -0,0 +1,139 @@
+import unittest
+from datetime import datetime, timedelta
+
+from domain.services.session_cache import CachedSession, NegativeCache, SessionCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = datetime(2024, 5, 1, 12, 0, 0)
+
+    def __call__(self) -> datetime:
+        return self.now
+
+    def advance(self, **kwargs):
+        self.now += timedelta(**kwargs)
+
+
+class TestSessionCache(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.cache = SessionCache(max_size=3, clock=self.clock)
+
+    def make_session(self, user_id: int, minutes: int = 60) -> CachedSession:
+        return CachedSession(user_id, user_id * 10, "localhost", 25575,
+                             self.clock.now + timedelta(minutes=minutes))
+
+    def test_hits_and_misses(self):
+        """Тест счетчиков попаданий и промахов"""
+        self.cache.put(self.make_session(1))
+
+        self.assertEqual(self.cache.get(1).server_id, 10)
+        self.assertIsNone(self.cache.get(2))
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+    def test_lru_eviction(self):
+        """Тест вытеснения давно не использованной сессии"""
+        for user_id in (1, 2, 3):
+            self.cache.put(self.make_session(user_id))
+        self.cache.get(1)
+        self.cache.put(self.make_session(4))
+
+        self.assertNotIn(2, self.cache)
+        self.assertEqual(len(self.cache), 3)
+        self.assertEqual(self.cache.evictions, 1)
+
+    def test_sweep_removes_only_expired(self):
+        """Тест фоновой очистки истекших сессий"""
+        self.cache.put(self.make_session(1, minutes=5))
+        self.cache.put(self.make_session(2, minutes=30))
+        self.cache.put(self.make_session(3, minutes=5))
+        # Продленная сессия: старая запись в куче больше не действует
+        self.cache.put(self.make_session(3, minutes=90))
+
+        self.clock.advance(minutes=10)
+        self.assertEqual(self.cache.sweep(), 1)
+        self.assertEqual(sorted(self.cache._entries), [2, 3])
+
+        self.clock.advance(minutes=100)
+        self.assertEqual(self.cache.sweep(), 2)
+        self.assertEqual(len(self.cache), 0)
+        self.assertEqual(self.cache.get_stats()["expired"], 3)
+
+    def test_expired_entry_is_miss(self):
+        """Тест что истекшая сессия не возвращается до очистки"""
+        self.cache.put(self.make_session(1, minutes=1))
+        self.clock.advance(minutes=2)
+
+        self.assertIsNone(self.cache.get(1))
+        self.assertEqual(len(self.cache), 0)
+
+    def test_heap_is_compacted(self):
+        """Тест что куча не растет от повторных продлений"""
+        cache = SessionCache(max_size=10, clock=self.clock)
+        for _ in range(1000):
+            cache.put(self.make_session(1))
+
+        self.assertLessEqual(len(cache._expiry), 2 * len(cache) + 65)
+
+    def test_removed_sessions_are_wiped(self):
+        """Тест что вытесненная и истекшая сессии забывают клиента"""
+        evicted = self.make_session(1)
+        evicted.rcon_client = object()
+        expired = self.make_session(2, minutes=1)
+        expired.rcon_client = object()
+
+        self.cache.put(evicted)
+        self.cache.put(expired)
+        for user_id in (3, 4, 5):
+            self.cache.put(self.make_session(user_id))
+        self.assertIsNone(evicted.rcon_client)
+
+        self.cache = SessionCache(max_size=3, clock=self.clock)
+        self.cache.put(expired)
+        self.clock.advance(minutes=2)
+        self.cache.sweep()
+        self.assertIsNone(expired.rcon_client)
+
+    def test_remove(self):
+        """Тест удаления сессии при выходе"""
+        self.cache.put(self.make_session(1))
+        self.cache.remove(1)
+        self.cache.remove(1)
+
+        self.assertIsNone(self.cache.get(1))
+        self.clock.advance(hours=2)
+        self.assertEqual(self.cache.sweep(), 0)
+
+
+
+class TestNegativeCache(unittest.TestCase):
+
+    def test_ttl_and_discard(self):
+        """Тест истечения и снятия отрицательной записи"""
+        now = [0.0]
+        cache = NegativeCache(ttl=30, clock=lambda: now[0])
+        cache.add(1)
+        cache.add(2)
+
+        self.assertIn(1, cache)
+        cache.discard(1)
+        self.assertNotIn(1, cache)
+
+        now[0] = 31
+        self.assertNotIn(2, cache)
+        self.assertEqual((len(cache), cache.hits), (0, 1))
+
+    def test_bounded(self):
+        """Тест ограничения размера"""
+        cache = NegativeCache(ttl=30, max_size=2)
+        for user_id in (1, 2, 3):
+            cache.add(user_id)
+
+        self.assertEqual(len(cache), 2)
+        self.assertNotIn(1, cache)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,178 @@
+import unittest
+from contextlib import asynccontextmanager
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+from domain.services.session_manager import SessionManager
+
+
+class FakeDatabase:
+    """БД в памяти: считает открытые сессии БД"""
+
+    def __init__(self):
+        self.scopes = 0
+        self.active = {}
+        self.sessions = SimpleNamespace(
+            get_active_session_with_server=AsyncMock(side_effect=lambda user_id: self.active.get(user_id)),
+            create_session=AsyncMock(side_effect=self._create_session),
+            delete_user_session=AsyncMock(return_value=True),
+        )
+        self.server = SimpleNamespace(id=1, host="localhost", port=25575,
+                                      encrypted_password=b"secret", name="localhost:25575")
+        self.servers = SimpleNamespace(save_server=AsyncMock(return_value=self.server))
+
+    async def _create_session(self, user_id, server_id, duration_hours):
+        # Как в SessionRepository: время в UTC без часового пояса
+        self.active[user_id] = SimpleNamespace(
+            server_id=server_id, server=self.server,
+            expires_at=datetime.now(timezone.utc).replace(tzinfo=None) + timedelta(hours=duration_hours)
+        )
+        return self.active[user_id]
+
+    @asynccontextmanager
+    async def session_scope(self):
+        self.scopes += 1
+        yield {'sessions': self.sessions, 'servers': self.servers}
+
+
+class TestSessionManagerNegativeCache(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.database = FakeDatabase()
+        self.manager = SessionManager(self.database, negative_ttl=60)
+
+    async def test_unauthorized_flood_hits_database_once(self):
+        """Тест что повторные проверки без сессии не ходят в БД"""
+        for _ in range(100):
+            self.assertFalse(await self.manager.is_authorized(42))
+
+        self.assertEqual(self.database.scopes, 1)
+        self.assertIsNone(await self.manager.get_session(42))
+        self.assertEqual(self.database.scopes, 1)
+
+    async def test_create_session_invalidates(self):
+        """Тест что создание сессии снимает отрицательную запись"""
+        self.assertFalse(await self.manager.is_authorized(42))
+
+        with patch("infrastructure.adapters.rcon_client.RconClientAdapter.test_connection",
+                   AsyncMock(return_value=(True, None))):
+            self.assertTrue(await self.manager.create_session(42, "localhost", 25575, "secret"))
+
+        self.assertTrue(await self.manager.is_authorized(42))
+        self.assertEqual(len(self.manager.unauthorized), 0)
+
+
+
+class TestSessionManagerRequestScope(unittest.IsolatedAsyncioTestCase):
+
+    async def test_one_query_per_request(self):
+        """Тест что проверка и получение сервера в одном обновлении читают БД один раз"""
+        database = FakeDatabase()
+        await database._create_session(7, 1, 6)
+        manager = SessionManager(database)
+
+        with manager.request_scope():
+            self.assertTrue(await manager.is_authorized(7))
+            server = await manager.get_server(7)
+            session = await manager.get_session(7)
+
+        self.assertEqual(server["encrypted_password"], b"secret")
+        self.assertEqual((session.server_host, session.server_port), ("localhost", 25575))
+        self.assertEqual(database.scopes, 1)
+
+        # Вне области каждый вызов get_server читает БД заново
+        await manager.get_server(7)
+        await manager.get_server(7)
+        self.assertEqual(database.scopes, 3)
+
+
+
+class TestSessionManagerRconClient(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.database = FakeDatabase()
+        self.manager = SessionManager(self.database)
+        self.database.server.encrypted_password = self.manager.crypto.encrypt("secret")
+        await self.database._create_session(7, 1, 6)
+
+    async def test_client_cached_for_session(self):
+        """Тест что поток команд не ходит в БД и не расшифровывает пароль"""
+        with patch.object(self.manager.crypto, "decrypt", wraps=self.manager.crypto.decrypt) as decrypt:
+            clients = [await self.manager.get_rcon_client(7) for _ in range(10)]
+
+        self.assertTrue(all(client is clients[0] for client in clients))
+        self.assertEqual(clients[0].password, "secret")
+        self.assertEqual(decrypt.call_count, 1)
+        self.assertEqual(self.database.scopes, 1)
+
+        # Другие обращения к БД не теряют готового клиента
+        await self.manager.get_server(7)
+        self.assertIs(await self.manager.get_rcon_client(7), clients[0])
+
+    async def test_end_session_wipes_client(self):
+        """Тест что выход забывает клиента с паролем"""
+        await self.manager.get_rcon_client(7)
+        session = self.manager.cache.peek(7)
+
+        await self.manager.end_session(7)
+
+        self.assertIsNone(session.rcon_client)
+        self.assertIsNone(self.manager.cache.peek(7))
+
+
+class TestSessionManagerTimezone(unittest.IsolatedAsyncioTestCase):
+    """Сроки сессий в БД хранятся в UTC; кэш не должен зависеть от часового пояса бота"""
+
+    def _set_timezone(self, name: str):
+        previous = os.environ.get("TZ")
+
+        def restore():
+            if previous is None:
+                os.environ.pop("TZ", None)
+            else:
+                os.environ["TZ"] = previous
+            time.tzset()
+
+        os.environ["TZ"] = name
+        time.tzset()
+        self.addCleanup(restore)
+
+    async def asyncSetUp(self):
+        self.database = FakeDatabase()
+        self.manager = SessionManager(self.database)
+
+    async def test_session_cached_until_expiry_east_of_utc(self):
+        """Тест что в UTC+10 сессия за час до истечения берется из кэша"""
+        self._set_timezone("Asia/Vladivostok")
+        self.database.active[7] = SimpleNamespace(
+            server_id=1, server=self.database.server,
+            expires_at=datetime.now(timezone.utc).replace(tzinfo=None) + timedelta(hours=1)
+        )
+
+        for _ in range(5):
+            self.assertTrue(await self.manager.is_authorized(7))
+
+        self.assertEqual(self.database.scopes, 1)
+        self.assertEqual(await self.manager.get_remaining_time(7), "0ч 59м")
+
+    async def test_expired_session_not_cached_west_of_utc(self):
+        """Тест что в UTC-10 истекшая по БД сессия не остается в кэше"""
+        self._set_timezone("Pacific/Honolulu")
+        with patch("infrastructure.adapters.rcon_client.RconClientAdapter.test_connection",
+                   AsyncMock(return_value=(True, None))):
+            self.assertTrue(await self.manager.create_session(7, "localhost", 25575, "secret"))
+
+        session = self.manager.cache.peek(7)
+        self.assertEqual(session.expires_at, self.database.active[7].expires_at)
+
+        # Сессия истекла час назад по часам БД
+        session.expires_at = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(hours=1)
+        self.assertIsNone(self.manager.cache.get(7))
+        self.assertEqual(self.manager.sweep_expired_sessions(), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
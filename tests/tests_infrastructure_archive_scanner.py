@@ -0,0 +1,126 @@
+import asyncio
+import gzip
+import multiprocessing
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from infrastructure.parsers.archive_scanner import ParallelArchiveScanner
+from infrastructure.parsers.log_archive_index import LogArchiveIndex
+
+
+class TestParallelArchiveScanner(unittest.IsolatedAsyncioTestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.temp_dir = tempfile.TemporaryDirectory()
+        cls.log_dir = Path(cls.temp_dir.name)
+
+        for day in range(1, 7):
+            with gzip.open(cls.log_dir / f"2024-01-0{day}-1.log.gz", 'wt', encoding='utf-8') as f:
+                for i in range(2000):
+                    player = "Steve" if i % 2 else "Alex"
+                    f.write(f"[{i // 100 % 24:02d}:00:00] [Server thread/INFO]: <{player}> day {day} message {i}\n")
+
+        cls.scanner = ParallelArchiveScanner(max_workers=2)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.scanner.shutdown()
+        cls.temp_dir.cleanup()
+
+    def setUp(self):
+        self.index = LogArchiveIndex(self.log_dir)
+        self.index.update()
+
+    def tearDown(self):
+        self.index.close()
+
+    def test_same_results_as_sequential_search(self):
+        """Тест что параллельный поиск дает те же результаты в том же порядке"""
+        for limit in (5, 3000, 100000):
+            with self.subTest(limit=limit):
+                expected = self.index.search(r"message \d+5\b", limit=limit, regex=True)
+                actual = self.scanner.search(self.index, r"message \d+5\b", limit=limit, regex=True)
+                self.assertEqual(actual, expected)
+
+        self.assertEqual(actual[0].date, "2024-01-06")
+
+    def test_filters(self):
+        """Тест фильтров по датам и часам"""
+        matches = self.scanner.search(self.index, "message", limit=100000,
+                                      date_from="2024-01-05", hours=[3])
+        self.assertEqual(len(matches), 2 * 100)
+        self.assertTrue(all(match.line.startswith("[03:") for match in matches))
+
+    def _slow_index(self) -> LogArchiveIndex:
+        """Индекс архива со строкой, на которой (a|a)+b перебирает 2^40 вариантов"""
+        slow_dir = self.log_dir / "slow"
+        slow_dir.mkdir(exist_ok=True)
+        with gzip.open(slow_dir / "2024-02-01-1.log.gz", 'wt', encoding='utf-8') as f:
+            f.write("[10:00:00] [Server thread/INFO]: <Alex> " + "a" * 40 + "\n")
+
+        index = LogArchiveIndex(slow_dir)
+        index.update()
+        self.addCleanup(index.close)
+        return index
+
+    def test_catastrophic_regex_is_stopped(self):
+        """Тест что зависший на шаблоне воркер завершается, а общий пул не занят"""
+        index = self._slow_index()
+        started = time.monotonic()
+
+        matches = self.scanner.search(index, r"(a|a)+b", time_budget=0.5, regex=True)
+
+        self.assertEqual(matches, [])
+        self.assertTrue(matches.truncated)
+        self.assertLess(time.monotonic() - started, 5)
+        self.assertEqual(len(self.scanner.search(self.index, "message", limit=3)), 3)
+        self.assertLessEqual(len(multiprocessing.active_children()), 2)
+
+    async def test_async_catastrophic_regex_is_stopped(self):
+        """Тест ограничения времени при поиске без блокировки event loop"""
+        index = self._slow_index()
+        started = time.monotonic()
+
+        matches = await self.scanner.search_async(index, r"(a|a)+b", time_budget=0.5, regex=True)
+
+        self.assertEqual(matches, [])
+        self.assertTrue(matches.truncated)
+        self.assertLess(time.monotonic() - started, 5)
+
+    def test_processes_are_reused(self):
+        """Тест что поиски идут в одних и тех же процессах, не больше max_workers"""
+        self.scanner.search(self.index, "message", limit=100000)
+        before = {process.pid for process in multiprocessing.active_children()}
+
+        matches = self.scanner.search(self.index, r"message \d+5\b", limit=100000, regex=True)
+
+        after = {process.pid for process in multiprocessing.active_children()}
+        self.assertFalse(matches.truncated)
+        self.assertLessEqual(before, after)
+        self.assertLessEqual(len(after), 2)
+
+    async def test_event_loop_stays_responsive(self):
+        """Тест что поиск не блокирует event loop"""
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.001)
+                ticks += 1
+
+        ticker_task = asyncio.create_task(ticker())
+        try:
+            matches = await self.scanner.search_async(self.index, "message", limit=100000)
+        finally:
+            ticker_task.cancel()
+
+        self.assertEqual(len(matches), 6 * 2000)
+        self.assertGreater(ticks, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+import asyncio
+import gzip
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from infrastructure.parsers.async_log_parser import AsyncLogParser
+
+
+class TestAsyncLogParser(unittest.IsolatedAsyncioTestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.temp_dir = tempfile.TemporaryDirectory()
+        lines = []
+        for i in range(300000):
+            player = f"Player{i % 500}"
+            if i % 3 == 0:
+                lines.append(f"[10:{i // 60 % 60:02d}:{i % 60:02d}] [Server thread/INFO]: {player} joined the game")
+            elif i % 3 == 1:
+                lines.append(f"[10:{i // 60 % 60:02d}:{i % 60:02d}] [Server thread/INFO]: <{player}> hello {i}")
+            else:
+                lines.append(f"[10:{i // 60 % 60:02d}:{i % 60:02d}] [Server thread/WARN]: {player} moved too quickly!")
+        (Path(cls.temp_dir.name) / "latest.log").write_text("\n".join(lines) + "\n", encoding='utf-8')
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.temp_dir.cleanup()
+
+    def setUp(self):
+        self.parser = AsyncLogParser(self.temp_dir.name, max_workers=2, timeout=30)
+
+    def tearDown(self):
+        self.parser.close()
+
+    async def test_event_loop_latency_during_parse(self):
+        """Тест что большой разбор лога не замораживает event loop"""
+        max_lag = 0.0
+        ticks = 0
+
+        async def ticker():
+            nonlocal max_lag, ticks
+            while True:
+                started = time.perf_counter()
+                await asyncio.sleep(0.005)
+                max_lag = max(max_lag, time.perf_counter() - started - 0.005)
+                ticks += 1
+
+        ticker_task = asyncio.create_task(ticker())
+        try:
+            started = time.perf_counter()
+            stats = await self.parser.parse_server_stats()
+            elapsed = time.perf_counter() - started
+        finally:
+            ticker_task.cancel()
+
+        self.assertEqual(stats['total_players'], 500)
+        self.assertEqual(stats['warnings_count'], 100000)
+        # Разбор длится заметное время, а цикл продолжает обслуживать задачи
+        self.assertGreater(ticks, 10)
+        self.assertLess(max_lag, max(0.1, elapsed / 4))
+
+    async def test_timeout_cancels_search(self):
+        """Тест таймаута поиска"""
+        with self.assertRaises(asyncio.TimeoutError):
+            await self.parser.search_logs(r"hello \d+", limit=100000, timeout=0)
+
+        # Поиск в потоке остановлен, пул свободен для новых вызовов
+        players = await asyncio.wait_for(self.parser.parse_online_players(), timeout=30)
+        self.assertEqual(len(players), 500)
+
+    async def test_archive_search_timeout(self):
+        """Тест что поиск по архивам ограничен таймаутом вызова"""
+        with gzip.open(Path(self.temp_dir.name) / "2024-01-01-1.log.gz", 'wt', encoding='utf-8') as f:
+            f.write("[10:00:00] [Server thread/INFO]: <Alex> " + "a" * 40 + "\n")
+        self.addCleanup((Path(self.temp_dir.name) / "2024-01-01-1.log.gz").unlink)
+
+        started = time.monotonic()
+        with self.assertRaises(asyncio.TimeoutError):
+            await self.parser.search_archives(r"(a|a)+b", regex=True, timeout=1)
+
+        self.assertLess(time.monotonic() - started, 5)
+
+    async def test_concurrent_calls_share_state(self):
+        """Тест одновременных вызовов, меняющих состояние"""
+        stats, players = await asyncio.gather(
+            self.parser.parse_server_stats(),
+            self.parser.parse_online_players()
+        )
+        self.assertEqual(stats['online_players'], len(players))
+
+
+if __name__ == '__main__':
+    unittest.main()
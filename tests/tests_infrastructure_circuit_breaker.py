@@ -0,0 +1,118 @@
+import unittest
+
+from infrastructure.adapters.circuit_breaker import (
+    CircuitBreaker, CircuitOpenError, CircuitState, backoff_delay
+)
+from infrastructure.adapters.server_registry import ServerRegistry
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestCircuitBreaker(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.breaker = CircuitBreaker(
+            "localhost", 25575,
+            failure_threshold=3, open_seconds=10, max_open_seconds=100,
+            probe_timeout=5, clock=self.clock
+        )
+
+    def _fail(self, times: int):
+        for _ in range(times):
+            self.breaker.before_call()
+            self.breaker.record_failure()
+
+    def test_opens_after_threshold(self):
+        """Тест открытия после серии ошибок"""
+        self._fail(2)
+        self.assertEqual(self.breaker.state, CircuitState.CLOSED)
+
+        self._fail(1)
+        self.assertEqual(self.breaker.state, CircuitState.OPEN)
+
+        with self.assertRaises(CircuitOpenError) as context:
+            self.breaker.before_call()
+        self.assertGreater(context.exception.retry_after, 0)
+
+    def test_success_resets_failures(self):
+        """Тест что успешная команда сбрасывает счетчик"""
+        self._fail(2)
+        self.breaker.record_success()
+        self._fail(2)
+        self.assertEqual(self.breaker.state, CircuitState.CLOSED)
+
+    def test_half_open_single_probe(self):
+        """Тест что после паузы пропускается только один пробный запрос"""
+        self._fail(3)
+        self.clock.now += 10
+
+        self.breaker.before_call()
+        self.assertEqual(self.breaker.state, CircuitState.HALF_OPEN)
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.before_call()
+
+        # Зависшая проба не блокирует сервер навсегда
+        self.clock.now += 5
+        self.breaker.before_call()
+
+        self.breaker.record_success()
+        self.assertEqual(self.breaker.state, CircuitState.CLOSED)
+
+    def test_abandoned_probe_frees_slot(self):
+        """Тест что прерванная проба сразу пропускает следующую"""
+        self._fail(3)
+        self.clock.now += 10
+        self.breaker.before_call()
+
+        self.breaker.record_abandoned()
+
+        self.breaker.before_call()
+        self.assertEqual(self.breaker.state, CircuitState.HALF_OPEN)
+        self.assertEqual(self.breaker.failures, 3)
+
+    def test_failed_probe_backs_off_exponentially(self):
+        """Тест что неудачная проба открывает предохранитель на больший срок"""
+        self._fail(3)
+        self.assertLessEqual(self.breaker.retry_after, 10)
+
+        self.clock.now += 10
+        self.breaker.before_call()
+        self.breaker.record_failure()
+
+        self.assertEqual(self.breaker.state, CircuitState.OPEN)
+        self.assertGreaterEqual(self.breaker.retry_after, 10)
+        self.assertLessEqual(self.breaker.retry_after, 20)
+
+    def test_snapshot(self):
+        """Тест состояния для статуса сервера"""
+        self.assertEqual(self.breaker.snapshot(), {"state": "closed", "failures": 0, "retry_after": 0.0})
+
+
+class TestBackoff(unittest.TestCase):
+
+    def test_backoff_bounds(self):
+        """Тест границ задержки с джиттером"""
+        for attempt, (low, high) in enumerate([(0.5, 1), (1, 2), (2, 4), (2.5, 5), (2.5, 5)]):
+            with self.subTest(attempt=attempt):
+                for _ in range(50):
+                    delay = backoff_delay(attempt, base=1, cap=5)
+                    self.assertGreaterEqual(delay, low)
+                    self.assertLessEqual(delay, high)
+
+    def test_registry_shares_breakers(self):
+        """Тест что предохранитель общий для всех клиентов сервера"""
+        registry = ServerRegistry(CircuitBreaker, failure_threshold=1)
+        self.assertIs(registry.get("localhost", 25575), registry.get("localhost", 25575))
+        self.assertIsNot(registry.get("localhost", 25575), registry.get("localhost", 25576))
+        self.assertEqual(registry.get("localhost", 25576).failure_threshold, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
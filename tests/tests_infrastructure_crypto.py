@@ -0,0 +1,40 @@
+import time
+import unittest
+
+from infrastructure.adapters import crypto
+from infrastructure.adapters.crypto import CryptoService, get_crypto_service
+
+
+class TestCryptoService(unittest.TestCase):
+
+    def test_key_derived_once_per_secret(self):
+        """Тест что PBKDF2 выполняется один раз на секрет"""
+        secret = f"secret-{time.time_ns()}"
+        first = CryptoService(secret)
+        misses = crypto._derive_key.cache_info().misses
+
+        started = time.perf_counter()
+        second = CryptoService(secret)
+        elapsed = time.perf_counter() - started
+
+        self.assertEqual(crypto._derive_key.cache_info().misses, misses)
+        self.assertLess(elapsed, first.timings['total_ms'] / 1000)
+        # Ключ тот же - второй экземпляр расшифровывает данные первого
+        self.assertEqual(second.decrypt(first.encrypt("password")), "password")
+
+    def test_timings_reported(self):
+        """Тест записи времени инициализации"""
+        service = CryptoService(f"secret-{time.time_ns()}")
+        self.assertGreater(service.timings['derive_ms'], 0)
+        self.assertGreaterEqual(service.timings['total_ms'], service.timings['derive_ms'])
+        self.assertIn('self_test_ms', service.timings)
+
+    def test_shared_service(self):
+        """Тест общего экземпляра процесса"""
+        service = get_crypto_service()
+        self.assertIs(get_crypto_service(), service)
+        self.assertEqual(service.decrypt(service.encrypt("secret")), "secret")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from sqlalchemy import event
+
+from infrastructure.adapters.database import Database
+
+
+class TestSessionRepository(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.database = Database(f"sqlite+aiosqlite:///{Path(self.temp_dir.name) / 'bot.db'}")
+        await self.database.initialize()
+
+        async with self.database.session_scope() as repos:
+            server = await repos['servers'].save_server(1, "localhost", 25575, b"encrypted", "localhost:25575")
+            await repos['sessions'].create_session(1, server.id)
+            await repos['raw'].commit()
+
+    async def asyncTearDown(self):
+        await self.database.close()
+        self.temp_dir.cleanup()
+
+    async def test_session_with_server_in_one_select(self):
+        """Тест что сессия и сервер загружаются одним SELECT"""
+        selects = []
+
+        def count_selects(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith("SELECT"):
+                selects.append(statement)
+
+        engine = self.database.connection.engine.sync_engine
+        event.listen(engine, "before_cursor_execute", count_selects)
+        try:
+            async with self.database.session_scope() as repos:
+                session = await repos['sessions'].get_active_session_with_server(1)
+                server = session.server
+        finally:
+            event.remove(engine, "before_cursor_execute", count_selects)
+
+        self.assertEqual((server.host, server.port, server.encrypted_password), ("localhost", 25575, b"encrypted"))
+        self.assertEqual(len(selects), 1)
+        self.assertIn("JOIN", selects[0].upper())
+
+    async def test_no_session(self):
+        """Тест пользователя без сессии"""
+        async with self.database.session_scope() as repos:
+            self.assertIsNone(await repos['sessions'].get_active_session_with_server(2))
+
+
+if __name__ == '__main__':
+    unittest.main()
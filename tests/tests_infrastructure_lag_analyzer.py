@@ -0,0 +1,67 @@
+import random
+import unittest
+
+from infrastructure.parsers.lag_analyzer import LAG_BUCKETS, LagAnalyzer, LagWindow
+
+
+class TestLagWindow(unittest.TestCase):
+
+    def test_single_value_is_exact(self):
+        """Тест что одно значение возвращается без погрешности корзин"""
+        window = LagWindow(0)
+        window.add(2000, 40, 3)
+
+        summary = window.summary()
+        self.assertEqual((summary['p50_ms'], summary['p95_ms'], summary['max_ms']), (2000, 2000, 2000))
+        self.assertEqual((summary['skipped_ticks'], summary['max_players']), (40, 3))
+
+    def test_percentiles_within_bucket_error(self):
+        """Тест точности перцентилей по гистограмме"""
+        rng = random.Random(7)
+        values = [rng.randint(2000, 30000) for _ in range(5000)]
+        window = LagWindow(0)
+        for value in values:
+            window.add(value)
+
+        values.sort()
+        for q in (0.5, 0.95):
+            exact = values[round(q * len(values)) - 1]
+            self.assertLessEqual(abs(window.percentile(q) - exact), exact * 0.25)
+        self.assertEqual(window.percentile(1.0), max(values))
+
+    def test_memory_does_not_grow(self):
+        """Тест что окно хранит фиксированное число корзин"""
+        window = LagWindow(0)
+        for value in range(100000):
+            window.add(value)
+        self.assertEqual(len(window.buckets), len(LAG_BUCKETS) + 1)
+
+
+class TestLagAnalyzer(unittest.TestCase):
+
+    def test_windows_split_by_five_minutes(self):
+        """Тест разбиения на пятиминутные окна"""
+        analyzer = LagAnalyzer()
+        analyzer.add("14:35:10", 2000, 40, 3)
+        analyzer.add("14:39:59", 4000, 80, 5)
+        analyzer.add("14:40:00", 3000, 60, 2)
+
+        windows = analyzer.window_summaries()
+        self.assertEqual([window['window'] for window in windows], ["14:35", "14:40"])
+        self.assertEqual([window['count'] for window in windows], [2, 1])
+        self.assertEqual(windows[0]['max_players'], 5)
+        self.assertEqual(analyzer.summary()['max_ms'], 4000)
+
+    def test_midnight_and_window_limit(self):
+        """Тест перехода через полночь и ограничения числа окон"""
+        analyzer = LagAnalyzer(max_windows=2)
+        analyzer.add("23:58:00", 2000)
+        analyzer.add("00:01:00", 2000)
+        analyzer.add("00:06:00", 2000, None)
+
+        self.assertEqual([window['window'] for window in analyzer.window_summaries()], ["00:00", "00:05"])
+        self.assertEqual(analyzer.total_count, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
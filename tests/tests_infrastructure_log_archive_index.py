@@ -0,0 +1,90 @@
+import gzip
+import tempfile
+import unittest
+from pathlib import Path
+
+from infrastructure.parsers.log_archive_index import LogArchiveIndex
+
+ARCHIVES = {
+    "2024-01-01-1.log.gz": (
+        "[10:00:00] [Server thread/INFO]: Done (3.2s)! For help, type \"help\"\n"
+        "[10:05:00] [Server thread/INFO]: Steve joined the game\n"
+        "[11:10:00] [Server thread/WARN]: Can't keep up! Is the server overloaded? Running 2000ms behind\n"
+        "[11:20:00] [Server thread/INFO]: <Steve> where are the diamonds\n"
+        "[12:00:00] [Server thread/ERROR]: Exception in thread \"Server thread\"\n"
+        "\tat net.minecraft.server.MinecraftServer.run(MinecraftServer.java:100)\n"
+    ),
+    "2024-01-02-1.log.gz": (
+        "[09:00:00] [Server thread/INFO]: Alex joined the game\n"
+        "[09:30:00] [Server thread/INFO]: <Alex> diamonds here\n"
+    ),
+    "2024-01-02-2.log.gz": (
+        "[20:00:00] [Server thread/INFO]: Steve joined the game\n"
+        "[21:00:00] [Server thread/INFO]: Steve left the game\n"
+    ),
+}
+
+
+class TestLogArchiveIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.log_dir = Path(self.temp_dir.name)
+        for name, content in ARCHIVES.items():
+            self._write(name, content)
+        self.index = LogArchiveIndex(self.log_dir)
+
+    def tearDown(self):
+        self.index.close()
+        self.temp_dir.cleanup()
+
+    def _write(self, name: str, content: str):
+        with gzip.open(self.log_dir / name, 'wt', encoding='utf-8') as f:
+            f.write(content)
+
+    def test_file_summary(self):
+        """Тест сводки по архиву"""
+        self.assertEqual(self.index.update(), 3)
+
+        summary = self.index.file_summary("2024-01-01-1.log.gz")
+
+        self.assertEqual((summary["first_time"], summary["last_time"]), ("10:00:00", "12:00:00"))
+        self.assertEqual(summary["levels"], {"INFO": 3, "WARN": 1, "ERROR": 1})
+        self.assertEqual(summary["players"], ["Steve"])
+
+    def test_update_is_incremental(self):
+        """Тест что неизмененные архивы не индексируются повторно"""
+        self.index.update()
+        self.assertEqual(self.index.update(), 0)
+
+        self._write("2024-01-03-1.log.gz", "[08:00:00] [Server thread/INFO]: Notch joined the game\n")
+        (self.log_dir / "2024-01-02-1.log.gz").unlink()
+
+        self.assertEqual(self.index.update(), 1)
+        self.assertEqual(self.index.last_join("notch"), ("2024-01-03", "08:00:00"))
+        self.assertIsNone(self.index.last_join("Alex"))
+
+    def test_last_join(self):
+        """Тест последнего входа игрока по индексу"""
+        self.index.update()
+        self.assertEqual(self.index.last_join("Steve"), ("2024-01-02", "20:00:00"))
+        self.assertIsNone(self.index.last_join("Herobrine"))
+
+    def test_search_uses_player_and_hours(self):
+        """Тест поиска только по подходящим архивам и часам"""
+        self.index.update()
+
+        matches = self.index.search("diamonds")
+        self.assertEqual([match.file for match in matches], ["2024-01-02-1.log.gz", "2024-01-01-1.log.gz"])
+
+        self.assertEqual(self.index.candidate_files(player="Alex"), ["2024-01-02-1.log.gz"])
+        self.assertEqual(len(self.index.search("diamonds", player="Steve")), 1)
+        self.assertEqual(self.index.search("diamonds", date_to="2024-01-01", hours=[10]), [])
+
+        matches = self.index.search("Exception|diamonds", date_to="2024-01-01", hours=[12], regex=True)
+        self.assertEqual(len(matches), 1)
+        self.assertIn("Exception", matches[0].line)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+import unittest
+from datetime import date, datetime
+
+from infrastructure.parsers.log_classifier import (
+    LogClock, LogEventType, classify_line, classify_lines, events_between
+)
+
+
+class TestLogClassifier(unittest.TestCase):
+
+    def test_event_types(self):
+        """Тест разбора типовых строк лога"""
+        cases = [
+            ("[14:31:10] [Server thread/INFO]: Alex joined the game",
+             LogEventType.JOIN, "Alex"),
+            ("[14:40:30] [Server thread/INFO]: Alex lost connection: Disconnected",
+             LogEventType.LEAVE, "Alex"),
+            ("[14:40:31] [Server thread/INFO]: Alex left the game",
+             LogEventType.LEAVE, "Alex"),
+            ("[14:41:00] [Server thread/INFO]: <Steve> hello",
+             LogEventType.CHAT, "Steve"),
+            ("[14:41:05] [Server thread/INFO]: [Not Secure] <Steve> hi",
+             LogEventType.CHAT, "Steve"),
+            ("[14:42:00] [Server thread/INFO]: Steve issued server command: /home",
+             LogEventType.COMMAND, "Steve"),
+            ("[14:35:10] [Server thread/WARN]: Can't keep up! Is the server overloaded? "
+             "Running 2000ms behind, skipping 40 tick(s)", LogEventType.LAG, None),
+            ("[14:30:15] [Server thread/INFO]: Starting minecraft server version 1.20.1",
+             LogEventType.RESTART, None),
+            ("[14:30:25] [Server thread/INFO]: Done (4.123s)! For help, type \"help\"",
+             LogEventType.READY, None),
+            ("[15:00:00] [Server thread/INFO]: Stopping server",
+             LogEventType.STOP, None),
+            ("[14:36:00] [Server thread/WARN]: Steve moved too quickly!",
+             LogEventType.WARN, None),
+            ("[14:45:22] [Server thread/ERROR]: Exception in thread \"Server thread\"",
+             LogEventType.ERROR, None),
+        ]
+
+        for line, event_type, player in cases:
+            with self.subTest(line=line):
+                event = classify_line(line)
+                self.assertEqual(event.type, event_type)
+                self.assertEqual(event.player, player)
+
+    def test_event_details(self):
+        """Тест данных события"""
+        lag = classify_line("[14:35:10] [Server thread/WARN]: Can't keep up! Is the server overloaded? "
+                            "Running 2000ms behind, skipping 40 tick(s)")
+        self.assertEqual((lag.time, lag.level, lag.value, lag.ticks), ("14:35:10", "WARN", 2000, 40))
+
+        chat = classify_line("[14:41:00] [Server thread/INFO]: <Steve> Alex joined the game")
+        self.assertEqual((chat.type, chat.text), (LogEventType.CHAT, "Alex joined the game"))
+
+        restart = classify_line("[14:30:15] [Server thread/INFO]: Starting minecraft server version 1.20.1")
+        self.assertEqual(restart.text, "1.20.1")
+
+    def test_other_formats(self):
+        """Тест форматов Forge и Paper"""
+        forge = classify_line("[14:31:10] [Server thread/INFO] [minecraft/MinecraftServer]: Alex joined the game")
+        paper = classify_line("[14:31:10 INFO]: Alex joined the game")
+
+        self.assertEqual(forge.type, LogEventType.JOIN)
+        self.assertEqual(paper.type, LogEventType.JOIN)
+        self.assertEqual(forge.thread, "Server thread")
+        self.assertIsNone(paper.thread)
+
+    def test_ignored_lines(self):
+        """Тест что обычные строки и стектрейсы не дают событий"""
+        lines = [
+            "[14:30:16] [Server thread/INFO]: Loading properties",
+            "\tat net.minecraft.server.MinecraftServer.run(MinecraftServer.java:100)",
+            "",
+        ]
+        self.assertEqual(list(classify_lines(lines)), [])
+
+
+
+class TestLogClock(unittest.TestCase):
+
+    def test_midnight_rollover(self):
+        """Тест перехода через полночь и порядка событий"""
+        lines = [
+            "[23:59:50] [Server thread/INFO]: Steve joined the game",
+            "[23:59:59] [Server thread/WARN]: Can't keep up! Running 2000ms behind, skipping 40 tick(s)",
+            "[00:00:05] [Server thread/INFO]: Steve left the game",
+            "[00:00:04] [Netty Epoll Server IO #1/INFO]: Alex joined the game",
+        ]
+        clock = LogClock(start=date(2024, 5, 1))
+        events = list(classify_lines(lines, clock))
+
+        self.assertEqual([event.timestamp for event in events], [
+            datetime(2024, 5, 1, 23, 59, 50),
+            datetime(2024, 5, 1, 23, 59, 59),
+            datetime(2024, 5, 2, 0, 0, 5),
+            datetime(2024, 5, 2, 0, 0, 4),
+        ])
+        self.assertEqual(clock.rollovers, 1)
+        self.assertEqual(events[3].thread, "Netty Epoll Server IO #1")
+
+    def test_start_from_reference(self):
+        """Тест вычисления даты начала по времени изменения файла"""
+        same_day = LogClock(reference=datetime(2024, 5, 2, 15, 0, 0))
+        self.assertEqual(same_day.resolve("14:30:15"), datetime(2024, 5, 2, 14, 30, 15))
+
+        # Файл изменен в 01:00, а первое событие в 22:00 - лог начат накануне
+        previous_day = LogClock(reference=datetime(2024, 5, 2, 1, 0, 0))
+        self.assertEqual(previous_day.resolve("22:00:00"), datetime(2024, 5, 1, 22, 0, 0))
+        self.assertEqual(previous_day.resolve("00:30:00"), datetime(2024, 5, 2, 0, 30, 0))
+
+    def test_events_between(self):
+        """Тест выборки диапазона времени двоичным поиском"""
+        clock = LogClock(start=date(2024, 5, 1))
+        lines = [f"[{hour:02d}:00:00] [Server thread/INFO]: Player{hour} joined the game" for hour in range(24)]
+        events = list(classify_lines(lines, clock))
+
+        selected = events_between(events, datetime(2024, 5, 1, 10), datetime(2024, 5, 1, 13))
+        self.assertEqual([event.player for event in selected], ["Player10", "Player11", "Player12"])
+        self.assertEqual(len(events_between(events, start=datetime(2024, 5, 1, 22))), 2)
+        self.assertEqual(len(events_between(events)), 24)
+
+
+if __name__ == '__main__':
+    unittest.main()
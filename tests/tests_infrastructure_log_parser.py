@@ -0,0 +1,300 @@
+import gzip
+import multiprocessing
+import os
+import re
+import tempfile
+import threading
+import time
+import unittest
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import patch
+
+from infrastructure.parsers.minecraft_log_parser import MinecraftLogParser
+from infrastructure.parsers.pattern_search import SearchWorker
+
+
+class TestMinecraftLogParser(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.log_file = Path(self.temp_dir.name) / "latest.log"
+        self.log_file.write_text(
+            "[10:00:00] [Server thread/INFO]: Done (3.2s)! For help, type \"help\"\n"
+            "[10:01:00] [Server thread/INFO]: Steve joined the game\n"
+            "[10:02:00] [Server thread/INFO]: Alex joined the game\n",
+            encoding='utf-8'
+        )
+        self.parser = MinecraftLogParser(self.temp_dir.name)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _append(self, text: str):
+        with open(self.log_file, 'a', encoding='utf-8') as f:
+            f.write(text)
+
+    def test_incremental_online_players(self):
+        """Тест что состояние обновляется по дописанным строкам"""
+        self.assertEqual(self.parser.parse_online_players(), ["Steve", "Alex"])
+
+        self._append(
+            "[10:03:00] [Server thread/INFO]: Steve lost connection: Disconnected\n"
+            "[10:04:00] [Server thread/INFO]: Notch joined the game\n"
+        )
+        self.assertEqual(self.parser.parse_online_players(), ["Alex", "Notch"])
+
+        # Повторный вход после выхода
+        self._append("[10:05:00] [Server thread/INFO]: Steve joined the game\n")
+        self.assertEqual(self.parser.parse_online_players(), ["Alex", "Notch", "Steve"])
+
+    def test_chat_does_not_fake_events(self):
+        """Тест что сообщение в чате не считается входом игрока"""
+        self._append(
+            "[10:03:00] [Server thread/INFO]: <Steve> Herobrine joined the game\n"
+            "[10:04:00] [Server thread/INFO]: Alex left the game\n"
+        )
+
+        self.assertEqual(self.parser.parse_online_players(), ["Steve"])
+        self.assertEqual(self.parser.parse_player_sessions(), {"Steve": "10:01:00"})
+
+    def test_server_stats(self):
+        """Тест статистики без повторного чтения файла"""
+        self._append(
+            "[10:06:00] [Server thread/WARN]: Can't keep up! Is the server overloaded?\n"
+            "[10:07:00] [Server thread/ERROR]: Exception in thread \"Server thread\"\n"
+        )
+
+        stats = self.parser.parse_server_stats()
+
+        self.assertEqual(stats['online_players'], 2)
+        self.assertEqual(stats['total_players'], 2)
+        self.assertEqual(stats['errors_count'], 1)
+        self.assertEqual(stats['warnings_count'], 1)
+        self.assertEqual(stats['last_restart'], "10:00:00")
+        self.assertEqual(stats['last_restart_at'].strftime("%H:%M:%S"), "10:00:00")
+
+        read_before = self.parser._tailer.bytes_read
+        self.parser.parse_server_stats()
+        self.assertEqual(self.parser._tailer.bytes_read, read_before)
+
+    def test_server_stats_nobody_online(self):
+        """Тест что пустой сервер дает 0 игроков онлайн, а не демо-список"""
+        self._append(
+            "[10:03:00] [Server thread/INFO]: Steve left the game\n"
+            "[10:04:00] [Server thread/INFO]: Alex lost connection: Disconnected\n"
+        )
+
+        stats = self.parser.parse_server_stats()
+
+        self.assertEqual(stats['online_players'], 0)
+        self.assertEqual(stats['total_players'], 2)
+
+    def test_server_stats_lag(self):
+        """Тест статистики лагов с числом игроков онлайн"""
+        self._append(
+            "[10:06:00] [Server thread/WARN]: Can't keep up! Is the server overloaded? "
+            "Running 2000ms behind, skipping 40 tick(s)\n"
+            "[10:08:00] [Server thread/WARN]: Can't keep up! Is the server overloaded? "
+            "Running 5000ms behind, skipping 100 tick(s)\n"
+        )
+
+        lag = self.parser.parse_server_stats()['lag']
+
+        self.assertEqual(lag['count'], 2)
+        self.assertEqual(lag['max_ms'], 5000)
+        self.assertEqual(len(lag['windows']), 1)
+        window = lag['windows'][0]
+        self.assertEqual((window['window'], window['skipped_ticks'], window['max_players']), ("10:05", 140, 2))
+
+    def test_restart_resets_state(self):
+        """Тест что новый latest.log после рестарта сбрасывает онлайн"""
+        self.parser.parse_online_players()
+
+        self.log_file.rename(self.log_file.with_name("2024-01-01-1.log"))
+        self.log_file.write_text(
+            "[11:00:00] [Server thread/INFO]: Done (3.0s)! For help, type \"help\"\n"
+            "[11:01:00] [Server thread/INFO]: Herobrine joined the game\n",
+            encoding='utf-8'
+        )
+
+        self.assertEqual(self.parser.parse_online_players(), ["Herobrine"])
+        self.assertEqual(self.parser.parse_server_stats()['last_restart'], "11:00:00")
+
+    def test_timestamps_after_rotation(self):
+        """Тест что после ротации дата событий берется по новому файлу"""
+        self.parser.parse_server_stats()
+
+        self.log_file.rename(self.log_file.with_name("2026-01-01-1.log"))
+        self.log_file.write_text(
+            "[09:00:00] [Server thread/INFO]: Done (3.0s)! For help, type \"help\"\n",
+            encoding='utf-8'
+        )
+        os.utime(self.log_file, (datetime(2026, 1, 5, 12, 0).timestamp(),) * 2)
+
+        self.assertEqual(self.parser.parse_server_stats()['last_restart_at'], datetime(2026, 1, 5, 9, 0))
+
+
+class TestRealLogDir(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.parser = MinecraftLogParser(self.temp_dir.name, demo=False)
+
+    def tearDown(self):
+        self.parser.close()
+        self.temp_dir.cleanup()
+
+    def test_no_demo_data(self):
+        """Тест что без demo в папке сервера не появляются выдуманные игроки"""
+        self.assertFalse((Path(self.temp_dir.name) / "latest.log").exists())
+        self.assertEqual(self.parser.parse_online_players(), [])
+        self.assertEqual(self.parser.parse_server_stats()['online_players'], 0)
+        self.assertEqual(self.parser.search_logs("Steve"), [])
+
+        (Path(self.temp_dir.name) / "latest.log").write_text(
+            "[10:00:00] [Server thread/INFO]: Steve joined the game\n"
+            "[10:01:00] [Server thread/INFO]: Steve left the game\n",
+            encoding='utf-8'
+        )
+        self.assertEqual(self.parser.parse_online_players(), [])
+
+
+class TestSearchLogs(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.log_file = Path(self.temp_dir.name) / "latest.log"
+        self.log_file.write_text(
+            "".join(f"[10:00:{i % 60:02d}] [Server thread/INFO]: <Steve> сообщение {i}\n" for i in range(1000)),
+            encoding='utf-8'
+        )
+        self.parser = MinecraftLogParser(self.temp_dir.name)
+
+    def tearDown(self):
+        self.parser.close()
+        self.temp_dir.cleanup()
+
+    def _append_line(self, message: str):
+        with open(self.log_file, 'a', encoding='utf-8') as f:
+            f.write(f"[10:01:00] [Server thread/INFO]: {message}\n")
+
+    def test_findall_semantics(self):
+        """Тест что результаты совпадают с re.findall"""
+        self.assertEqual(self.parser.search_logs(r"СООБЩЕНИЕ 99\b", regex=True), ["сообщение 99"])
+        self.assertEqual(self.parser.search_logs(r"<(\w+)> сообщение 5\b", regex=True), ["Steve"])
+        self.assertEqual(self.parser.search_logs(r"(\d+):(\d+):01\].*сообщение 1\b", regex=True), [("10", "00")])
+
+    def test_stops_at_limit(self):
+        """Тест что поиск останавливается после limit совпадений"""
+        matches = self.parser.iter_search_logs(r"сообщение (\d+)", limit=3, regex=True)
+        self.assertEqual(list(matches), ["0", "1", "2"])
+
+    def test_windows_do_not_lose_matches(self):
+        """Тест поиска по окнам меньше файла"""
+        self.parser.SEARCH_WINDOW = 1000
+        matches = self.parser.search_logs(r"сообщение (\d+)", limit=10000, regex=True)
+        self.assertEqual(matches, [str(i) for i in range(1000)])
+
+    def test_search_archives(self):
+        """Тест поиска по архивам рядом с latest.log"""
+        with gzip.open(Path(self.temp_dir.name) / "2024-01-01-1.log.gz", 'wt', encoding='utf-8') as f:
+            f.write("[10:05:00] [Server thread/INFO]: Steve joined the game\n")
+
+        matches = self.parser.search_archives("joined", player="Steve")
+
+        self.assertEqual([match.date for match in matches], ["2024-01-01"])
+        self.assertEqual(self.parser.archive_last_join("Steve"), ("2024-01-01", "10:05:00"))
+
+    def test_literal_by_default(self):
+        """Тест что без regex шаблон ищется как текст"""
+        self._append_line("<Alex> цена [10.5] (a|b)+")
+
+        self.assertEqual(self.parser.search_logs("(A|B)+"), ["(a|b)+"])
+        self.assertEqual(self.parser.search_logs("[10.5]"), ["[10.5]"])
+        self.assertEqual(self.parser.search_logs(r"сообщение \d+"), [])
+
+    def test_catastrophic_regex_is_stopped(self):
+        """Тест что шаблон с экспоненциальным перебором останавливается по времени"""
+        self._append_line("<Alex> " + "a" * 40)
+
+        started = time.monotonic()
+        matches = self.parser.search_logs(r"(a|a)+b", time_budget=0.5, regex=True)
+
+        self.assertEqual(matches, [])
+        self.assertTrue(matches.truncated)
+        self.assertLess(time.monotonic() - started, 5)
+        self.assertEqual(multiprocessing.active_children(), [])
+
+        # Как текст тот же шаблон ищется сразу
+        matches = self.parser.search_logs(r"(a|a)+b", time_budget=0.5)
+        self.assertEqual(matches, [])
+        self.assertFalse(matches.truncated)
+
+        # Следующий поиск запускает новый процесс
+        self.assertEqual(self.parser.search_logs(r"<(\w+)> сообщение 5\b", regex=True), ["Steve"])
+
+    def test_process_start_is_not_in_budget(self):
+        """Тест что запуск процесса поиска не съедает время поиска"""
+        start = SearchWorker.start
+
+        class SlowTasks:
+            """Задача принимается позже отправки, как при долгом запуске процесса"""
+
+            def __init__(self, tasks):
+                self.tasks = tasks
+
+            def send(self, task):
+                self.tasks.send(task)
+                # В боте новый процесс заново импортирует aiogram, sqlalchemy и настройки
+                time.sleep(0.3)
+
+            def close(self):
+                self.tasks.close()
+
+        def slow_start(worker):
+            start(worker)
+            if not isinstance(worker._tasks, SlowTasks):
+                worker._tasks = SlowTasks(worker._tasks)
+
+        with patch.object(SearchWorker, "start", slow_start):
+            matches = self.parser.search_logs(r"<(\w+)> сообщение 5\b", time_budget=0.1, regex=True)
+
+        self.assertEqual(matches, ["Steve"])
+        self.assertFalse(matches.truncated)
+
+    def test_process_is_reused(self):
+        """Тест что процесс поиска переиспользуется между поисками"""
+        self.parser.search_logs(r"сообщение 1\b", regex=True)
+        children = multiprocessing.active_children()
+
+        self.assertEqual(self.parser.search_logs(r"сообщение (\d+)", limit=3, regex=True), ["0", "1", "2"])
+
+        self.assertEqual(len(children), 1)
+        self.assertEqual(multiprocessing.active_children(), children)
+
+    def test_invalid_regex(self):
+        """Тест что ошибка в регулярном выражении видна сразу"""
+        with self.assertRaises(re.error):
+            self.parser.search_logs("(", regex=True)
+        self.assertEqual(self.parser.search_logs("("), [])
+
+    def test_limits(self):
+        """Тест ограничений времени, длины шаблона и длины совпадения"""
+        matches = self.parser.search_logs("Steve", time_budget=0)
+        self.assertEqual(matches, [])
+        self.assertTrue(matches.truncated)
+
+        cancel_event = threading.Event()
+        cancel_event.set()
+        self.assertEqual(self.parser.search_logs("Steve", cancel_event=cancel_event), [])
+
+        with self.assertRaises(ValueError):
+            self.parser.search_logs("a" * 1000)
+
+        self.parser.SEARCH_MAX_MATCH_CHARS = 10
+        self.assertEqual(self.parser.search_logs(r"\[.*", limit=1, regex=True), ["[10:00:00]"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from infrastructure.parsers.log_tailer import LogTailer
+
+
+class TestLogTailer(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.temp_dir.name) / "latest.log"
+        self.resets = 0
+        self.tailer = LogTailer(self.path, on_reset=self._on_reset)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _on_reset(self):
+        self.resets += 1
+
+    def _append(self, text: str):
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(text)
+
+    def test_reads_only_appended_lines(self):
+        """Тест что повторное чтение отдает только новые строки"""
+        self._append("one\ntwo\n")
+        self.assertEqual(list(self.tailer.read_lines()), ["one", "two"])
+        self.assertEqual(list(self.tailer.read_lines()), [])
+
+        self._append("three\n")
+        self.assertEqual(list(self.tailer.read_lines()), ["three"])
+        self.assertEqual(self.tailer.bytes_read, len("one\ntwo\nthree\n"))
+
+    def test_partial_line_waits_for_newline(self):
+        """Тест что недописанная строка отдается после перевода строки"""
+        self._append("Steve joi")
+        self.assertEqual(list(self.tailer.read_lines()), [])
+
+        self._append("ned the game\n")
+        self.assertEqual(list(self.tailer.read_lines()), ["Steve joined the game"])
+
+    def test_missing_file(self):
+        """Тест отсутствующего файла"""
+        self.assertEqual(list(self.tailer.read_lines()), [])
+
+    def test_truncation(self):
+        """Тест усечения файла"""
+        self._append("old line 1\nold line 2\n")
+        list(self.tailer.read_lines())
+
+        self.path.write_text("new\n", encoding='utf-8')
+
+        self.assertEqual(list(self.tailer.read_lines()), ["new"])
+        self.assertEqual(self.resets, 1)
+
+    def test_rotation(self):
+        """Тест ротации: latest.log переименован и создан заново"""
+        self._append("before restart\n")
+        list(self.tailer.read_lines())
+
+        os.rename(self.path, self.path.with_name("2024-01-01-1.log"))
+        self._append("after restart\n")
+
+        self.assertEqual(list(self.tailer.read_lines()), ["after restart"])
+        self.assertEqual(self.resets, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,128 @@
+import asyncio
+import tempfile
+import unittest
+from pathlib import Path
+
+from infrastructure.parsers.log_classifier import LogEvent, LogEventType
+from infrastructure.parsers.log_event_bus import LogEventBus
+from infrastructure.parsers.log_watcher import Inotify, LogWatcher
+
+
+def make_event(event_type: LogEventType, player: str = None) -> LogEvent:
+    return LogEvent(event_type, "10:00:00", "INFO", player=player)
+
+
+class TestLogEventBus(unittest.IsolatedAsyncioTestCase):
+
+    async def test_publish_filters_by_type(self):
+        """Тест доставки только подписанных типов"""
+        bus = LogEventBus()
+        joins = bus.subscribe([LogEventType.JOIN])
+        everything = bus.subscribe()
+
+        bus.publish(make_event(LogEventType.JOIN, "Steve"))
+        bus.publish(make_event(LogEventType.LAG))
+
+        self.assertEqual([event.type for event in joins.get_nowait()], [LogEventType.JOIN])
+        self.assertEqual(len(everything.get_nowait()), 2)
+
+    async def test_slow_subscriber_drops_oldest(self):
+        """Тест вытеснения старых событий у медленного подписчика"""
+        bus = LogEventBus()
+        subscription = bus.subscribe(maxsize=2)
+
+        for player in ("A", "B", "C"):
+            bus.publish(make_event(LogEventType.JOIN, player))
+
+        self.assertEqual([event.player for event in subscription.get_nowait()], ["B", "C"])
+        self.assertEqual(subscription.dropped, 1)
+
+    async def test_unsubscribe_and_history(self):
+        """Тест отписки и истории последних событий"""
+        bus = LogEventBus(history=2)
+        with bus.subscribe():
+            self.assertEqual(bus.subscribers, 1)
+        self.assertEqual(bus.subscribers, 0)
+
+        for player in ("A", "B", "C"):
+            self.assertEqual(bus.publish(make_event(LogEventType.JOIN, player)), 0)
+        bus.publish(make_event(LogEventType.LAG))
+
+        self.assertEqual([event.player for event in bus.recent(5, types=[LogEventType.JOIN])], ["C"])
+        self.assertEqual(len(bus.recent(5)), 2)
+
+
+class TestLogWatcher(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.log_file = Path(self.temp_dir.name) / "latest.log"
+        self.log_file.write_text("[09:00:00] [Server thread/INFO]: Old joined the game\n", encoding='utf-8')
+        self.bus = LogEventBus()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def append(self, text: str):
+        with open(self.log_file, 'a', encoding='utf-8') as f:
+            f.write(text)
+
+    async def check_live_events(self, use_inotify: bool):
+        watcher = LogWatcher(self.temp_dir.name, self.bus, poll_interval=0.01, use_inotify=use_inotify)
+        subscription = self.bus.subscribe([LogEventType.JOIN, LogEventType.LAG])
+        task = asyncio.create_task(watcher.run())
+
+        try:
+            while watcher.mode is None:
+                await asyncio.sleep(0.01)
+
+            self.append(
+                "[10:00:00] [Server thread/INFO]: Steve joined the game\n"
+                "[10:00:01] [Server thread/INFO]: <Steve> hi\n"
+                "[10:00:02] [Server thread/WARN]: Can't keep up! Is the server overloaded? "
+                "Running 2000ms behind, skipping 40 tick(s)\n"
+            )
+
+            join = await asyncio.wait_for(subscription.get(), timeout=5)
+            lag = await asyncio.wait_for(subscription.get(), timeout=5)
+        finally:
+            task.cancel()
+            await task
+
+        # Старые строки не публикуются, чат отфильтрован подпиской
+        self.assertEqual(join.player, "Steve")
+        self.assertEqual(lag.value, 2000)
+        self.assertEqual(self.bus.published, 3)
+        return watcher
+
+    async def test_polling_mode(self):
+        """Тест опроса без inotify"""
+        watcher = await self.check_live_events(use_inotify=False)
+        self.assertEqual(watcher.mode, "polling")
+
+    async def test_inotify_mode(self):
+        """Тест наблюдения через inotify"""
+        try:
+            Inotify(Path(self.temp_dir.name)).close()
+        except (OSError, AttributeError):
+            self.skipTest("inotify недоступен")
+
+        watcher = await self.check_live_events(use_inotify=True)
+        self.assertEqual(watcher.mode, "inotify")
+
+    async def test_falls_back_to_polling_without_directory(self):
+        """Тест перехода на опрос, если inotify не запустился"""
+        watcher = LogWatcher(str(Path(self.temp_dir.name) / "missing"), self.bus, poll_interval=0.01)
+        task = asyncio.create_task(watcher.run())
+        try:
+            while watcher.mode is None:
+                await asyncio.sleep(0.01)
+        finally:
+            task.cancel()
+            await task
+
+        self.assertEqual(watcher.mode, "polling")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import unittest
+
+from infrastructure.adapters.rcon_cache import RconResponseCache
+from infrastructure.adapters.rcon_pool import make_pool_key
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestRconResponseCache(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.cache = RconResponseCache(max_bytes=10_000, ttls={"list": 2, "version": 600}, clock=self.clock)
+        self.server = make_pool_key("localhost", 25575, "secret")
+
+    def test_hit_and_miss(self):
+        """Тест попадания и промаха"""
+        self.assertIsNone(self.cache.get(self.server, "list"))
+        self.cache.put(self.server, "list", "There are 0/20 players online:")
+
+        self.assertEqual(self.cache.get(self.server, "list"), "There are 0/20 players online:")
+        self.assertEqual(self.cache.hits, 1)
+        self.assertEqual(self.cache.misses, 1)
+
+    def test_per_command_ttl(self):
+        """Тест разного времени жизни для разных команд"""
+        self.cache.put(self.server, "list", "players")
+        self.cache.put(self.server, "version", "1.20.1")
+
+        self.clock.now += 3
+
+        self.assertIsNone(self.cache.get(self.server, "list"))
+        self.assertEqual(self.cache.get(self.server, "version"), "1.20.1")
+
+    def test_password_is_part_of_key(self):
+        """Тест что ответ не отдается клиенту с другим паролем"""
+        self.cache.put(self.server, "list", "players")
+        other = make_pool_key("localhost", 25575, "wrong")
+
+        self.assertIsNone(self.cache.get(other, "list"))
+
+    def test_lru_eviction_by_size(self):
+        """Тест вытеснения давно неиспользуемых записей при переполнении"""
+        servers = [make_pool_key("localhost", port, "secret") for port in range(10)]
+        for server in servers:
+            self.cache.put(server, "version", "v" * 2000)
+
+        self.assertLessEqual(self.cache.size_bytes, self.cache.max_bytes)
+        self.assertGreater(self.cache.evictions, 0)
+        self.assertIsNone(self.cache.get(servers[0], "version"))
+        self.assertIsNotNone(self.cache.get(servers[-1], "version"))
+
+    def test_oversized_response_not_cached(self):
+        """Тест что слишком большой ответ не вытесняет весь кэш"""
+        self.cache.put(self.server, "version", "1.20.1")
+        self.cache.put(self.server, "list", "x" * 20_000)
+
+        self.assertIsNone(self.cache.get(self.server, "list"))
+        self.assertEqual(self.cache.get(self.server, "version"), "1.20.1")
+
+    def test_invalidate_server(self):
+        """Тест сброса кэша сервера после изменяющей команды"""
+        other = make_pool_key("otherhost", 25575, "secret")
+        self.cache.put(self.server, "list", "players")
+        self.cache.put(self.server, "version", "1.20.1")
+        self.cache.put(other, "list", "players")
+
+        self.cache.invalidate_server("localhost", 25575)
+
+        self.assertIsNone(self.cache.get(self.server, "list"))
+        self.assertIsNone(self.cache.get(self.server, "version"))
+        self.assertEqual(self.cache.get(other, "list"), "players")
+        self.assertEqual(len(self.cache), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
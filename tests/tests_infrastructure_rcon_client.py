@@ -0,0 +1,227 @@
+import asyncio
+import unittest
+from unittest.mock import patch
+
+from config.settings import settings
+from domain.command_result import CommandStatus
+from infrastructure.adapters.circuit_breaker import circuit_breakers, CircuitOpenError, CircuitState
+from infrastructure.adapters.rcon_client import RconClientAdapter
+from infrastructure.adapters.rcon_cache import rcon_response_cache
+from infrastructure.adapters.rcon_health import rcon_health
+from infrastructure.adapters.rcon_pool import rcon_pool
+from infrastructure.adapters.rcon_scheduler import rcon_schedulers
+from infrastructure.adapters.single_flight import rcon_single_flight
+from tests.fake_rcon_server import FakeRconServer
+
+
+class TestRconClientAdapter(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.server = await FakeRconServer(password="secret", responses={
+            "list": "There are 2/20 players online: Steve, Alex",
+            "version": "This server is running Paper version 1.20.1\nChecking version...",
+        }).start()
+        self.client = RconClientAdapter(self.server.host, self.server.port, "secret")
+
+        self.settings_patch = patch.multiple(settings, RCON_TIMEOUT=1, RCON_MAX_RETRIES=1, RCON_RETRY_DELAY=0)
+        self.settings_patch.start()
+
+    async def asyncTearDown(self):
+        self.settings_patch.stop()
+        rcon_pool.close_all()
+        circuit_breakers.reset()
+        rcon_response_cache.clear()
+        rcon_health.clear()
+        rcon_schedulers.reset()
+        await self.server.stop()
+
+    async def test_execute_many_keeps_order(self):
+        """Тест что результаты пачки идут в порядке команд"""
+        commands = ["kick Steve", "kick Alex", "kick Notch", "save-all"]
+
+        results = await self.client.execute_many(commands, concurrency=2)
+
+        self.assertEqual([result.command for result in results], commands)
+        self.assertEqual([result.message for result in results], [f"Executed: {c}" for c in commands])
+        self.assertTrue(all(result.status == CommandStatus.SUCCESS for result in results))
+        self.assertTrue(all(result.execution_time_ms is not None for result in results))
+        self.assertEqual(self.server.commands, commands)
+        self.assertEqual(self.server.logins, 1)
+
+    async def test_execute_command_stream(self):
+        """Тест потоковой выдачи большого ответа"""
+        self.server.responses["banlist"] = "\n".join(f"Player{i} was banned" for i in range(1000))
+        await self.client.execute_command("list")
+
+        fragments = [fragment async for fragment in self.client.execute_command_stream("banlist")]
+
+        self.assertGreater(len(fragments), 1)
+        self.assertEqual("".join(fragments), self.server.responses["banlist"])
+        # banlist не кэшируется, поэтому кэш сервера сброшен
+        self.assertEqual(len(rcon_response_cache), 0)
+
+    async def test_stream_stopped_early_records_outcome(self):
+        """Тест что брошенный на середине поток не держит пробный запрос предохранителя"""
+        self.server.responses["banlist"] = "\n".join(f"Player{i} was banned" for i in range(1000))
+        breaker = circuit_breakers.get(self.server.host, self.server.port)
+        breaker.state = CircuitState.HALF_OPEN
+
+        stream = self.client.execute_command_stream("banlist")
+        await anext(stream)
+        await stream.aclose()
+
+        self.assertEqual(breaker.state, CircuitState.CLOSED)
+        self.assertIn("Steve", await self.client.execute_command("list"))
+
+    async def test_stream_cancelled_before_reply_frees_probe(self):
+        """Тест что отмена потока до ответа освобождает пробный запрос"""
+        self.server.delays["banlist"] = 2
+        breaker = circuit_breakers.get(self.server.host, self.server.port)
+        breaker.state = CircuitState.HALF_OPEN
+
+        task = asyncio.create_task(anext(self.client.execute_command_stream("banlist")))
+        await asyncio.sleep(0.1)
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+
+        # Следующая команда может стать пробной, а не ждет probe_timeout
+        breaker.before_call()
+        self.assertEqual(breaker.state, CircuitState.HALF_OPEN)
+
+    async def test_cancelled_command_frees_probe(self):
+        """Тест что отмененная команда (дедлайн статуса) освобождает пробный запрос"""
+        self.server.delays["tps"] = 2
+        breaker = circuit_breakers.get(self.server.host, self.server.port)
+        breaker.state = CircuitState.HALF_OPEN
+
+        task = asyncio.create_task(self.client.execute_command("tps"))
+        await asyncio.sleep(0.1)
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+
+        breaker.before_call()
+        self.assertEqual(breaker.state, CircuitState.HALF_OPEN)
+
+    async def test_execute_many_reports_errors_per_command(self):
+        """Тест что ошибка одной команды не ломает остальные"""
+        self.server.delays["slow"] = 2
+
+        results = await self.client.execute_many(["list", "version", "slow"])
+
+        self.assertTrue(results[0].success)
+        self.assertTrue(results[1].success)
+        self.assertFalse(results[2].success)
+        self.assertEqual(results[2].status, CommandStatus.TIMEOUT)
+        self.assertIsNotNone(results[2].error)
+
+    async def test_identical_reads_are_coalesced(self):
+        """Тест что одновременные одинаковые list уходят на сервер один раз"""
+        self.server.delays["list"] = 0.05
+        clients = [RconClientAdapter(self.server.host, self.server.port, "secret") for _ in range(10)]
+
+        responses = await asyncio.gather(*(client.execute_command("list") for client in clients))
+
+        self.assertEqual(len(set(responses)), 1)
+        self.assertEqual(self.server.commands.count("list"), 1)
+        self.assertEqual(rcon_single_flight.in_flight, 0)
+
+    async def test_mutating_commands_are_not_coalesced(self):
+        """Тест что изменяющие команды выполняются каждая отдельно"""
+        await asyncio.gather(*(self.client.execute_command("say hi") for _ in range(3)))
+
+        self.assertEqual(self.server.commands.count("say hi"), 3)
+
+    async def test_read_only_responses_are_cached(self):
+        """Тест что повторный list берется из кэша, а kick его сбрасывает"""
+        await self.client.execute_command("list")
+        await self.client.execute_command("list")
+        self.assertEqual(self.server.commands.count("list"), 1)
+
+        await self.client.execute_command("kick Steve")
+        await self.client.execute_command("list")
+        self.assertEqual(self.server.commands.count("list"), 2)
+
+    async def test_forge_tps_is_cached(self):
+        """Тест что forge tps кэшируется и не сбрасывает кэш сервера"""
+        await self.client.execute_command("list")
+        await self.client.execute_command("forge tps")
+        await self.client.execute_command("Forge  TPS")
+        await self.client.execute_command("list")
+
+        self.assertEqual(self.server.commands.count("forge tps"), 1)
+        self.assertEqual(self.server.commands.count("list"), 1)
+
+    async def test_get_server_status(self):
+        """Тест статуса сервера"""
+        self.server.responses["tps"] = "§6TPS from last 1m, 5m, 15m: §a19.5, §a20.0, §a20.0"
+
+        status = await self.client.get_server_status()
+
+        self.assertTrue(status.is_online)
+        self.assertEqual((status.player_count, status.max_players), (2, 20))
+        self.assertEqual(status.version, "This server is running Paper version 1.20.1")
+        self.assertEqual(status.tps, 19.5)
+        self.assertIsNone(status.error)
+
+    async def test_get_server_status_partial_on_deadline(self):
+        """Тест что медленный запрос не задерживает весь статус"""
+        self.server.delays["tps"] = 2
+
+        status = await self.client.get_server_status(deadline=0.3)
+
+        self.assertTrue(status.is_online)
+        self.assertEqual(status.player_count, 2)
+        self.assertEqual(status.tps, 0.0)
+        self.assertIn("tps", status.error)
+
+    async def test_get_server_status_after_server_stop(self):
+        """Тест что остановленный сервер не показывается онлайн по ответам из кэша"""
+        self.assertTrue((await self.client.get_server_status()).is_online)
+
+        await self.server.stop()
+        status = await self.client.get_server_status()
+
+        self.assertFalse(status.is_online)
+        self.assertIsNotNone(status.error)
+        self.assertIsNone(status.version)
+        self.assertEqual(status.player_count, 0)
+
+    async def test_get_server_status_wrong_password(self):
+        """Тест статуса при неверном пароле"""
+        client = RconClientAdapter(self.server.host, self.server.port, "wrong")
+
+        status = await client.get_server_status()
+
+        self.assertFalse(status.is_online)
+        self.assertEqual(status.error, "Неверный пароль RCON")
+        self.assertEqual(status.circuit_state, "closed")
+
+    def test_parse_player_count(self):
+        """Тест разбора ответа list разных версий"""
+        cases = [
+            ("There are 3 of a max of 20 players online: Steve, Alex, Notch", (3, 20)),
+            ("There are 0 of a max 10 players online:", (0, 10)),
+            ("There are 5/50 players online:", (5, 50)),
+            ("", (0, 0)),
+        ]
+        for response, expected in cases:
+            with self.subTest(response=response):
+                self.assertEqual(RconClientAdapter._parse_player_count(response), expected)
+
+    async def test_circuit_opens_for_dead_server(self):
+        """Тест что недоступный сервер отклоняется сразу, без повторов"""
+        await self.server.stop()
+
+        with patch.object(settings, "RCON_MAX_RETRIES", 3):
+            with self.assertRaises(ConnectionRefusedError):
+                await self.client.execute_command("list")
+            with self.assertRaises(CircuitOpenError):
+                await self.client.execute_command("list")
+
+        self.assertEqual(self.client.get_circuit_state()["state"], "open")
+
+
+if __name__ == '__main__':
+    unittest.main()
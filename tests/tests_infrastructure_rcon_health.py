@@ -0,0 +1,95 @@
+import asyncio
+import unittest
+from unittest.mock import patch
+
+from config.settings import settings
+from infrastructure.adapters.rcon_health import RconHealthProber
+from infrastructure.adapters.rcon_pool import RconConnectionPool
+from tests.fake_rcon_server import FakeRconServer
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestRconHealthProber(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.server = await FakeRconServer(password="secret", responses={"list": "ok"}).start()
+        self.pool = RconConnectionPool(idle_timeout=60)
+        self.clock = FakeClock()
+        self.prober = RconHealthProber(self.pool, interval=30, max_age=90, clock=self.clock)
+
+    async def asyncTearDown(self):
+        self.pool.close_all()
+        await self.server.stop()
+
+    def test_state_expires(self):
+        """Тест что устаревшее состояние не считается известным"""
+        self.prober.record_success("mc", 25575, "secret", latency_ms=3)
+        self.assertTrue(self.prober.is_known_good("mc", 25575, "secret"))
+        self.assertFalse(self.prober.is_known_good("mc", 25575, "other"))
+
+        self.clock.now += 91
+        self.assertIsNone(self.prober.get("mc", 25575, "secret"))
+
+    def test_auth_failure_is_not_good(self):
+        """Тест что отклоненный пароль не дает пропуска проверки"""
+        self.prober.record_auth_failure("mc", 25575, "wrong", "Wrong password")
+
+        health = self.prober.get("mc", 25575, "wrong")
+        self.assertTrue(health.alive)
+        self.assertFalse(self.prober.is_known_good("mc", 25575, "wrong"))
+
+    async def test_probe_pings_pooled_connections(self):
+        """Тест что пинг не выполняет команд и не продлевает простой соединения"""
+        await self.pool.execute(self.server.host, self.server.port, "secret", "list", timeout=5)
+        connection = self.pool.connections()[0][1]
+        last_used = connection.last_used
+
+        await self.prober.probe_once()
+
+        health = self.prober.get(self.server.host, self.server.port, "secret")
+        self.assertTrue(health.alive and health.authenticated)
+        self.assertEqual(self.server.commands, ["list"])
+        self.assertEqual(connection.last_used, last_used)
+
+    async def test_probe_failure_marks_server_down(self):
+        """Тест что неудачный пинг помечает сервер недоступным"""
+        await self.pool.execute(self.server.host, self.server.port, "secret", "list", timeout=5)
+        connection = self.pool.connections()[0][1]
+
+        with patch.object(connection, "ping", side_effect=ConnectionResetError()):
+            await self.prober.probe_once()
+
+        health = self.prober.get(self.server.host, self.server.port, "secret")
+        self.assertFalse(health.alive)
+        self.assertFalse(self.prober.is_known_good(self.server.host, self.server.port, "secret"))
+        # Мертвое соединение закрыто и следующей команде не выдается
+        self.assertTrue(connection.is_closed)
+        self.assertEqual(self.pool.connections(), [])
+        await self.pool.execute(self.server.host, self.server.port, "secret", "list", timeout=5)
+        self.assertEqual(self.server.logins, 2)
+
+    async def test_probe_skips_busy_connections(self):
+        """Тест что пинг не встает в очередь за выполняющейся командой"""
+        self.server.delays["slow"] = 0.2
+        await self.pool.execute(self.server.host, self.server.port, "secret", "list", timeout=5)
+        command = asyncio.create_task(
+            self.pool.execute(self.server.host, self.server.port, "secret", "slow", timeout=5)
+        )
+        await asyncio.sleep(0.05)
+
+        with patch.object(settings, "RCON_TIMEOUT", 0.05):
+            await self.prober.probe_once()
+
+        self.assertIsNone(self.prober.get(self.server.host, self.server.port, "secret"))
+        self.assertEqual(await command, "Executed: slow")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+import asyncio
+import unittest
+
+from infrastructure.adapters.rcon_pool import RconConnectionPool, make_pool_key
+from infrastructure.adapters.rcon_protocol import RconAuthError, RconConnectionClosed
+from tests.fake_rcon_server import FakeRconServer
+
+
+class TestRconConnectionPool(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.server = await FakeRconServer(password="secret", responses={
+            "list": "There are 1 of a max of 20 players online: Steve",
+        }).start()
+        self.pool = RconConnectionPool(idle_timeout=60)
+
+    async def asyncTearDown(self):
+        self.pool.close_all()
+        await self.server.stop()
+
+    async def _execute(self, command: str, password: str = "secret") -> str:
+        return await self.pool.execute(self.server.host, self.server.port, password, command, timeout=5)
+
+    async def test_connection_is_reused(self):
+        """Тест что несколько команд идут через одно авторизованное соединение"""
+        for _ in range(3):
+            response = await self._execute("list")
+            self.assertIn("Steve", response)
+
+        self.assertEqual(self.server.connections, 1)
+        self.assertEqual(self.server.logins, 1)
+        self.assertEqual(self.pool.opened, 1)
+        self.assertEqual(self.pool.reused, 2)
+
+    async def test_wrong_password(self):
+        """Тест неверного пароля"""
+        with self.assertRaises(RconAuthError):
+            await self._execute("list", password="wrong")
+
+        self.assertEqual(self.pool.get_stats()["connections"], 0)
+
+    async def test_concurrent_commands_share_connection(self):
+        """Тест что одновременные команды не открывают лишних соединений"""
+        responses = await asyncio.gather(*(self._execute("list") for _ in range(5)))
+
+        self.assertTrue(all("Steve" in response for response in responses))
+        self.assertEqual(self.server.connections, 1)
+
+    async def test_reconnect_after_server_restart(self):
+        """Тест прозрачного переподключения после разрыва соединения сервером"""
+        await self._execute("list")
+        self.server.drop_connections()
+        await asyncio.sleep(0.01)
+
+        response = await self._execute("list")
+
+        self.assertIn("Steve", response)
+        self.assertEqual(self.server.logins, 2)
+
+    async def test_reconnect_while_other_server_connects(self):
+        """Тест что подключение к другому серверу не отменяет переподключение"""
+        await self._execute("list")
+        (_, connection), = self.pool.connections()
+
+        async def closed_during_other_open(command):
+            # Пока команда ждала ответа, открылось соединение к другому серверу
+            self.pool.opened += 1
+            raise RconConnectionClosed("Соединение закрыто")
+
+        connection.execute = closed_during_other_open
+
+        response = await self._execute("list")
+
+        self.assertIn("Steve", response)
+        self.assertEqual(self.server.logins, 2)
+
+    async def test_hung_connection_is_dropped_after_timeout(self):
+        """Тест что зависшее соединение не выдается после таймаута"""
+        await self._execute("list")
+        (_, connection), = self.pool.connections()
+
+        async def hang(command):
+            await asyncio.Event().wait()
+
+        connection.execute = hang
+
+        with self.assertRaises(asyncio.TimeoutError):
+            await self.pool.execute(self.server.host, self.server.port, "secret", "list", timeout=0.05)
+
+        self.assertTrue(connection.is_closed)
+        self.assertEqual(self.pool.get_stats()["connections"], 0)
+        self.assertIn("Steve", await self._execute("list"))
+        self.assertEqual(self.server.logins, 2)
+
+    async def test_idle_timeout(self):
+        """Тест что простаивающее соединение не выдается из пула"""
+        self.pool.idle_timeout = 0
+        await self._execute("list")
+        await self._execute("list")
+
+        self.assertEqual(self.server.connections, 2)
+        self.assertEqual(self.pool.reused, 0)
+
+    async def test_large_response(self):
+        """Тест ответа из нескольких пакетов"""
+        self.server.responses["help"] = "x" * 10000
+
+        response = await self._execute("help")
+
+        self.assertEqual(len(response), 10000)
+        self.assertEqual(await self._execute("list"), self.server.responses["list"])
+
+    def test_pool_key_hides_password(self):
+        """Тест что пароль не хранится в ключе пула"""
+        key = make_pool_key("localhost", 25575, "secret")
+        self.assertEqual(key[:2], ("localhost", 25575))
+        self.assertNotIn("secret", key[2])
+        self.assertNotEqual(key, make_pool_key("localhost", 25575, "other"))
+
+
+if __name__ == '__main__':
+    unittest.main()
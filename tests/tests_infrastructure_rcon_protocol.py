@@ -0,0 +1,135 @@
+import asyncio
+import unittest
+
+from infrastructure.adapters.rcon_protocol import (
+    RconConnection, RconAuthError, RconConnectionClosed,
+    encode_packet, read_packet, SERVERDATA_EXECCOMMAND
+)
+from tests.fake_rcon_server import FakeRconServer
+
+
+class TestRconPackets(unittest.IsolatedAsyncioTestCase):
+
+    async def test_packet_roundtrip(self):
+        """Тест сборки и разбора пакета"""
+        packet = encode_packet(7, SERVERDATA_EXECCOMMAND, b"list")
+        self.assertEqual(len(packet), 4 + 4 + 4 + 4 + 2)
+
+        reader = asyncio.StreamReader()
+        reader.feed_data(packet)
+        self.assertEqual(await read_packet(reader), (7, SERVERDATA_EXECCOMMAND, b"list"))
+
+    async def test_invalid_packet_size(self):
+        """Тест защиты от некорректной длины пакета"""
+        reader = asyncio.StreamReader()
+        reader.feed_data(b"\x02\x00\x00\x00")
+        with self.assertRaises(RconConnectionClosed):
+            await read_packet(reader)
+
+
+class TestRconConnection(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.server = await FakeRconServer(password="secret").start()
+
+    async def asyncTearDown(self):
+        await self.server.stop()
+
+    async def _open(self, password: str = "secret") -> RconConnection:
+        return await RconConnection.open(self.server.host, self.server.port, password, timeout=5)
+
+    async def test_wrong_password(self):
+        """Тест отклоненной авторизации"""
+        with self.assertRaises(RconAuthError):
+            await self._open("wrong")
+
+    async def test_concurrent_commands_are_queued(self):
+        """Тест что параллельные команды и пинг идут по одному пакету за чтение"""
+        self.server.delays["slow"] = 0.05
+        connection = await self._open()
+
+        commands = ["slow", "list", "version", "seed"]
+        responses, _ = await asyncio.gather(
+            asyncio.gather(*(connection.execute(command) for command in commands)),
+            connection.ping()
+        )
+
+        self.assertEqual(responses, [f"Executed: {command}" for command in commands])
+        self.assertEqual(self.server.connections, 1)
+        self.assertEqual(self.server.framing_errors, 0)
+        self.assertEqual(connection.in_flight, 0)
+        self.assertFalse(connection.is_closed)
+        connection.close()
+
+    async def test_interrupted_command_closes_connection(self):
+        """Тест что соединение с неполученным ответом не используется дальше"""
+        self.server.delays["slow"] = 0.2
+        connection = await self._open()
+
+        with self.assertRaises(asyncio.TimeoutError):
+            await asyncio.wait_for(connection.execute("slow"), timeout=0.05)
+
+        self.assertTrue(connection.is_closed)
+        with self.assertRaises(RconConnectionClosed):
+            await connection.execute("list")
+
+    async def test_multi_packet_response(self):
+        """Тест сборки ответа из нескольких пакетов через пакет-маркер"""
+        for size in (4096, 4097, 12000):
+            with self.subTest(size=size):
+                self.server.responses["help"] = "a" * size
+                connection = await self._open()
+                self.assertEqual(len(await connection.execute("help")), size)
+                connection.close()
+
+    async def test_empty_response(self):
+        """Тест пустого ответа (например, на save-all у некоторых серверов)"""
+        self.server.responses["save-all"] = ""
+        connection = await self._open()
+        self.assertEqual(await connection.execute("save-all"), "")
+        connection.close()
+
+    async def test_stream_response(self):
+        """Тест потоковой выдачи ответа по пакетам без разрыва многобайтовых символов"""
+        # 4095 байт + "ж" (2 байта): символ попадает на границу пакетов
+        self.server.responses["help"] = "a" * 4095 + "ж" + "b" * 5000
+        connection = await self._open()
+
+        fragments = [fragment async for fragment in connection.execute_stream("help")]
+
+        self.assertGreater(len(fragments), 1)
+        self.assertEqual("".join(fragments), self.server.responses["help"])
+        self.assertEqual(connection.in_flight, 0)
+        connection.close()
+
+    async def test_stream_fails_on_disconnect(self):
+        """Тест что потоковая команда получает ошибку при разрыве"""
+        self.server.delays["slow"] = 1
+        connection = await self._open()
+
+        async def consume():
+            return [fragment async for fragment in connection.execute_stream("slow")]
+
+        task = asyncio.create_task(consume())
+        await asyncio.sleep(0.05)
+        self.server.drop_connections()
+
+        with self.assertRaises(RconConnectionClosed):
+            await task
+
+    async def test_server_disconnect_fails_pending(self):
+        """Тест что ожидающие команды получают ошибку при разрыве"""
+        self.server.delays["slow"] = 1
+        connection = await self._open()
+
+        task = asyncio.create_task(connection.execute("slow"))
+        await asyncio.sleep(0.05)
+        self.server.drop_connections()
+
+        with self.assertRaises(RconConnectionClosed):
+            await task
+        self.assertTrue(connection.is_closed)
+
+
+if __name__ == '__main__':
+    unittest.main()
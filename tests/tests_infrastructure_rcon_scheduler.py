@@ -0,0 +1,97 @@
+import asyncio
+import unittest
+
+from infrastructure.adapters.rcon_scheduler import (
+    CommandPriority, RconScheduler, TokenBucket, command_priority
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestTokenBucket(unittest.TestCase):
+
+    def test_burst_then_rate(self):
+        """Тест что после запаса токены выдаются со скоростью rate"""
+        clock = FakeClock()
+        bucket = TokenBucket(rate=2, burst=3, clock=clock)
+
+        self.assertEqual([bucket.try_take() for _ in range(3)], [0, 0, 0])
+        self.assertAlmostEqual(bucket.try_take(), 0.5)
+
+        clock.now += 0.5
+        self.assertEqual(bucket.try_take(), 0)
+
+
+class TestCommandPriority(unittest.TestCase):
+
+    def test_command_priority(self):
+        """Тест приоритетов команд"""
+        self.assertEqual(command_priority("stop"), CommandPriority.URGENT)
+        self.assertEqual(command_priority("kick Steve"), CommandPriority.URGENT)
+        self.assertEqual(command_priority("save-all"), CommandPriority.URGENT)
+        self.assertEqual(command_priority("say hi"), CommandPriority.NORMAL)
+        self.assertEqual(command_priority("LIST"), CommandPriority.POLLING)
+        self.assertEqual(command_priority("forge tps"), CommandPriority.POLLING)
+
+
+class TestRconScheduler(unittest.IsolatedAsyncioTestCase):
+
+    async def test_urgent_commands_jump_queue(self):
+        """Тест что опасные команды обгоняют опрос статуса"""
+        scheduler = RconScheduler("localhost", 25575, rate=100, burst=1)
+        await scheduler.acquire()
+        order = []
+
+        async def run(name: str, priority: CommandPriority):
+            await scheduler.acquire(priority)
+            order.append(name)
+
+        await asyncio.gather(
+            run("list", CommandPriority.POLLING),
+            run("tps", CommandPriority.POLLING),
+            run("say", CommandPriority.NORMAL),
+            run("stop", CommandPriority.URGENT),
+        )
+
+        self.assertEqual(order, ["stop", "say", "list", "tps"])
+        stats = scheduler.get_stats()
+        self.assertEqual(stats["depth"], 0)
+        self.assertEqual(stats["granted"], 5)
+        self.assertEqual(stats["queued"], 4)
+        self.assertGreater(stats["max_wait_ms"], 0)
+
+    async def test_queue_depth_and_cancellation(self):
+        """Тест глубины очереди и пропуска отмененных команд"""
+        scheduler = RconScheduler("localhost", 25575, rate=20, burst=1)
+        await scheduler.acquire()
+
+        cancelled = asyncio.create_task(scheduler.acquire(CommandPriority.URGENT))
+        waiting = asyncio.create_task(scheduler.acquire(CommandPriority.POLLING))
+        await asyncio.sleep(0)
+
+        stats = scheduler.get_stats()
+        self.assertEqual(stats["depth"], 2)
+        self.assertEqual(stats["waiting"]["urgent"], 1)
+        self.assertEqual(stats["waiting"]["polling"], 1)
+
+        cancelled.cancel()
+        await asyncio.wait_for(waiting, timeout=1)
+        self.assertEqual(scheduler.depth, 0)
+        self.assertEqual(scheduler.granted, 2)
+
+    async def test_disabled_limit(self):
+        """Тест что rate=0 отключает ограничение"""
+        scheduler = RconScheduler("localhost", 25575, rate=0)
+        for _ in range(100):
+            await scheduler.acquire()
+        self.assertEqual(scheduler.get_stats()["depth"], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
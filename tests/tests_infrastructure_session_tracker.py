@@ -0,0 +1,56 @@
+import unittest
+
+from infrastructure.parsers.session_tracker import PlayerSessionTracker
+
+
+class TestPlayerSessionTracker(unittest.TestCase):
+
+    def setUp(self):
+        self.tracker = PlayerSessionTracker()
+
+    def test_rejoin_after_leave(self):
+        """Тест что вышедший и снова зашедший игрок онлайн"""
+        self.tracker.join("Steve", "10:00:00")
+        self.tracker.leave("Steve", "10:05:00")
+        self.tracker.join("Steve", "10:10:00")
+
+        self.assertEqual(self.tracker.online, ["Steve"])
+        self.assertEqual(self.tracker.sessions["Steve"], "10:10:00")
+        self.assertEqual(self.tracker.completed_sessions, 1)
+
+    def test_duplicate_leave_messages(self):
+        """Тест что lost connection + left the game закрывают одну сессию"""
+        self.tracker.join("Alex", "10:00:00")
+        self.tracker.leave("Alex", "10:01:00")
+        self.tracker.leave("Alex", "10:01:00")
+
+        self.assertFalse(self.tracker.is_online("Alex"))
+        self.assertEqual(self.tracker.completed_sessions, 1)
+
+    def test_restart_closes_sessions(self):
+        """Тест что рестарт сервера закрывает все сессии"""
+        for player in ("Steve", "Alex", "Notch"):
+            self.tracker.join(player, "10:00:00")
+
+        self.tracker.server_restart("11:00:00")
+        self.tracker.join("Notch", "11:01:00")
+
+        self.assertEqual(self.tracker.online, ["Notch"])
+        self.assertEqual(self.tracker.seen_players, {"Steve", "Alex", "Notch"})
+        self.assertEqual(self.tracker.completed_sessions, 3)
+
+    def test_many_events(self):
+        """Тест большого числа событий за один проход"""
+        players = [f"Player{i}" for i in range(1000)]
+        for round_number in range(100):
+            for player in players:
+                self.tracker.join(player)
+            for player in players[round_number % 2::2]:
+                self.tracker.leave(player)
+
+        self.assertEqual(len(self.tracker.online), 500)
+        self.assertEqual(len(self.tracker.seen_players), 1000)
+
+
+if __name__ == '__main__':
+    unittest.main()